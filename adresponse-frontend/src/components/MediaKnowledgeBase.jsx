@@ -31,6 +31,7 @@ const MediaKnowledgeBaseEnhanced = () => {
   const [articles, setArticles] = useState([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('All Categories');
   const [viewMode, setViewMode] = useState('grid');
   const [showCreateModal, setShowCreateModal] = useState(false);
@@ -67,6 +68,35 @@ const MediaKnowledgeBaseEnhanced = () => {
     fetchArticles();
   }, []);
 
+  // Ranked server-side search on every keystroke; a newer keystroke aborts the older request
+  useEffect(() => {
+    if (!searchTerm.trim()) {
+      setSearchResults(null);
+      return;
+    }
+
+    const controller = new AbortController();
+    const params = new URLSearchParams({ q: searchTerm, limit: '100' });
+    if (selectedCategory !== 'All Categories') {
+      params.set('category', selectedCategory);
+    }
+
+    fetch(`/api/knowledge-base/search?${params}`, { signal: controller.signal })
+      .then(response => response.json())
+      .then(data => {
+        if (data.success) {
+          setSearchResults(data);
+        }
+      })
+      .catch(error => {
+        if (error.name !== 'AbortError') {
+          console.error('Error searching articles:', error);
+        }
+      });
+
+    return () => controller.abort();
+  }, [searchTerm, selectedCategory, articles]);
+
   const fetchArticles = async () => {
     try {
       const response = await fetch('/api/knowledge-base/articles');
@@ -137,15 +167,14 @@ const MediaKnowledgeBaseEnhanced = () => {
     }
   };
 
-  const filteredArticles = articles.filter(article => {
-    const matchesSearch = article.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         article.content.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         article.tags.some(tag => tag.toLowerCase().includes(searchTerm.toLowerCase()));
-    
-    const matchesCategory = selectedCategory === 'All Categories' || article.category === selectedCategory;
-    
-    return matchesSearch && matchesCategory;
-  });
+  const filteredArticles = searchResults
+    ? searchResults.articles
+    : articles.filter(article => selectedCategory === 'All Categories' || article.category === selectedCategory);
+
+  const categoryLabel = (category) => {
+    if (!searchResults || category === 'All Categories') return category;
+    return `${category} (${searchResults.facets[category] || 0})`;
+  };
 
   const getTypeIcon = (type) => {
     const typeConfig = articleTypes.find(t => t.type === type);
@@ -258,7 +287,7 @@ const MediaKnowledgeBaseEnhanced = () => {
               className="px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-blue-500"
             >
               {categories.map(category => (
-                <option key={category} value={category}>{category}</option>
+                <option key={category} value={category}>{categoryLabel(category)}</option>
               ))}
             </select>
             
@@ -23,6 +23,19 @@ import {
   Award
 } from 'lucide-react';
 
+const formatBytes = (bytes) => {
+  if (bytes == null) return '';
+  if (bytes < 1024) return `${bytes} B`;
+  const units = ['KB', 'MB', 'GB'];
+  let value = bytes / 1024;
+  let unit = 0;
+  while (value >= 1024 && unit < units.length - 1) {
+    value /= 1024;
+    unit += 1;
+  }
+  return `${value.toFixed(value < 10 ? 1 : 0)} ${units[unit]}`;
+};
+
 const RFPDetailEnhanced = () => {
   const { id } = useParams();
   const navigate = useNavigate();
@@ -73,26 +86,41 @@ const RFPDetailEnhanced = () => {
     }
   };
 
-  const handleGenerateProposal = async () => {
+  const handleGenerateProposal = () => {
     setGenerating(true);
-    try {
-      const response = await fetch(`/api/rfps/${id}/generate-proposal`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' }
-      });
-      const data = await response.json();
-      if (data.success) {
-        setRfp(prev => ({ ...prev, proposal: data.proposal }));
-        setActiveTab('proposal');
-      } else {
-        alert('Error generating proposal: ' + data.error);
-      }
-    } catch (error) {
+    // Sections arrive one at a time over Server-Sent Events and render as they land
+    const events = new EventSource(`/api/rfps/${id}/generate-proposal/stream`);
+    const finish = () => {
+      events.close();
+      setGenerating(false);
+    };
+
+    events.addEventListener('start', (event) => {
+      const { generated_at } = JSON.parse(event.data);
+      setRfp(prev => ({ ...prev, proposal: { status: 'generating', generated_at, sections: {} } }));
+      setActiveTab('proposal');
+    });
+    events.addEventListener('section', (event) => {
+      const { key, content } = JSON.parse(event.data);
+      setRfp(prev => ({
+        ...prev,
+        proposal: { ...prev.proposal, sections: { ...prev.proposal.sections, [key]: content } }
+      }));
+    });
+    events.addEventListener('done', (event) => {
+      const proposal = JSON.parse(event.data);
+      setRfp(prev => ({ ...prev, proposal }));
+      finish();
+    });
+    events.addEventListener('failed', (event) => {
+      finish();
+      alert('Error generating proposal: ' + JSON.parse(event.data).error);
+    });
+    events.onerror = (error) => {
       console.error('Error generating proposal:', error);
+      finish();
       alert('Error generating proposal. Please try again.');
-    } finally {
-      setGenerating(false);
-    }
+    };
   };
 
   const handleQualityCheck = async () => {
@@ -412,7 +440,7 @@ const RFPDetailEnhanced = () => {
                       <div className="flex items-center space-x-2">
                         <button
                           onClick={handleQualityCheck}
-                          disabled={qualityChecking}
+                          disabled={qualityChecking || generating}
                           className="flex items-center space-x-2 px-4 py-2 bg-purple-600 text-white rounded-lg hover:bg-purple-700 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
                         >
                           {qualityChecking ? (
@@ -473,6 +501,12 @@ const RFPDetailEnhanced = () => {
                           </div>
                         </div>
                       ))}
+                      {generating && (
+                        <div className="flex items-center space-x-2 pl-4 text-sm text-gray-500">
+                          <div className="w-4 h-4 border-2 border-blue-500 border-t-transparent rounded-full animate-spin"></div>
+                          <span>Writing next section...</span>
+                        </div>
+                      )}
                     </div>
 
                     {/* Next Steps */}
@@ -548,7 +582,7 @@ const RFPDetailEnhanced = () => {
               
               <button
                 onClick={handleQualityCheck}
-                disabled={qualityChecking || !rfp.proposal}
+                disabled={qualityChecking || generating || !rfp.proposal}
                 className="w-full flex items-center justify-center space-x-2 px-4 py-3 bg-purple-600 text-white rounded-lg hover:bg-purple-700 disabled:opacity-50 disabled:cursor-not-allowed transition-colors"
               >
                 <Shield className="w-4 h-4" />
@@ -568,12 +602,15 @@ const RFPDetailEnhanced = () => {
                       <FileText className="w-4 h-4 text-blue-600" />
                       <div>
                         <p className="text-sm font-medium text-gray-900">{attachment.filename}</p>
-                        <p className="text-xs text-gray-500">{attachment.size}</p>
+                        <p className="text-xs text-gray-500">{formatBytes(attachment.size_bytes)}</p>
                       </div>
                     </div>
-                    <button className="text-blue-600 hover:text-blue-700">
+                    <a
+                      href={attachment.sha256 ? `/api/rfps/${id}/attachments/${attachment.id}/download` : undefined}
+                      className="text-blue-600 hover:text-blue-700"
+                    >
                       <Download className="w-4 h-4" />
-                    </button>
+                    </a>
                   </div>
                 ))}
               </div>
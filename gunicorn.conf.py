@@ -0,0 +1,35 @@
+"""Gunicorn settings for ``gunicorn src.wsgi:app``; every value can be overridden by env var.
+
+Graceful reload: ``kill -HUP <master pid>`` replaces workers after they finish
+in-flight requests. Because the app is preloaded in the master, picking up new
+code needs a binary upgrade instead: ``kill -USR2 <master pid>`` then
+``kill -QUIT <old master pid>``.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# The demo app keeps RFPs in process memory, so every worker has its own copy;
+# knowledge articles are in the database (DATABASE_URL) and shared. Keep one
+# worker (and scale with threads) unless all data is shared through the database.
+workers = int(os.environ.get('GUNICORN_WORKERS', '1'))
+threads = int(os.environ.get('GUNICORN_THREADS', str(min(8, multiprocessing.cpu_count() * 2))))
+worker_class = 'gthread'
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Keep-alive should outlast the load balancer's idle timeout to avoid reset connections
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '75'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+# Optional worker recycling (0 disables it); with a single worker a recycle drops
+# in-flight requests, so only enable it alongside GUNICORN_WORKERS > 1.
+# The jitter keeps workers from restarting at the same moment.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '200'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
@@ -0,0 +1,101 @@
+"""Measure RFP import throughput: POST /api/rfps/bulk against one-at-a-time POST /api/rfps.
+
+Builds the RFP blueprint on a throwaway SQLite file database and imports a
+synthetic legacy export. Run from the repository root:
+
+    python scripts/bench_bulk_insert.py [--rows 10000] [--members 3] [--chunk-size 500] [--baseline 500]
+
+Reports rows/sec for the bulk endpoint with a JSON array and with NDJSON, and
+for the single-row endpoint on ``--baseline`` rows (0 skips it).
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.models.rfp import db, RFP
+from src.routes.rfp import rfp_bp
+
+
+def make_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    app.register_blueprint(rfp_bp, url_prefix='/api')
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def make_records(count, members):
+    return [
+        {
+            'name': f'Legacy Campaign {i}',
+            'agency_name': 'MediaBuyers Agency',
+            'advertiser_client_name': 'TechGadgets Inc.',
+            'campaign_type': 'Digital Media',
+            'budget_range': f'${100 + i % 900}K - ${1000 + i % 900}K',
+            'due_date': (date(2025, 4, 15) + timedelta(days=i % 180)).isoformat(),
+            'status': ('New', 'In Progress', 'Completed')[i % 3],
+            'content': 'Digital media campaign migrated from the legacy RFP system. ' * 4,
+            'team_members': [
+                {'name': f'Member {n}', 'role': 'Media Director', 'email': f'member{n}@company.com'}
+                for n in range(members)
+            ]
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, rows, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<28} {rows:>7} rows  {elapsed:7.2f}s  {rows / elapsed:>9,.0f} rows/sec')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--members', type=int, default=3, help='team members per RFP')
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--baseline', type=int, default=500, help='rows for the one-at-a-time comparison')
+    args = parser.parse_args()
+
+    records = make_records(args.rows, args.members)
+    ndjson = '\n'.join(json.dumps(record) for record in records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def bulk(body, content_type, name):
+            client = make_app(os.path.join(tmp, f'{name}.db')).test_client()
+            response = client.post(
+                f'/api/rfps/bulk?chunk_size={args.chunk_size}', data=body, content_type=content_type
+            )
+            result = response.get_json()
+            assert result['inserted'] == args.rows, result.get('error') or result['errors'][:3]
+
+        timed('bulk (JSON array)', args.rows, lambda: bulk(json.dumps(records), 'application/json', 'array'))
+        timed('bulk (NDJSON)', args.rows, lambda: bulk(ndjson, 'application/x-ndjson', 'ndjson'))
+
+        if args.baseline:
+            app = make_app(os.path.join(tmp, 'single.db'))
+            client = app.test_client()
+
+            def one_at_a_time():
+                for record in records[:args.baseline]:
+                    assert client.post('/api/rfps', json=record).status_code == 201
+
+            timed('POST /rfps one at a time', args.baseline, one_at_a_time)
+            with app.app_context():
+                assert RFP.query.count() == args.baseline
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Compare JSON serialization throughput for a 10k-RFP list response.
+
+Run from the repository root:  python scripts/bench_json.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import src.json_provider as json_provider
+from src.json_provider import FastJSONProvider
+
+
+def make_rows(count):
+    now = datetime(2025, 4, 1, 12, 0, 0)
+    return [
+        {
+            'id': i,
+            'name': f'Campaign {i}',
+            'agency_name': 'MediaBuyers Agency',
+            'advertiser_client_name': 'TechGadgets Inc.',
+            'campaign_type': 'Digital Media',
+            'budget_range': '$500K - $750K',
+            'budget_min': 500000,
+            'budget_max': 750000,
+            'due_date': (date(2025, 4, 15) + timedelta(days=i % 90)).isoformat(),
+            'status': 'In Progress',
+            'completion_percentage': i % 100,
+            'content': 'Comprehensive digital media campaign targeting tech-savvy consumers. ' * 8,
+            'ai_processing_enabled': True,
+            'created_at': (now - timedelta(minutes=i)).isoformat(),
+            'updated_at': (now - timedelta(seconds=i)).isoformat(),
+            'submitted_date': None,
+            'team_members': [
+                {'id': i * 4 + n, 'name': 'John Doe', 'role': 'Media Director', 'email': None}
+                for n in range(4)
+            ],
+            'attachments': [
+                {'id': i * 2 + n, 'filename': 'RFP.pdf', 'file_type': 'pdf',
+                 'is_primary': n == 0, 'uploaded_at': now.isoformat()}
+                for n in range(2)
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def bench(label, app, rows, repeat):
+    payload = {'success': True, 'rfps': rows, 'total': len(rows)}
+    with app.test_request_context():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = app.json.response(payload).get_data()
+            timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f'{label:<28} {best * 1000:8.1f} ms  {len(rows) / best:12,.0f} rows/s  {len(body) / 1e6:6.2f} MB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+
+    app = Flask(__name__)
+    app.json = DefaultJSONProvider(app)
+    bench('flask default provider', app, rows, args.repeat)
+
+    app.json = FastJSONProvider(app)
+    if json_provider.orjson is not None:
+        bench('FastJSONProvider (orjson)', app, rows, args.repeat)
+    orjson, json_provider.orjson = json_provider.orjson, None
+    bench('FastJSONProvider (stdlib)', app, rows, args.repeat)
+    json_provider.orjson = orjson
+
+
+if __name__ == '__main__':
+    main()
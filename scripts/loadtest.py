@@ -0,0 +1,79 @@
+"""Reproducible load test for the read endpoints.
+
+Start the server under test, then run from the repository root, e.g.:
+
+    python src/main.py                        # Werkzeug development server
+    gunicorn src.wsgi:app                     # production entry point
+    python scripts/loadtest.py --url http://localhost:5000 --concurrency 32 --duration 20
+
+Reports requests/sec, p50 and p99 latency and errors per endpoint.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ENDPOINTS = ['/api/rfps', '/api/dashboard/stats']
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def worker(url, deadline, latencies, errors, lock):
+    session = requests.Session()
+    local_latencies, local_errors = [], 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = session.get(url, timeout=10)
+            response.content
+            if response.status_code != 200:
+                local_errors += 1
+        except requests.RequestException:
+            local_errors += 1
+        local_latencies.append(time.perf_counter() - start)
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def run(url, concurrency, duration, warmup):
+    requests.get(url, timeout=10)
+    if warmup:
+        run(url, concurrency, warmup, 0)
+
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker, url, deadline, latencies, errors, lock)
+    latencies.sort()
+    return len(latencies), errors[0], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test /api/rfps and /api/dashboard/stats')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds per endpoint')
+    parser.add_argument('--warmup', type=float, default=2.0, help='seconds of warmup per endpoint')
+    args = parser.parse_args()
+
+    print(f'{args.url}  concurrency={args.concurrency}  duration={args.duration}s')
+    print(f"{'endpoint':<24} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for path in ENDPOINTS:
+        total, errors, latencies = run(args.url + path, args.concurrency, args.duration, args.warmup)
+        print(
+            f'{path:<24} {total:>9} {total / args.duration:>9.0f} '
+            f'{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} {errors:>7}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Local stub of an AI provider API for exercising the provider clients.
+
+Serves ``/v1/analyze``, ``/v1/proposal`` and ``/v1/quality-check`` with
+injectable latency and failures, and counts the TCP connections it accepts so
+connection reuse is visible. Run it and point the backup app at it, e.g.:
+
+    python scripts/stub_provider.py --port 8090 --latency 0.2 --error-rate 0.1
+    AI_GPT_4_URL=http://localhost:8090 AI_PROPOSAL_URL=http://localhost:8090 python src/main_backup.py
+
+``--status 503 --retry-after 1`` makes every failure a 503 with Retry-After.
+The tests start it in-process through ``serve(port=0)`` and adjust its
+``StubState`` between calls.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RESPONSES = {
+    '/v1/analyze': {
+        'confidence_score': 0.8,
+        'key_insights': ['Stub insight'],
+        'recommendations': ['Stub recommendation']
+    },
+    '/v1/proposal': {
+        'status': 'completed',
+        'sections': {'executive_summary': {'title': 'Executive Summary', 'content': 'Stub proposal'}}
+    },
+    '/v1/quality-check': {
+        'status': 'completed',
+        'overall_score': 90,
+        'checks_performed': []
+    }
+}
+
+
+class StubState:
+    def __init__(self, latency, error_rate, status, retry_after):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.status = status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive
+
+        def setup(self):
+            super().setup()
+            with state.lock:
+                state.connections += 1
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            self.rfile.read(length)
+            with state.lock:
+                state.requests += 1
+            time.sleep(state.latency() if callable(state.latency) else state.latency)
+
+            if self.path not in RESPONSES:
+                return self._send(404, {'error': 'not found'})
+            if random.random() < state.error_rate:
+                headers = {'Retry-After': str(state.retry_after)} if state.retry_after is not None else {}
+                return self._send(state.status, {'error': 'injected failure'}, headers)
+            self._send(200, RESPONSES[self.path])
+
+        def do_GET(self):
+            if self.path != '/stats':
+                return self._send(404, {'error': 'not found'})
+            with state.lock:
+                self._send(200, {'requests': state.requests, 'connections': state.connections})
+
+        def _send(self, status, body, headers=None):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(port=8090, latency=0.0, error_rate=0.0, status=503, retry_after=None):
+    """Start the stub in a background thread; returns ``(server, state)``"""
+    state = StubState(latency, error_rate, status, retry_after)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail')
+    parser.add_argument('--status', type=int, default=503, help='status code for injected failures')
+    parser.add_argument('--retry-after', type=int, default=None, help='Retry-After seconds on failures')
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, args.latency, args.error_rate, args.status, args.retry_after)
+    print(f'Stub provider listening on http://127.0.0.1:{server.server_port}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
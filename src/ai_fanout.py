@@ -0,0 +1,214 @@
+"""Concurrent fan-out of one RFP analysis request to several AI models.
+
+Every provider is called in parallel on a shared thread pool, so end-to-end
+latency tracks the slowest model that answers within budget rather than the sum
+of all of them. Each call gets its own timeout, which is passed down to the
+provider so a call the fan-out gave up on also stops, the whole fan-out is
+bounded by a global deadline, a slow call can be hedged with a duplicate
+request, and whatever subset of models answered is merged into one result.
+Each model has its own pool of threads, so a hung provider cannot take threads
+away from the others; a call that finds all of its model's threads busy waits
+for one, and that wait counts against the call's timeout.
+
+``FakeProvider`` is a local stand-in with injectable latency and failures for
+exercising the executor without network access.
+"""
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class ModelProvider:
+    """Interface for one AI model: ``analyze`` returns a partial analysis dict.
+
+    ``timeout`` is the call's budget in seconds; implementations must give up
+    once it is spent so an abandoned call frees its thread.
+    """
+
+    name = None
+
+    def analyze(self, rfp_content, rfp_data, timeout=None):
+        raise NotImplementedError
+
+
+class FakeProvider(ModelProvider):
+    """Provider that sleeps for an injectable latency, then returns ``result`` or raises"""
+
+    def __init__(self, name, result=None, latency=0.0, jitter=0.0, error=None):
+        self.name = name
+        self.result = result
+        self.latency = latency
+        self.jitter = jitter
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def analyze(self, rfp_content, rfp_data, timeout=None):
+        with self._lock:
+            self.calls += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        delay = max(0.0, delay + random.uniform(0, self.jitter))
+        if timeout is not None and delay > timeout:
+            # Behave like an HTTP client whose read timeout fired
+            time.sleep(timeout)
+            raise TimeoutError(f'{self.name}: timed out after {timeout:.1f}s')
+        time.sleep(delay)
+        if self.error:
+            raise self.error
+        result = self.result(rfp_content, rfp_data) if callable(self.result) else self.result
+        return dict(result or {})
+
+
+class FanOutExecutor:
+    """Runs providers concurrently with per-call timeouts, a deadline and hedging"""
+
+    def __init__(self, providers, model_timeout=10.0, deadline=15.0, hedge_after=None, max_in_flight_per_model=2):
+        self.providers = list(providers)
+        # Budget of each call (first or hedged) from the moment it is sent
+        self.model_timeout = model_timeout
+        self.deadline = deadline
+        # Seconds after which a still-pending call gets a duplicate request (None disables)
+        self.hedge_after = hedge_after
+        # A call holds one of its model's threads until it returns, including
+        # after the fan-out that sent it has given up on it. Calls beyond the cap
+        # queue on that model alone until a thread frees up or they time out.
+        self.max_in_flight_per_model = max_in_flight_per_model
+        self._executors = {
+            provider.name: ThreadPoolExecutor(
+                max_workers=max_in_flight_per_model, thread_name_prefix=f'ai-fanout-{provider.name}'
+            )
+            for provider in self.providers
+        }
+
+    def run(self, rfp_content, rfp_data):
+        """Call every provider and return ``{'results', 'errors', 'elapsed'}``.
+
+        ``results`` maps provider name to its answer; ``errors`` maps provider
+        name to why it has none (exception, model timeout or deadline).
+        """
+        start = time.monotonic()
+        deadline = start + self.deadline
+        pending = {}   # future -> (provider name, time the call times out)
+        attempts = {}  # provider name -> in-flight future count
+        hedged = set()
+        results, errors = {}, {}
+
+        def call(provider):
+            sent_at = time.monotonic()
+            expires_at = sent_at + max(0.0, min(self.model_timeout, deadline - sent_at))
+            future = self._executors[provider.name].submit(self._call, provider, expires_at, rfp_content, rfp_data)
+            pending[future] = (provider.name, expires_at)
+            attempts[provider.name] = attempts.get(provider.name, 0) + 1
+
+        for provider in self.providers:
+            call(provider)
+
+        providers_by_name = {provider.name: provider for provider in self.providers}
+        while pending:
+            now = time.monotonic()
+            # A call past its own timeout is abandoned; its provider gives up once
+            # no attempt is left (the call itself ends on its HTTP timeout)
+            for future, (name, expires_at) in list(pending.items()):
+                if now >= expires_at and not future.done():
+                    # Still queued for a thread: it will never be needed
+                    future.cancel()
+                    del pending[future]
+                    attempts[name] -= 1
+                    if attempts[name] == 0 and name not in results:
+                        errors[name] = 'deadline exceeded' if now >= deadline else 'model timeout'
+            outstanding = {name for name, _ in pending.values()} - set(results)
+            if now >= deadline:
+                for name in outstanding:
+                    errors[name] = 'deadline exceeded'
+                break
+            if not pending:
+                break
+
+            wake_at = min([deadline] + [expires_at for _, expires_at in pending.values()])
+            if self.hedge_after is not None and outstanding - hedged:
+                wake_at = min(wake_at, start + self.hedge_after)
+            done, _ = wait(list(pending), timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, expires_at = pending.pop(future)
+                attempts[name] -= 1
+                if name in results:
+                    continue
+                try:
+                    results[name] = future.result()
+                    errors.pop(name, None)
+                except Exception as e:
+                    # A hedged twin may still succeed
+                    if attempts[name] == 0:
+                        errors[name] = str(e) or type(e).__name__
+                        # The provider's own timeout firing is reported like ours
+                        if time.monotonic() >= expires_at:
+                            errors[name] = 'deadline exceeded' if expires_at >= deadline else 'model timeout'
+
+            # Drop futures whose provider already has an answer
+            for future, (name, _) in list(pending.items()):
+                if name in results:
+                    future.cancel()
+                    del pending[future]
+
+            if self.hedge_after is not None and time.monotonic() - start >= self.hedge_after:
+                for name in {name for name, _ in pending.values()} - hedged - set(results):
+                    hedged.add(name)
+                    call(providers_by_name[name])
+
+        return {'results': results, 'errors': errors, 'elapsed': time.monotonic() - start}
+
+    def _call(self, provider, expires_at, rfp_content, rfp_data):
+        # Time spent queued for one of the model's threads comes out of the budget
+        timeout = expires_at - time.monotonic()
+        if timeout <= 0:
+            raise TimeoutError(f'{provider.name}: timed out waiting for a free call slot')
+        return provider.analyze(rfp_content, rfp_data, timeout=timeout)
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+
+LIST_FIELDS = (
+    'key_insights', 'recommendations', 'risk_factors',
+    'opportunities', 'technical_requirements', 'success_metrics'
+)
+
+
+def merge_analyses(fan_out, model_order):
+    """Merge per-model partial analyses into one analysis dict.
+
+    List fields are unioned (first occurrence wins the order), confidence is
+    averaged, scalar fields come from the first model in ``model_order`` that
+    provided them, and models without an answer are listed under ``models_failed``.
+    """
+    answered = [name for name in model_order if name in fan_out['results']]
+    partials = [fan_out['results'][name] for name in answered]
+    if not partials:
+        return {
+            'status': 'error',
+            'error': 'No model returned an analysis',
+            'models_failed': fan_out['errors'],
+            'confidence_score': 0.0
+        }
+
+    merged = {
+        'status': 'completed',
+        'processing_time': f"{fan_out['elapsed']:.1f} seconds",
+        'models_used': answered,
+    }
+    scores = [p['confidence_score'] for p in partials if p.get('confidence_score') is not None]
+    merged['confidence_score'] = round(sum(scores) / len(scores), 2) if scores else 0.0
+
+    for partial in partials:
+        for key, value in partial.items():
+            if key in LIST_FIELDS:
+                items = merged.setdefault(key, [])
+                items.extend(item for item in value if item not in items)
+            elif key not in merged and key not in ('status', 'processing_time', 'models_used'):
+                merged[key] = value
+
+    if fan_out['errors']:
+        merged['models_failed'] = fan_out['errors']
+    return merged
@@ -0,0 +1,257 @@
+"""HTTP clients for outbound AI provider calls.
+
+One ``ProviderClient`` per provider host owns a pooled keep-alive
+``requests.Session`` (so calls reuse TCP+TLS connections), caps in-flight
+requests with a semaphore, retries transient failures (connection errors,
+timeouts, 429 and 5xx) with jittered exponential backoff, stops calling a
+failing provider through a circuit breaker, and records a latency histogram.
+
+``HTTPModelProvider`` adapts a client to the ``ModelProvider`` interface used by
+the analysis fan-out; proposal and quality-check calls can share the same
+clients through ``get_client``.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.ai_fanout import ModelProvider
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class ProviderError(Exception):
+    """A provider call failed after all retries"""
+
+
+class CircuitOpenError(ProviderError):
+    """The provider's circuit breaker is open, so the call was not attempted"""
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures, then lets one
+    trial call through every ``reset_timeout`` seconds until one succeeds"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    """Latency histogram with fixed millisecond buckets (per-bucket, not cumulative, counts)"""
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+    def __init__(self):
+        self._counts = [0] * len(self.BUCKETS_MS)
+        self._total_ms = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self._count += 1
+            self._total_ms += ms
+            for i, bound in enumerate(self.BUCKETS_MS):
+                if ms <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {
+                ('+Inf' if bound == float('inf') else f'le_{bound}ms'): count
+                for bound, count in zip(self.BUCKETS_MS, self._counts)
+            }
+            return {
+                'count': self._count,
+                'mean_ms': round(self._total_ms / self._count, 1) if self._count else 0.0,
+                'buckets': buckets
+            }
+
+
+class ProviderClient:
+    """Pooled, rate-bounded, retrying HTTP client for one AI provider"""
+
+    def __init__(self, name, base_url, api_key=None, pool_size=10, max_concurrency=8,
+                 connect_timeout=3.05, read_timeout=30.0, max_retries=3,
+                 backoff_base=0.5, backoff_cap=8.0, breaker=None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyHistogram()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats = {'requests': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+        self._stats_lock = threading.Lock()
+
+        # Retries are handled here (with jitter and breaker accounting), not by urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Content-Type'] = 'application/json'
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+
+    def post_json(self, path, payload, timeout=None):
+        """POST ``payload`` and return the decoded JSON response.
+
+        ``timeout`` bounds the whole call in seconds, retries and backoff included.
+        """
+        if not self.breaker.allow():
+            self._count('rejected')
+            raise CircuitOpenError(f'{self.name}: circuit open')
+
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        settled = False
+        try:
+            last_error = None
+            retries = 0
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    delay = self._backoff(attempt, last_error)
+                    if give_up_at is not None and time.monotonic() + delay >= give_up_at:
+                        break
+                    retries += 1
+                    self._count('retries')
+                    time.sleep(delay)
+                attempt_timeout = self._attempt_timeout(give_up_at)
+                if attempt_timeout is None:
+                    last_error = last_error or requests.Timeout('call timeout exhausted')
+                    break
+                try:
+                    response = self._send(path, payload, attempt_timeout)
+                    if response.status_code in RETRYABLE_STATUS:
+                        last_error = response
+                        continue
+                    data = response.json() if response.status_code < 400 else None
+                except requests.RequestException as e:
+                    # Connection errors, timeouts, broken streams and invalid JSON bodies
+                    last_error = e
+                    continue
+                # Client errors will not succeed on retry and say nothing about provider health
+                self.breaker.record_success()
+                settled = True
+                if response.status_code >= 400:
+                    raise ProviderError(f'{self.name}: HTTP {response.status_code}')
+                return data
+
+            self.breaker.record_failure()
+            settled = True
+            self._count('failures')
+            if isinstance(last_error, requests.Response):
+                raise ProviderError(f'{self.name}: HTTP {last_error.status_code} after {retries} retries')
+            raise ProviderError(f'{self.name}: {last_error}')
+        finally:
+            # Any other exception still counts as a failure, so a half-open
+            # breaker's trial call always reopens or closes it
+            if not settled:
+                self.breaker.record_failure()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['circuit'] = self.breaker.state
+        stats['latency'] = self.latency.snapshot()
+        return stats
+
+    def close(self):
+        self.session.close()
+
+    def _attempt_timeout(self, give_up_at):
+        """``(connect, read)`` timeout for the next attempt, or None once the budget is spent"""
+        if give_up_at is None:
+            return self.timeout
+        remaining = give_up_at - time.monotonic()
+        if remaining <= 0:
+            return None
+        return (min(self.timeout[0], remaining), min(self.timeout[1], remaining))
+
+    def _send(self, path, payload, timeout):
+        # Waiting for a free slot counts against the attempt's read timeout
+        if not self._slots.acquire(timeout=timeout[1]):
+            raise requests.Timeout(f'{self.name}: no free request slot')
+        try:
+            self._count('requests')
+            start = time.monotonic()
+            try:
+                return self.session.post(f'{self.base_url}{path}', json=payload, timeout=timeout)
+            finally:
+                self.latency.observe(time.monotonic() - start)
+        finally:
+            self._slots.release()
+
+    def _backoff(self, attempt, last_error):
+        # Honour Retry-After on 429/503, otherwise full-jitter exponential backoff
+        if isinstance(last_error, requests.Response):
+            retry_after = last_error.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(self.backoff_cap, float(retry_after))
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+
+class HTTPModelProvider(ModelProvider):
+    """Model provider that posts the RFP to ``<base_url>/v1/analyze``"""
+
+    def __init__(self, client):
+        self.name = client.name
+        self.client = client
+
+    def analyze(self, rfp_content, rfp_data, timeout=None):
+        return self.client.post_json('/v1/analyze', {'content': rfp_content, 'rfp': rfp_data}, timeout=timeout)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name, base_url, **options):
+    """Shared client for a provider, created on first use"""
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _clients[name] = ProviderClient(name, base_url, **options)
+        return client
+
+
+def client_stats():
+    """Stats for every client created through ``get_client``"""
+    with _clients_lock:
+        clients = list(_clients.values())
+    return {client.name: client.stats() for client in clients}
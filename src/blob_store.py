@@ -0,0 +1,118 @@
+"""Content-addressed file storage for RFP attachments.
+
+Blobs are stored once per distinct content under ``<root>/<sha[:2]>/<sha>``,
+so re-uploading the same PDF costs no extra disk. Uploads are written in
+chunks to a temporary file in the same directory tree while being hashed, then
+renamed into place (or discarded if the blob already exists), so a file is
+never held in memory and readers never see a partial blob.
+
+``BlobWriter`` is file-like enough to be returned from the ``stream_factory``
+of ``werkzeug.formparser.parse_form_data``, which lets multipart bodies stream
+straight from the socket into the store.
+
+Because blobs are shared, deleting one must not race with an upload that just
+found it: uploads hold the store lock shared from committing their blobs until
+the rows that reference them are committed, and deletes hold it exclusively
+while they check for references. The lock is a ``flock`` on ``<root>/.lock``,
+so it covers every worker process on the host.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a lock within this process
+    fcntl = None
+
+
+class BlobWriter:
+    """Writable temp file that hashes and counts everything written to it"""
+
+    def __init__(self, store):
+        self._store = store
+        self._hash = hashlib.sha256()
+        self.size = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.tmp_dir, suffix='.part')
+        self._file = os.fdopen(fd, 'w+b')
+
+    def write(self, data):
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def seek(self, offset, whence=0):
+        # Called by the form parser once the part is complete
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def commit(self):
+        """Move the upload into the store; returns ``(sha256, size, created)``"""
+        self._file.close()
+        sha256 = self._hash.hexdigest()
+        path = self._store.path(sha256)
+        if os.path.exists(path):
+            os.remove(self._tmp_path)
+            return sha256, self.size, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return sha256, self.size, True
+
+    def discard(self):
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        # Keep the data until commit() or discard()
+        pass
+
+
+class BlobStore:
+    """Directory of blobs addressed by SHA-256"""
+
+    def __init__(self, root):
+        self.root = root
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self._lock_path = os.path.join(root, '.lock')
+        self._local_lock = threading.Lock()
+
+    @contextmanager
+    def lock(self, shared=False):
+        """Hold the store lock: shared while linking blobs to rows, exclusive while deleting"""
+        if fcntl is None:
+            with self._local_lock:
+                yield
+            return
+        # Each call opens its own file, so threads of one process also exclude each other
+        with open(self._lock_path, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def path(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def relative_path(self, sha256):
+        return os.path.join(sha256[:2], sha256)
+
+    def exists(self, sha256):
+        return os.path.exists(self.path(sha256))
+
+    def writer(self):
+        return BlobWriter(self)
+
+    def delete(self, sha256):
+        try:
+            os.remove(self.path(sha256))
+        except FileNotFoundError:
+            pass
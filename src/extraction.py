@@ -0,0 +1,183 @@
+"""Background text extraction from RFP attachments.
+
+Documents are parsed in a process pool so CPU-heavy PDF and spreadsheet
+parsing never runs on (or blocks the GIL of) a request thread. Each file is
+read incrementally, PDFs page by page and XLSX sheets row by row in read-only
+mode, and extraction stops once ``max_chars`` of text has been collected.
+Worker processes also run under an address-space limit and are recycled after
+a fixed number of files, so one huge or malformed document cannot grow a
+worker without bound.
+
+Results are cached by the blob's SHA-256 in a ``ResultCache``, so extracting
+the same file again (a re-import, or the same PDF attached to another RFP) is
+free.
+
+PDF support needs ``pypdf`` and XLSX support needs ``openpyxl``; without them
+those files report an error and everything else keeps working.
+"""
+import csv
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.result_cache import ResultCache, content_key
+
+try:
+    import pypdf
+except ImportError:  # optional dependency
+    pypdf = None
+
+try:
+    import openpyxl
+except ImportError:  # optional dependency
+    openpyxl = None
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+EXTRACTOR_VERSION = '1'
+PDF_TYPES = ('pdf',)
+SPREADSHEET_TYPES = ('xlsx', 'xlsm', 'csv')
+TEXT_TYPES = ('txt',)
+SUPPORTED_TYPES = PDF_TYPES + SPREADSHEET_TYPES + TEXT_TYPES
+
+
+def _iter_pdf(path):
+    if pypdf is None:
+        raise RuntimeError('PDF extraction requires pypdf')
+    # PdfReader reads objects from the open file on demand rather than loading it whole
+    with open(path, 'rb') as f:
+        reader = pypdf.PdfReader(f)
+        for number, page in enumerate(reader.pages, 1):
+            text = (page.extract_text() or '').strip()
+            if text:
+                yield f'[Page {number}]\n{text}\n'
+
+
+def _iter_xlsx(path):
+    if openpyxl is None:
+        raise RuntimeError('XLSX extraction requires openpyxl')
+    # Pass a file object: blobs have no extension and openpyxl checks it on paths.
+    # read_only mode streams rows from the archive instead of building the sheet in memory.
+    with open(path, 'rb') as f:
+        workbook = openpyxl.load_workbook(f, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                yield f'[Sheet {sheet.title}]\n'
+                for row in sheet.iter_rows(values_only=True):
+                    cells = ['' if value is None else str(value) for value in row]
+                    if any(cells):
+                        yield '\t'.join(cells).rstrip('\t') + '\n'
+        finally:
+            workbook.close()
+
+
+def _iter_csv(path):
+    with open(path, newline='', encoding='utf-8', errors='replace') as f:
+        for row in csv.reader(f):
+            if any(row):
+                yield '\t'.join(row) + '\n'
+
+
+def _iter_text(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        yield from f
+
+
+def _chunks(path, file_type):
+    if file_type in PDF_TYPES:
+        return _iter_pdf(path)
+    if file_type in ('xlsx', 'xlsm'):
+        return _iter_xlsx(path)
+    if file_type == 'csv':
+        return _iter_csv(path)
+    if file_type in TEXT_TYPES:
+        return _iter_text(path)
+    raise ValueError(f'Unsupported file type: {file_type}')
+
+
+def extract_text(path, file_type, max_chars=1000000):
+    """Extract up to ``max_chars`` of text from a file.
+
+    Returns ``{'text', 'chars', 'truncated'}``, or ``{'error'}`` when the file
+    cannot be parsed. Runs inside the worker process.
+    """
+    parts, chars, truncated = [], 0, False
+    try:
+        for chunk in _chunks(path, file_type):
+            if chars + len(chunk) > max_chars:
+                parts.append(chunk[:max_chars - chars])
+                chars = max_chars
+                truncated = True
+                break
+            parts.append(chunk)
+            chars += len(chunk)
+    except MemoryError:
+        return {'error': 'Memory limit exceeded while extracting'}
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+    return {'text': ''.join(parts), 'chars': chars, 'truncated': truncated}
+
+
+def _limit_worker_memory(limit_bytes):
+    if resource is not None and limit_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+
+
+class ExtractionService:
+    """Process pool for ``extract_text`` with a hash-keyed result cache"""
+
+    def __init__(self, max_workers=2, memory_limit_mb=512, max_chars=1000000,
+                 files_per_worker=50, cache=None):
+        self.max_workers = max_workers
+        self.memory_limit_mb = memory_limit_mb
+        self.max_chars = max_chars
+        self.files_per_worker = files_per_worker
+        self.cache = cache or ResultCache(max_entries=256, ttl=30 * 24 * 3600)
+        self._processes = self._new_pool()
+        # Coordinates multi-file jobs (and their write-back) off the request thread
+        self._background = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='extract')
+
+    def _new_pool(self):
+        # spawn: forking a process that holds DB connections and server threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_limit_worker_memory,
+            initargs=(self.memory_limit_mb * 1024 * 1024,),
+            max_tasks_per_child=self.files_per_worker
+        )
+
+    def cache_key(self, sha256):
+        return content_key('extraction', {'sha256': sha256}, f'{EXTRACTOR_VERSION}:{self.max_chars}')
+
+    def extract(self, path, sha256, file_type):
+        """Future for the extraction of one blob, answered from the cache when possible"""
+        cached = self.cache.get(self.cache_key(sha256))
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        try:
+            future = self._processes.submit(extract_text, path, file_type, self.max_chars)
+        except BrokenProcessPool:
+            # A worker died hard (e.g. killed at the memory limit); start a fresh pool
+            self._processes = self._new_pool()
+            future = self._processes.submit(extract_text, path, file_type, self.max_chars)
+
+        def remember(done):
+            if not done.cancelled() and done.exception() is None and 'error' not in done.result():
+                self.cache.set(self.cache_key(sha256), done.result())
+
+        future.add_done_callback(remember)
+        return future
+
+    def run_in_background(self, func, *args):
+        return self._background.submit(func, *args)
+
+    def shutdown(self, wait=True):
+        self._background.shutdown(wait=wait)
+        self._processes.shutdown(wait=wait)
@@ -0,0 +1,464 @@
+"""Background job queue for the AI pipeline (analyze -> proposal -> quality check).
+
+Request handlers enqueue a stage and return a job id immediately; a worker pool
+runs the stage off the request thread. Jobs may depend on another job, which is
+how the analyze -> proposal -> quality-check chain runs as a pipeline: a
+dependent job waits until its upstream job completes, receives the upstream
+result, and fails without running if the upstream job fails.
+
+Job state lives in a pluggable backend. ``InMemoryJobBackend`` is the default;
+``SQLiteJobBackend`` persists jobs to a file so any worker process can report
+on them and unfinished jobs are picked up again after a restart. It is the
+local stand-in for a shared store and implements the same small interface a
+Redis or Postgres backend would.
+
+Recovery works by leases. Every unfinished job is owned by one queue, which
+renews the job's lease while it holds it. A queue's maintenance pass (at
+start-up, then every ``maintenance_interval`` seconds on persistent backends)
+adopts unfinished jobs whose lease has run out, because their owner stopped or
+crashed: queued and running jobs are run again from the start, and waiting jobs
+are re-attached to their upstream job. The same pass starts or fails waiting
+jobs whose upstream job was finished by another process.
+
+Finished jobs are kept for ``retention_seconds`` so clients can still read
+their results, then pruned, so a long-running server does not accumulate them.
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+QUEUED = 'queued'
+WAITING = 'waiting'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+TERMINAL_STATES = (COMPLETED, FAILED)
+UNFINISHED_STATES = (QUEUED, WAITING, RUNNING)
+
+
+class InMemoryJobBackend:
+    """Job storage in process memory"""
+
+    # Jobs die with the process, so there is nothing to recover
+    persistent = False
+
+    def __init__(self):
+        self._jobs = {}
+        # Finished job ids, oldest first, so pruning stops at the first one to keep
+        self._finished = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, job):
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+            if job['status'] in TERMINAL_STATES:
+                self._finished[job['id']] = job.get('finished_at') or job['updated_at']
+                self._finished.move_to_end(job['id'])
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self, pipeline_id):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values() if job['pipeline_id'] == pipeline_id]
+
+    def expired(self, now):
+        """Unfinished jobs whose lease ran out before ``now``"""
+        with self._lock:
+            return [
+                dict(job) for job in self._jobs.values()
+                if job['status'] in UNFINISHED_STATES and (job.get('lease_expires_at') or 0) < now
+            ]
+
+    def adopt(self, job_id, owner, lease_expires_at, now):
+        """Take over an unfinished job whose lease ran out; returns it, or None if another owner holds it"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] not in UNFINISHED_STATES or (job.get('lease_expires_at') or 0) >= now:
+                return None
+            job.update(owner=owner, lease_expires_at=lease_expires_at)
+            return dict(job)
+
+    def renew(self, job_ids, owner, lease_expires_at):
+        """Extend the leases ``owner`` holds on ``job_ids``"""
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job is not None and job.get('owner') == owner:
+                    job['lease_expires_at'] = lease_expires_at
+
+    def prune(self, finished_before):
+        """Delete finished jobs whose ``finished_at`` is before the ISO timestamp; returns how many"""
+        with self._lock:
+            pruned = 0
+            while self._finished:
+                job_id, finished_at = next(iter(self._finished.items()))
+                if finished_at >= finished_before:
+                    break
+                del self._finished[job_id]
+                self._jobs.pop(job_id, None)
+                pruned += 1
+            return pruned
+
+
+class SQLiteJobBackend:
+    """Job storage in a SQLite file, shared by every process on the host"""
+
+    persistent = True
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, pipeline_id TEXT, data TEXT NOT NULL)'
+        )
+        # Files written before recovery existed lack the lease columns
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        for column, column_type in (
+            ('status', 'TEXT'), ('owner', 'TEXT'), ('lease_expires_at', 'REAL'), ('finished_at', 'TEXT')
+        ):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {column_type}')
+        if 'status' not in columns:
+            self._conn.execute("UPDATE jobs SET status = json_extract(data, '$.status')")
+        if 'finished_at' not in columns:
+            self._conn.execute(
+                "UPDATE jobs SET finished_at = coalesce(json_extract(data, '$.finished_at'), "
+                "json_extract(data, '$.updated_at')) WHERE status IN (?, ?)",
+                TERMINAL_STATES
+            )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_jobs_pipeline_id ON jobs (pipeline_id)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_jobs_status_lease ON jobs (status, lease_expires_at)')
+        # Only finished jobs have finished_at, so pruning reads just the rows it deletes
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_jobs_finished_at ON jobs (finished_at)')
+        self._conn.commit()
+
+    def save(self, job):
+        with self._lock:
+            finished_at = (job.get('finished_at') or job['updated_at']) if job['status'] in TERMINAL_STATES else None
+            self._conn.execute(
+                'INSERT OR REPLACE INTO jobs (id, pipeline_id, status, owner, lease_expires_at, finished_at, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job['id'], job['pipeline_id'], job['status'], job.get('owner'),
+                 job.get('lease_expires_at'), finished_at, json.dumps(job))
+            )
+            self._conn.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list(self, pipeline_id):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data FROM jobs WHERE pipeline_id = ? ORDER BY rowid', (pipeline_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def expired(self, now):
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data FROM jobs WHERE status IN (?, ?, ?) '
+                'AND (lease_expires_at IS NULL OR lease_expires_at < ?) ORDER BY rowid',
+                (*UNFINISHED_STATES, now)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def adopt(self, job_id, owner, lease_expires_at, now):
+        with self._lock:
+            # Conditional on the lease still being expired, so only one process wins
+            cursor = self._conn.execute(
+                "UPDATE jobs SET owner = ?, lease_expires_at = ?, "
+                "data = json_set(data, '$.owner', ?, '$.lease_expires_at', ?) "
+                'WHERE id = ? AND status IN (?, ?, ?) AND (lease_expires_at IS NULL OR lease_expires_at < ?)',
+                (owner, lease_expires_at, owner, lease_expires_at, job_id, *UNFINISHED_STATES, now)
+            )
+            self._conn.commit()
+            if cursor.rowcount != 1:
+                return None
+            row = self._conn.execute('SELECT data FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row[0])
+
+    def renew(self, job_ids, owner, lease_expires_at):
+        if not job_ids:
+            return
+        placeholders = ', '.join('?' for _ in job_ids)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, data = json_set(data, '$.lease_expires_at', ?) "
+                f'WHERE owner = ? AND id IN ({placeholders})',
+                (lease_expires_at, lease_expires_at, owner, *job_ids)
+            )
+            self._conn.commit()
+
+    def prune(self, finished_before):
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM jobs WHERE finished_at < ?', (finished_before,))
+            self._conn.commit()
+        return cursor.rowcount
+
+
+def backend_from_url(url):
+    """Build a backend from ``memory://`` or ``sqlite:///path/to/jobs.db``"""
+    if not url or url == 'memory://':
+        return InMemoryJobBackend()
+    if url.startswith('sqlite:///'):
+        return SQLiteJobBackend(url[len('sqlite:///'):])
+    raise ValueError(f'Unsupported job backend: {url}')
+
+
+class JobQueue:
+    """Runs registered stages on a thread pool and tracks them in a backend"""
+
+    def __init__(self, backend=None, max_workers=4, lease_seconds=30, maintenance_interval=5,
+                 retention_seconds=3600):
+        self.backend = backend or InMemoryJobBackend()
+        self.id = uuid.uuid4().hex
+        self.lease_seconds = lease_seconds
+        # How long finished jobs stay readable (None keeps them forever)
+        self.retention_seconds = retention_seconds
+        self._pruned_at = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._stages = {}
+        # Local dependents of each job, and a condition to wake status watchers
+        self._dependents = {}
+        self._changed = threading.Condition()
+        # Unfinished jobs this queue owns, whose leases it renews
+        self._held = set()
+        # Serializes this queue's read-modify-write of job records
+        self._write_lock = threading.RLock()
+        self._stopping = threading.Event()
+        self._recovering = threading.Event()
+        self._maintenance_interval = maintenance_interval
+        self._maintenance = None
+
+    def register(self, stage, func):
+        """Register ``func(payload, upstream_result)`` as the runner for ``stage``"""
+        self._stages[stage] = func
+
+    def start(self):
+        """Recover unfinished jobs now and keep doing so in the background (persistent backends only).
+
+        Call once every stage is registered.
+        """
+        if self.backend.persistent and not self._recovering.is_set():
+            self._recovering.set()
+            self.recover()
+            self._start_maintenance()
+
+    def submit(self, stage, payload, depends_on=None, pipeline_id=None):
+        """Enqueue ``stage``; with ``depends_on`` it starts once that job completes"""
+        if stage not in self._stages:
+            raise KeyError(f'Unknown stage: {stage}')
+
+        now = datetime.now().isoformat()
+        job = {
+            'id': uuid.uuid4().hex,
+            'stage': stage,
+            'payload': payload,
+            'status': WAITING if depends_on else QUEUED,
+            'depends_on': depends_on,
+            'pipeline_id': pipeline_id,
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now,
+            'started_at': None,
+            'finished_at': None,
+        }
+        self._save(job)
+        self._maybe_prune()
+
+        if depends_on:
+            self._wait_for(job['id'], depends_on)
+        else:
+            self._executor.submit(self._run, job['id'], None)
+        return job
+
+    def pipeline(self, stages, payload):
+        """Enqueue ``stages`` as a chain, each depending on the previous; returns the jobs"""
+        pipeline_id = uuid.uuid4().hex
+        jobs = []
+        for stage in stages:
+            depends_on = jobs[-1]['id'] if jobs else None
+            jobs.append(self.submit(stage, payload, depends_on=depends_on, pipeline_id=pipeline_id))
+        return pipeline_id, jobs
+
+    def get(self, job_id):
+        return self.backend.get(job_id)
+
+    def list_pipeline(self, pipeline_id):
+        return self.backend.list(pipeline_id)
+
+    def watch(self, job_id, poll_interval=1.0, timeout=None):
+        """Yield the job each time its status changes, ending at a terminal state.
+
+        Local updates wake watchers immediately; the poll interval also picks up
+        changes made by other processes sharing a persistent backend.
+        """
+        deadline = None if timeout is None else datetime.now().timestamp() + timeout
+        last_seen = None
+        while True:
+            job = self.backend.get(job_id)
+            if job is None:
+                return
+            version = (job['updated_at'], job['status'])
+            if version != last_seen:
+                last_seen = version
+                yield job
+            if job['status'] in TERMINAL_STATES:
+                return
+            if deadline is not None and datetime.now().timestamp() >= deadline:
+                return
+            with self._changed:
+                self._changed.wait(poll_interval)
+
+    def recover(self):
+        """Adopt unfinished jobs whose owner's lease ran out, and release waiting jobs
+        whose upstream job has finished; returns the ids of the adopted jobs"""
+        now = time.time()
+        adopted = []
+        for stale in self.backend.expired(now):
+            if stale['stage'] not in self._stages:
+                continue
+            job = self.backend.adopt(stale['id'], self.id, now + self.lease_seconds, now)
+            if job is None:
+                continue
+            adopted.append(job['id'])
+            with self._write_lock:
+                self._held.add(job['id'])
+            if job['status'] == WAITING:
+                self._wait_for(job['id'], job['depends_on'])
+                continue
+
+            # Queued or interrupted mid-run: run it again from the start
+            upstream_result = None
+            if job['depends_on']:
+                upstream = self.backend.get(job['depends_on'])
+                upstream_result = upstream['result'] if upstream else None
+            job['status'] = QUEUED
+            job['started_at'] = None
+            self._save(job)
+            self._executor.submit(self._run, job['id'], upstream_result)
+
+        # Upstream jobs finished by another process do not notify this one
+        with self._changed:
+            upstream_ids = list(self._dependents)
+        for upstream_id in upstream_ids:
+            upstream = self.backend.get(upstream_id)
+            if upstream is None:
+                upstream = {'id': upstream_id, 'stage': 'missing', 'status': FAILED}
+            if upstream['status'] in TERMINAL_STATES:
+                self._release_dependents(upstream)
+        return adopted
+
+    def prune(self):
+        """Delete jobs that finished more than ``retention_seconds`` ago; returns how many"""
+        self._pruned_at = time.monotonic()
+        if self.retention_seconds is None:
+            return 0
+        cutoff = datetime.now() - timedelta(seconds=self.retention_seconds)
+        return self.backend.prune(cutoff.isoformat())
+
+    def shutdown(self, wait=True):
+        self._stopping.set()
+        self._executor.shutdown(wait=wait)
+        # Hand jobs that did not get to run straight to the next queue to start
+        with self._write_lock:
+            held = list(self._held)
+        self.backend.renew(held, self.id, 0)
+
+    def _start_maintenance(self):
+        # Lease renewal runs as soon as the queue holds a job; recovery waits for start()
+        with self._write_lock:
+            if self.backend.persistent and self._maintenance is None:
+                self._maintenance = threading.Thread(target=self._maintain, name='job-maintenance', daemon=True)
+                self._maintenance.start()
+
+    def _maintain(self):
+        while not self._stopping.wait(self._maintenance_interval):
+            with self._write_lock:
+                held = list(self._held)
+            self.backend.renew(held, self.id, time.time() + self.lease_seconds)
+            if self._recovering.is_set():
+                self.recover()
+            self._maybe_prune()
+
+    def _maybe_prune(self):
+        # At most once per maintenance interval; submit() covers queues without a maintenance thread
+        if self._pruned_at is None or time.monotonic() - self._pruned_at >= self._maintenance_interval:
+            self.prune()
+
+    def _wait_for(self, job_id, upstream_id):
+        with self._changed:
+            self._dependents.setdefault(upstream_id, []).append(job_id)
+        upstream = self.backend.get(upstream_id)
+        # The upstream job may already have finished before we registered
+        if upstream and upstream['status'] in TERMINAL_STATES:
+            self._release_dependents(upstream)
+
+    def _save(self, job):
+        with self._write_lock:
+            job['updated_at'] = datetime.now().isoformat()
+            if job['status'] in TERMINAL_STATES:
+                job['owner'] = job['lease_expires_at'] = None
+                self._held.discard(job['id'])
+            else:
+                job['owner'] = self.id
+                job['lease_expires_at'] = time.time() + self.lease_seconds
+                self._held.add(job['id'])
+                self._start_maintenance()
+            self.backend.save(job)
+        with self._changed:
+            self._changed.notify_all()
+
+    def _run(self, job_id, upstream_result):
+        with self._write_lock:
+            job = self.backend.get(job_id)
+            job['status'] = RUNNING
+            job['started_at'] = datetime.now().isoformat()
+            self._save(job)
+        try:
+            result = self._stages[job['stage']](job['payload'], upstream_result)
+            error = None
+        except Exception as e:
+            result, error = None, str(e)
+        with self._write_lock:
+            job = self.backend.get(job_id)
+            job['result'] = result
+            job['error'] = error
+            job['status'] = FAILED if error is not None else COMPLETED
+            job['finished_at'] = datetime.now().isoformat()
+            self._save(job)
+        self._release_dependents(job)
+
+    def _release_dependents(self, upstream):
+        with self._changed:
+            dependent_ids = self._dependents.pop(upstream['id'], [])
+        for dependent_id in dependent_ids:
+            with self._write_lock:
+                job = self.backend.get(dependent_id)
+                if job is None or job['status'] != WAITING:
+                    continue
+                if upstream['status'] == COMPLETED:
+                    job['status'] = QUEUED
+                    self._save(job)
+                else:
+                    job['status'] = FAILED
+                    job['error'] = f"Upstream job {upstream['id']} ({upstream['stage']}) failed"
+                    job['finished_at'] = datetime.now().isoformat()
+                    self._save(job)
+            if upstream['status'] == COMPLETED:
+                self._executor.submit(self._run, dependent_id, upstream['result'])
+            else:
+                self._release_dependents(job)
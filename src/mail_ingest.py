@@ -0,0 +1,329 @@
+"""Incremental ingestion of RFP emails into ``EmailRFP``.
+
+A mailbox source yields raw messages after a saved cursor, so each poll parses
+only mail that arrived since the previous one:
+
+- ``MboxSource`` reads an append-only mbox file from the byte offset where the
+  last poll stopped. A message is consumed once the next ``From `` line shows
+  it is complete; the last one waits until the file has stopped changing, so a
+  message still being appended is never read half-written.
+- ``MaildirSource`` lists ``new/`` and ``cur/`` and opens only files whose
+  delivery timestamp (the first part of every Maildir file name) is at or
+  after the cursor.
+
+Messages are deduplicated on Message-ID (within a batch and against stored
+rows, one query per batch), inserted in batches, and messages whose subject
+looks like an RFP are imported as ``RFP`` rows in bulk. The cursor and the
+newest (received_date, message-id) seen are saved in ``MailboxWatermark`` in
+the same transaction as each batch, so a crash resumes after the last
+committed batch. A message that cannot be parsed or stored is recorded in
+``EmailDeadLetter`` in that same transaction and the cursor moves past it, so
+one bad message never stalls the mailbox. Run a single ingester per mailbox.
+"""
+import email
+import email.policy
+import email.utils
+import hashlib
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.models.rfp import db, RFP, EmailRFP, EmailDeadLetter, MailboxWatermark, parse_budget_range
+
+MAX_BODY_CHARS = 20000
+RFP_SUBJECT = re.compile(r'\bRFPs?\b|request for proposal', re.IGNORECASE)
+# "Budget: $500K - $750K" style lines in the email body
+_FIELD_LINE = re.compile(
+    r'^\s*(agency|client|advertiser|campaign type|budget|due date)\s*:\s*(.+?)\s*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+class MboxSource:
+    """Append-only mbox file, resumed from a byte offset"""
+
+    def __init__(self, path, settle_seconds=5.0):
+        self.path = path
+        self.name = f'mbox://{os.path.abspath(path)}'
+        # The last message has no following "From " line to show it is
+        # complete, so it is read only once the file is this many seconds old
+        self.settle_seconds = settle_seconds
+
+    def read(self, cursor):
+        """Yield ``(raw_message, cursor_after)`` for each complete message after ``cursor``"""
+        offset = int(cursor or 0)
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        size = stat.st_size
+        if offset > size:
+            offset = 0  # truncated or rotated; Message-ID dedupe absorbs the re-read
+        settled = time.time() - stat.st_mtime >= self.settle_seconds
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            lines, position = [], offset
+            # Stop at the size seen above; anything appended since is the next poll's
+            while position < size:
+                line = f.readline()
+                if not line:
+                    break
+                if line.startswith(b'From ') and lines:
+                    yield b''.join(lines[1:]), str(position)
+                    lines = []
+                lines.append(line)
+                position += len(line)
+            if lines and settled and lines[-1].endswith(b'\n'):
+                yield b''.join(lines[1:]), str(position)
+
+
+class MaildirSource:
+    """Maildir directory, resumed from a delivery timestamp"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f'maildir://{os.path.abspath(path)}'
+
+    def read(self, cursor):
+        """Yield ``(raw_message, cursor_after)`` for messages delivered at or after ``cursor``"""
+        since = int(cursor or 0)
+        entries = []
+        for subdir in ('new', 'cur'):
+            directory = os.path.join(self.path, subdir)
+            try:
+                names = os.listdir(directory)
+            except FileNotFoundError:
+                continue
+            for name in names:
+                stamp = name.split('.', 1)[0]
+                # Same-second deliveries are re-read next time and dropped by dedupe
+                if stamp.isdigit() and int(stamp) >= since:
+                    entries.append((int(stamp), name, os.path.join(directory, name)))
+
+        for stamp, _, path in sorted(entries):
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                continue  # moved from new/ to cur/ since listing; picked up next poll
+            yield raw, str(stamp)
+
+
+def source_from_url(url):
+    """Build a source from ``mbox:///path/to/file`` or ``maildir:///path/to/dir``"""
+    if url.startswith('mbox://'):
+        return MboxSource(url[len('mbox://'):])
+    if url.startswith('maildir://'):
+        return MaildirSource(url[len('maildir://'):])
+    raise ValueError(f'Unsupported mail source: {url}')
+
+
+def parse_message(raw):
+    """EmailRFP column values for one raw RFC 822 message"""
+    message = email.message_from_bytes(raw, policy=email.policy.default)
+    message_id = str(message.get('Message-ID') or '').strip()
+    if not message_id:
+        message_id = 'sha256:' + hashlib.sha256(raw).hexdigest()
+
+    try:
+        received = email.utils.parsedate_to_datetime(str(message['Date']))
+        if received.tzinfo is not None:
+            received = received.astimezone(timezone.utc).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        received = datetime.utcnow()
+
+    name, address = email.utils.parseaddr(str(message.get('From') or ''))
+    body_part = message.get_body(preferencelist=('plain',))
+    try:
+        body = body_part.get_content() if body_part is not None else ''
+    except (LookupError, ValueError):
+        body = ''
+
+    return {
+        'message_id': message_id[:500],
+        'subject': str(message.get('Subject') or '(no subject)')[:300],
+        'sender': (name or address or 'unknown')[:200],
+        'received_date': received,
+        'attachment_count': sum(1 for _ in message.iter_attachments()),
+        'body': body[:MAX_BODY_CHARS],
+        'processed': False
+    }
+
+
+def rfp_row_from_email(message):
+    """RFP column values for an RFP email, using labelled lines in the body where present"""
+    fields = {label.lower(): value for label, value in _FIELD_LINE.findall(message['body'])}
+    budget_range = fields.get('budget', 'TBD')[:50]
+    budget_min, budget_max = parse_budget_range(budget_range)
+    try:
+        due_date = datetime.strptime(fields.get('due date', ''), '%Y-%m-%d').date()
+    except ValueError:
+        due_date = (message['received_date'] + timedelta(days=30)).date()
+    now = datetime.utcnow()
+    return {
+        'name': message['subject'][:200],
+        'agency_name': (fields.get('agency') or message['sender'])[:200],
+        'advertiser_client_name': (fields.get('client') or fields.get('advertiser') or '')[:200] or None,
+        'campaign_type': fields.get('campaign type', 'Digital Media')[:100],
+        'budget_range': budget_range,
+        'budget_min': budget_min,
+        'budget_max': budget_max,
+        'due_date': due_date,
+        'status': 'New',
+        'completion_percentage': 0,
+        'content': message['body'],
+        'ai_processing_enabled': True,
+        'created_at': now,
+        'updated_at': now,
+        'submitted_date': None
+    }
+
+
+def _insert_messages(messages, auto_import):
+    """Insert EmailRFP rows, importing RFP emails; returns ``(inserted, imported)``"""
+    email_table = EmailRFP.__table__
+    email_ids = db.session.execute(
+        email_table.insert().returning(email_table.c.id, sort_by_parameter_order=True), messages
+    ).scalars().all()
+
+    to_import = [(email_id, message) for email_id, message in zip(email_ids, messages)
+                 if auto_import and RFP_SUBJECT.search(message['subject'])]
+    if to_import:
+        rfp_ids = db.session.execute(
+            RFP.__table__.insert().returning(RFP.__table__.c.id, sort_by_parameter_order=True),
+            [rfp_row_from_email(message) for _, message in to_import]
+        ).scalars().all()
+        db.session.execute(
+            email_table.update().where(email_table.c.id == db.bindparam('email_id')).values(
+                processed=True, rfp_id=db.bindparam('new_rfp_id')
+            ),
+            [{'email_id': email_id, 'new_rfp_id': rfp_id}
+             for (email_id, _), rfp_id in zip(to_import, rfp_ids)]
+        )
+    return len(email_ids), len(to_import)
+
+
+def _dead_letter(source, cursor, raw, message_id, error):
+    return EmailDeadLetter(
+        mailbox=source.name, cursor=cursor, message_id=message_id,
+        error=f'{type(error).__name__}: {error}', raw=raw
+    )
+
+
+def _save_batch(source, batch, dead_letters, watermark, cursor, auto_import, stats):
+    """Store ``batch`` (``(message, raw, cursor)`` triples) and move the watermark to ``cursor``.
+
+    If the batch insert is rejected, its messages are retried one at a time in
+    savepoints and those that still fail join ``dead_letters``, which are saved
+    in the same transaction.
+    """
+    # Dedupe inside the batch, then against stored rows with one IN query
+    unique = {}
+    for entry in batch:
+        unique.setdefault(entry[0]['message_id'], entry)
+    existing = set(db.session.scalars(
+        db.select(EmailRFP.message_id).where(EmailRFP.message_id.in_(list(unique)))
+    )) if unique else set()
+    new = [entry for message_id, entry in unique.items() if message_id not in existing]
+    stats['duplicates'] += len(batch) - len(new)
+
+    stored = []
+    if new:
+        try:
+            with db.session.begin_nested():
+                counts = _insert_messages([message for message, _, _ in new], auto_import)
+            stored = [message for message, _, _ in new]
+        except Exception:
+            counts = (0, 0)
+            for message, raw, message_cursor in new:
+                try:
+                    with db.session.begin_nested():
+                        inserted, imported = _insert_messages([message], auto_import)
+                    counts = (counts[0] + inserted, counts[1] + imported)
+                    stored.append(message)
+                except Exception as e:
+                    dead_letters.append(_dead_letter(source, message_cursor, raw, message['message_id'], e))
+        stats['inserted'] += counts[0]
+        stats['imported'] += counts[1]
+
+    if stored:
+        latest = max(stored, key=lambda message: (message['received_date'], message['message_id']))
+        latest_key = (latest['received_date'], latest['message_id'])
+        if watermark.last_received_date is None or latest_key > (watermark.last_received_date, watermark.last_message_id or ''):
+            watermark.last_received_date, watermark.last_message_id = latest_key
+
+    stats['failed'] += len(dead_letters)
+    db.session.add_all(dead_letters)
+    watermark.cursor = cursor
+    db.session.commit()
+
+
+def ingest(source, batch_size=200, auto_import=True):
+    """Read new messages from ``source`` into EmailRFP; call inside an app context.
+
+    Returns counts of messages read, inserted, skipped as duplicates, imported
+    as RFPs and failed (stored as ``EmailDeadLetter`` rows).
+    """
+    watermark = db.session.get(MailboxWatermark, source.name)
+    if watermark is None:
+        watermark = MailboxWatermark(mailbox=source.name)
+        db.session.add(watermark)
+
+    stats = {'read': 0, 'inserted': 0, 'duplicates': 0, 'imported': 0, 'failed': 0}
+    batch, dead_letters, cursor = [], [], watermark.cursor
+    try:
+        for raw, cursor in source.read(watermark.cursor):
+            stats['read'] += 1
+            try:
+                batch.append((parse_message(raw), raw, cursor))
+            except Exception as e:
+                dead_letters.append(_dead_letter(source, cursor, raw, None, e))
+            if len(batch) + len(dead_letters) >= batch_size:
+                _save_batch(source, batch, dead_letters, watermark, cursor, auto_import, stats)
+                batch, dead_letters = [], []
+        _save_batch(source, batch, dead_letters, watermark, cursor, auto_import, stats)
+    except Exception:
+        db.session.rollback()
+        raise
+    stats['watermark'] = watermark.to_dict()
+    return stats
+
+
+class IngestionWorker:
+    """Polls a mailbox source on a daemon thread every ``interval`` seconds"""
+
+    def __init__(self, app, source, interval=60.0, batch_size=200, auto_import=True):
+        self.app = app
+        self.source = source
+        self.interval = interval
+        self.batch_size = batch_size
+        self.auto_import = auto_import
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        with self.app.app_context():
+            try:
+                return ingest(self.source, self.batch_size, self.auto_import)
+            finally:
+                db.session.remove()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='mail-ingest', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                self.app.logger.exception('Mail ingestion from %s failed', self.source.name)
+            self._stop.wait(self.interval)
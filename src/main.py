@@ -1,14 +1,32 @@
+import os
+import sys
+
+# Make the src package importable when run as `python src/main.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
-import os
 import json
 from datetime import datetime, timedelta
 import random
 
+from src.json_provider import FastJSONProvider
+from src.memory_store import InMemoryStore
+from src.models.knowledge import db, KnowledgeStats
+from src.models.migrations import run_migrations
+from src.routes.knowledge import knowledge_bp, seed_articles
+
 app = Flask(__name__, static_folder='static', static_url_path='')
+app.json = FastJSONProvider(app)
 CORS(app)
 
-# Sample data
+# Knowledge articles live in the database so every gunicorn worker sees the same
+# ones; a relative SQLite path resolves inside the app's instance folder
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
+db.init_app(app)
+app.register_blueprint(knowledge_bp, url_prefix='/api')
+
+# Sample data (seeds the RFP store and an empty knowledge_articles table below)
 sample_rfps = [
     {
         'id': 1,
@@ -23,8 +41,8 @@ sample_rfps = [
         'description': 'Comprehensive digital media campaign targeting tech-savvy consumers aged 25-45. Focus on mobile-first approach with emphasis on programmatic buying and social media integration.',
         'team_members': ['John Smith', 'Sarah Johnson', 'Mike Chen', 'Lisa Rodriguez'],
         'attachments': [
-            {'name': 'TechGadgets_Q3_Digital_RFP.pdf', 'size': '2.3 MB'},
-            {'name': 'TechGadgets_Media_Requirements.xlsx', 'size': '1.1 MB'}
+            {'name': 'TechGadgets_Q3_Digital_RFP.pdf', 'size_bytes': 2411725},
+            {'name': 'TechGadgets_Media_Requirements.xlsx', 'size_bytes': 1153434}
         ]
     },
     {
@@ -40,7 +58,7 @@ sample_rfps = [
         'description': 'Summer retail promotion campaign focusing on fashion and lifestyle products. Multi-channel approach including digital, print, and outdoor advertising.',
         'team_members': ['Emma Wilson', 'David Park', 'Rachel Green', 'Tom Anderson'],
         'attachments': [
-            {'name': 'FashionRetail_Summer_Campaign.pdf', 'size': '1.8 MB'}
+            {'name': 'FashionRetail_Summer_Campaign.pdf', 'size_bytes': 1887437}
         ]
     }
 ]
@@ -84,6 +102,50 @@ sample_knowledge_articles = [
     }
 ]
 
+# In-memory RFP store with O(1) lookups by id and status
+rfp_store = InMemoryStore(sample_rfps, indexed_fields=('status',))
+
+with app.app_context():
+    db.create_all()
+    run_migrations()
+    seed_articles(sample_knowledge_articles)
+
+def compute_dashboard_stats(recompute=False):
+    """Dashboard stats from the maintained counters, or from a full rescan with recompute=True.
+    
+    Article totals come from the knowledge_stats row, which every worker's writes
+    keep up to date, so they are shared across workers without a table scan.
+    """
+    if recompute:
+        active_rfps = len([r for r in rfp_store.all() if r['status'] == 'In Progress'])
+        total_articles, total_views, rating_sum = KnowledgeStats.recount()
+    else:
+        active_rfps = rfp_store.count('status', 'In Progress')
+        total_articles, total_views, rating_sum = KnowledgeStats.totals()
+    
+    return {
+        'active_rfps': active_rfps,
+        'pending_placements': 87,
+        'ai_response_rate': 78,
+        'proposal_win_rate': 32,
+        'total_articles': total_articles,
+        'total_views': total_views,
+        'avg_rating': round(rating_sum / total_articles, 1) if total_articles else 0,
+        'categories': 8
+    }
+
+def check_dashboard_stats():
+    """Diff maintained dashboard stats against a full recompute; empty when consistent"""
+    maintained = compute_dashboard_stats()
+    recomputed = compute_dashboard_stats(recompute=True)
+    mismatches = {
+        key: (maintained[key], recomputed[key])
+        for key in maintained if maintained[key] != recomputed[key]
+    }
+    for key, values in rfp_store.verify().items():
+        mismatches[f'rfps.{key}'] = values
+    return mismatches
+
 # Routes
 @app.route('/')
 def index():
@@ -98,18 +160,18 @@ def serve_static(path):
 
 @app.route('/api/rfps', methods=['GET'])
 def get_rfps():
-    return jsonify(sample_rfps)
+    return app.json.stream(rfp_store.all())
 
 @app.route('/api/rfps/<int:rfp_id>', methods=['GET'])
 def get_rfp(rfp_id):
-    rfp = next((r for r in sample_rfps if r['id'] == rfp_id), None)
+    rfp = rfp_store.get(rfp_id)
     if rfp:
         return jsonify(rfp)
     return jsonify({'error': 'RFP not found'}), 404
 
 @app.route('/api/rfps/<int:rfp_id>/analyze', methods=['POST'])
 def analyze_rfp(rfp_id):
-    rfp = next((r for r in sample_rfps if r['id'] == rfp_id), None)
+    rfp = rfp_store.get(rfp_id)
     if not rfp:
         return jsonify({'error': 'RFP not found'}), 404
     
@@ -136,7 +198,7 @@ def analyze_rfp(rfp_id):
 
 @app.route('/api/rfps/<int:rfp_id>/generate-proposal', methods=['POST'])
 def generate_proposal(rfp_id):
-    rfp = next((r for r in sample_rfps if r['id'] == rfp_id), None)
+    rfp = rfp_store.get(rfp_id)
     if not rfp:
         return jsonify({'error': 'RFP not found'}), 404
     
@@ -173,43 +235,9 @@ def quality_check(rfp_id):
     }
     return jsonify(quality_scores)
 
-@app.route('/api/knowledge-base', methods=['GET'])
-def get_knowledge_base():
-    return jsonify(sample_knowledge_articles)
-
-@app.route('/api/knowledge-base', methods=['POST'])
-def create_article():
-    data = request.get_json()
-    
-    new_article = {
-        'id': len(sample_knowledge_articles) + 1,
-        'title': data.get('title', ''),
-        'category': data.get('category', 'Strategy'),
-        'type': data.get('type', 'Article'),
-        'content': data.get('content', ''),
-        'tags': data.get('tags', '').split(', ') if data.get('tags') else [],
-        'views': 0,
-        'rating': 3.1,
-        'created_date': datetime.now().strftime('%Y-%m-%d'),
-        'author': 'AI Assistant'
-    }
-    
-    sample_knowledge_articles.append(new_article)
-    return jsonify(new_article), 201
-
 @app.route('/api/dashboard/stats', methods=['GET'])
 def get_dashboard_stats():
-    stats = {
-        'active_rfps': len([r for r in sample_rfps if r['status'] == 'In Progress']),
-        'pending_placements': 87,
-        'ai_response_rate': 78,
-        'proposal_win_rate': 32,
-        'total_articles': len(sample_knowledge_articles),
-        'total_views': sum(article['views'] for article in sample_knowledge_articles),
-        'avg_rating': round(sum(article['rating'] for article in sample_knowledge_articles) / len(sample_knowledge_articles), 1),
-        'categories': 8
-    }
-    return jsonify(stats)
+    return jsonify(compute_dashboard_stats())
 
 @app.route('/api/import-rfp', methods=['POST'])
 def import_rfp():
@@ -217,7 +245,6 @@ def import_rfp():
     
     # Mock RFP import
     new_rfp = {
-        'id': len(sample_rfps) + 1,
         'name': data.get('rfp_name', 'Imported RFP'),
         'agency': data.get('agency_name', 'Unknown Agency'),
         'advertiser': data.get('advertiser_client', 'Unknown Client'),
@@ -231,7 +258,7 @@ def import_rfp():
         'attachments': []
     }
     
-    sample_rfps.append(new_rfp)
+    rfp_store.add(new_rfp)
     return jsonify(new_rfp), 201
 
 @app.route('/health')
@@ -9,18 +9,33 @@ import requests
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory, jsonify, request
+from flask import Flask, Response, send_from_directory, jsonify, request, stream_with_context
 from flask_cors import CORS
 
+from src.ai_fanout import FakeProvider, FanOutExecutor, merge_analyses
+from src.ai_providers import HTTPModelProvider, client_stats, get_client
+from src.jobs import JobQueue, backend_from_url
+from src.json_provider import FastJSONProvider
+from src.models.knowledge import db
+from src.models.migrations import run_migrations
+from src.result_cache import ResultCache, content_key
+from src.routes.knowledge import knowledge_bp, seed_articles
+
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.json = FastJSONProvider(app)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes
 CORS(app)
 
+# Knowledge articles are served by knowledge_bp from the database, so every worker
+# sees the same ones; a relative SQLite path resolves inside the instance folder
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
+db.init_app(app)
+app.register_blueprint(knowledge_bp, url_prefix='/api')
+
 # In-memory storage (replace with database in production)
 rfps_db = {}
-knowledge_articles_db = {}
 team_members_db = {
     1: {"id": 1, "name": "John Doe", "role": "Media Director", "email": "john.doe@company.com"},
     2: {"id": 2, "name": "Amanda Smith", "role": "Digital Strategist", "email": "amanda.smith@company.com"},
@@ -31,52 +46,90 @@ team_members_db = {
 }
 
 # AI Integration Functions
+AI_MODELS = ["GPT-4", "Gemini", "Claude", "Grok"]
+
+def simulated_model_analysis(rfp_content: str, rfp_data: Dict) -> Dict:
+    """Analysis from a single simulated model (stands in for a provider API call)"""
+    return {
+        "confidence_score": 0.87,
+        "key_insights": [
+            f"High-value {rfp_data.get('campaign_type', 'digital media')} opportunity with strong ROI potential",
+            "Recommended focus on programmatic and social channels based on target demographics",
+            f"Timeline is {'aggressive but achievable' if 'urgent' in rfp_data.get('status', '').lower() else 'well-structured'} with proper resource allocation",
+            f"Budget range of {rfp_data.get('budget_range', 'TBD')} aligns with market standards for this campaign type"
+        ],
+        "recommendations": [
+            "Prioritize mobile-first creative development for maximum reach",
+            f"Allocate 60% budget to digital channels, 40% to {rfp_data.get('campaign_type', 'traditional')} media",
+            "Implement real-time optimization strategy with A/B testing",
+            "Focus on data-driven attribution modeling for performance measurement"
+        ],
+        "risk_factors": [
+            "Tight timeline may require additional resources",
+            "Competitive landscape analysis needed",
+            "Creative approval process should be streamlined"
+        ],
+        "opportunities": [
+            "Strong brand alignment with target audience",
+            "Potential for campaign expansion based on performance",
+            "Cross-platform synergy opportunities"
+        ],
+        "technical_requirements": [
+            "Programmatic buying platform integration",
+            "Real-time reporting dashboard setup",
+            "Creative asset management system",
+            "Attribution tracking implementation"
+        ],
+        "estimated_timeline": "6-8 weeks from approval to launch",
+        "success_metrics": [
+            "Brand awareness lift: 15-25%",
+            "Click-through rate: 2.5%+",
+            "Cost per acquisition: 20% below industry average",
+            "Return on ad spend: 4:1 minimum"
+        ]
+    }
+
+AI_MODEL_TIMEOUT = float(os.environ.get('AI_MODEL_TIMEOUT', 20))
+
+def ai_client(name: str):
+    """Shared pooled client for ``name`` when AI_<NAME>_URL is set, otherwise None"""
+    env_name = name.upper().replace('-', '_')
+    base_url = os.environ.get(f'AI_{env_name}_URL')
+    if not base_url:
+        return None
+    return get_client(
+        name, base_url,
+        api_key=os.environ.get(f'AI_{env_name}_API_KEY'),
+        pool_size=int(os.environ.get('AI_PROVIDER_POOL_SIZE', 10)),
+        max_concurrency=int(os.environ.get('AI_PROVIDER_CONCURRENCY', 8)),
+        read_timeout=AI_MODEL_TIMEOUT,
+        max_retries=int(os.environ.get('AI_PROVIDER_RETRIES', 3))
+    )
+
+def analysis_provider(name: str):
+    """HTTP provider for a configured model, else the simulated one"""
+    client = ai_client(name)
+    if client is None:
+        return FakeProvider(name, result=simulated_model_analysis)
+    return HTTPModelProvider(client)
+
+# Every model is called concurrently, so analysis latency tracks the slowest
+# model within AI_MODEL_TIMEOUT / AI_ANALYSIS_DEADLINE instead of their sum.
+# The per-model cap is shared by every analysis in the process (request threads,
+# job workers, batch runs); calls over it wait for a free slot within their timeout.
+analysis_fanout = FanOutExecutor(
+    [analysis_provider(name) for name in AI_MODELS],
+    model_timeout=AI_MODEL_TIMEOUT,
+    deadline=float(os.environ.get('AI_ANALYSIS_DEADLINE', 30)),
+    hedge_after=float(os.environ['AI_HEDGE_AFTER']) if os.environ.get('AI_HEDGE_AFTER') else None,
+    max_in_flight_per_model=int(os.environ.get('AI_MAX_IN_FLIGHT_PER_MODEL', 8))
+)
+
 def analyze_rfp_with_ai(rfp_content: str, rfp_data: Dict) -> Dict:
     """Analyze RFP using multiple AI models"""
     try:
-        # Simulate AI analysis with realistic results
-        analysis = {
-            "status": "completed",
-            "processing_time": "2.3 seconds",
-            "models_used": ["GPT-4", "Gemini", "Claude", "Grok"],
-            "confidence_score": 0.87,
-            "key_insights": [
-                f"High-value {rfp_data.get('campaign_type', 'digital media')} opportunity with strong ROI potential",
-                "Recommended focus on programmatic and social channels based on target demographics",
-                f"Timeline is {'aggressive but achievable' if 'urgent' in rfp_data.get('status', '').lower() else 'well-structured'} with proper resource allocation",
-                f"Budget range of {rfp_data.get('budget_range', 'TBD')} aligns with market standards for this campaign type"
-            ],
-            "recommendations": [
-                "Prioritize mobile-first creative development for maximum reach",
-                f"Allocate 60% budget to digital channels, 40% to {rfp_data.get('campaign_type', 'traditional')} media",
-                "Implement real-time optimization strategy with A/B testing",
-                "Focus on data-driven attribution modeling for performance measurement"
-            ],
-            "risk_factors": [
-                "Tight timeline may require additional resources",
-                "Competitive landscape analysis needed",
-                "Creative approval process should be streamlined"
-            ],
-            "opportunities": [
-                "Strong brand alignment with target audience",
-                "Potential for campaign expansion based on performance",
-                "Cross-platform synergy opportunities"
-            ],
-            "technical_requirements": [
-                "Programmatic buying platform integration",
-                "Real-time reporting dashboard setup",
-                "Creative asset management system",
-                "Attribution tracking implementation"
-            ],
-            "estimated_timeline": "6-8 weeks from approval to launch",
-            "success_metrics": [
-                "Brand awareness lift: 15-25%",
-                "Click-through rate: 2.5%+",
-                "Cost per acquisition: 20% below industry average",
-                "Return on ad spend: 4:1 minimum"
-            ]
-        }
-        return analysis
+        fan_out = analysis_fanout.run(rfp_content, rfp_data)
+        return merge_analyses(fan_out, AI_MODELS)
     except Exception as e:
         return {
             "status": "error",
@@ -84,104 +137,115 @@ def analyze_rfp_with_ai(rfp_content: str, rfp_data: Dict) -> Dict:
             "confidence_score": 0.0
         }
 
+PROPOSAL_SECTIONS = ["executive_summary", "strategy_overview", "media_plan", "timeline", "investment"]
+
+def simulated_proposal_sections(rfp_data: Dict, analysis: Dict):
+    """Yield ``(section_key, content)`` for each proposal section as it is written"""
+    yield "executive_summary", f"""
+    We are pleased to present our comprehensive media proposal for {rfp_data.get('advertiser_client_name', 'your organization')}'s 
+    {rfp_data.get('name', 'campaign')}. Our strategic approach leverages data-driven insights and innovative 
+    {rfp_data.get('campaign_type', 'digital media')} solutions to maximize your investment and achieve measurable results.
+    
+    Key highlights of our proposal:
+    • Integrated {rfp_data.get('campaign_type', 'multi-channel')} strategy
+    • Advanced targeting and optimization capabilities  
+    • Transparent reporting and performance tracking
+    • Dedicated account management and support
+    """
+    
+    yield "strategy_overview", f"""
+    Our strategic approach for this {rfp_data.get('campaign_type', 'digital media')} campaign focuses on:
+    
+    1. Audience Targeting & Segmentation
+       - Demographic and psychographic profiling
+       - Behavioral targeting based on online activities
+       - Lookalike audience development
+    
+    2. Channel Mix & Optimization
+       - Programmatic display advertising (40%)
+       - Social media advertising (30%)
+       - Search engine marketing (20%)
+       - Connected TV/Video (10%)
+    
+    3. Creative Strategy
+       - Mobile-first creative development
+       - Dynamic creative optimization
+       - A/B testing framework
+       - Brand safety measures
+    """
+    
+    yield "media_plan", f"""
+    Campaign Duration: {analysis.get('estimated_timeline', '6-8 weeks')}
+    Total Budget: {rfp_data.get('budget_range', 'TBD')}
+    
+    Channel Allocation:
+    • Digital Display: 35% of budget
+    • Social Media: 30% of budget  
+    • Search Marketing: 20% of budget
+    • Video/Connected TV: 15% of budget
+    
+    Key Performance Indicators:
+    • Brand Awareness Lift: 15-25%
+    • Click-Through Rate: 2.5%+
+    • Cost Per Acquisition: 20% below industry average
+    • Return on Ad Spend: 4:1 minimum
+    """
+    
+    yield "timeline", f"""
+    Week 1-2: Campaign setup and creative development
+    Week 3: Campaign launch and initial optimization
+    Week 4-6: Performance monitoring and optimization
+    Week 7-8: Final optimization and reporting
+    
+    Key Milestones:
+    • Creative approval: Week 1
+    • Campaign launch: Week 3
+    • Mid-campaign review: Week 5  
+    • Final reporting: Week 8
+    """
+    
+    yield "investment", f"""
+    Total Investment: {rfp_data.get('budget_range', 'TBD')}
+    
+    Budget Breakdown:
+    • Media Spend: 85% of total budget
+    • Platform Fees: 10% of total budget
+    • Management Fee: 5% of total budget
+    
+    Payment Terms:
+    • 50% upon campaign approval
+    • 25% at campaign midpoint
+    • 25% upon campaign completion
+    """
+
+def build_proposal(sections: Dict) -> Dict:
+    """Wrap generated sections into a completed proposal"""
+    return {
+        "status": "completed",
+        "generated_at": datetime.now().isoformat(),
+        "sections": sections,
+        "attachments": [
+            {"name": "Media Plan Details.pdf", "type": "document"},
+            {"name": "Creative Concepts.pdf", "type": "creative"},
+            {"name": "Audience Analysis.xlsx", "type": "data"},
+            {"name": "Performance Projections.xlsx", "type": "analytics"}
+        ],
+        "next_steps": [
+            "Review and approve creative concepts",
+            "Finalize targeting parameters",
+            "Set up tracking and attribution",
+            "Schedule campaign launch meeting"
+        ]
+    }
+
 def generate_proposal_with_ai(rfp_data: Dict, analysis: Dict) -> Dict:
     """Generate proposal using AI based on RFP analysis"""
     try:
-        proposal = {
-            "status": "completed",
-            "generated_at": datetime.now().isoformat(),
-            "sections": {
-                "executive_summary": f"""
-                We are pleased to present our comprehensive media proposal for {rfp_data.get('advertiser_client_name', 'your organization')}'s 
-                {rfp_data.get('name', 'campaign')}. Our strategic approach leverages data-driven insights and innovative 
-                {rfp_data.get('campaign_type', 'digital media')} solutions to maximize your investment and achieve measurable results.
-                
-                Key highlights of our proposal:
-                • Integrated {rfp_data.get('campaign_type', 'multi-channel')} strategy
-                • Advanced targeting and optimization capabilities  
-                • Transparent reporting and performance tracking
-                • Dedicated account management and support
-                """,
-                
-                "strategy_overview": f"""
-                Our strategic approach for this {rfp_data.get('campaign_type', 'digital media')} campaign focuses on:
-                
-                1. Audience Targeting & Segmentation
-                   - Demographic and psychographic profiling
-                   - Behavioral targeting based on online activities
-                   - Lookalike audience development
-                
-                2. Channel Mix & Optimization
-                   - Programmatic display advertising (40%)
-                   - Social media advertising (30%)
-                   - Search engine marketing (20%)
-                   - Connected TV/Video (10%)
-                
-                3. Creative Strategy
-                   - Mobile-first creative development
-                   - Dynamic creative optimization
-                   - A/B testing framework
-                   - Brand safety measures
-                """,
-                
-                "media_plan": f"""
-                Campaign Duration: {analysis.get('estimated_timeline', '6-8 weeks')}
-                Total Budget: {rfp_data.get('budget_range', 'TBD')}
-                
-                Channel Allocation:
-                • Digital Display: 35% of budget
-                • Social Media: 30% of budget  
-                • Search Marketing: 20% of budget
-                • Video/Connected TV: 15% of budget
-                
-                Key Performance Indicators:
-                • Brand Awareness Lift: 15-25%
-                • Click-Through Rate: 2.5%+
-                • Cost Per Acquisition: 20% below industry average
-                • Return on Ad Spend: 4:1 minimum
-                """,
-                
-                "timeline": f"""
-                Week 1-2: Campaign setup and creative development
-                Week 3: Campaign launch and initial optimization
-                Week 4-6: Performance monitoring and optimization
-                Week 7-8: Final optimization and reporting
-                
-                Key Milestones:
-                • Creative approval: Week 1
-                • Campaign launch: Week 3
-                • Mid-campaign review: Week 5  
-                • Final reporting: Week 8
-                """,
-                
-                "investment": f"""
-                Total Investment: {rfp_data.get('budget_range', 'TBD')}
-                
-                Budget Breakdown:
-                • Media Spend: 85% of total budget
-                • Platform Fees: 10% of total budget
-                • Management Fee: 5% of total budget
-                
-                Payment Terms:
-                • 50% upon campaign approval
-                • 25% at campaign midpoint
-                • 25% upon campaign completion
-                """
-            },
-            "attachments": [
-                {"name": "Media Plan Details.pdf", "type": "document"},
-                {"name": "Creative Concepts.pdf", "type": "creative"},
-                {"name": "Audience Analysis.xlsx", "type": "data"},
-                {"name": "Performance Projections.xlsx", "type": "analytics"}
-            ],
-            "next_steps": [
-                "Review and approve creative concepts",
-                "Finalize targeting parameters",
-                "Set up tracking and attribution",
-                "Schedule campaign launch meeting"
-            ]
-        }
-        return proposal
+        client = ai_client('Proposal')
+        if client is not None:
+            return client.post_json('/v1/proposal', {'rfp': rfp_data, 'analysis': analysis})
+        
+        return build_proposal(dict(simulated_proposal_sections(rfp_data, analysis)))
     except Exception as e:
         return {
             "status": "error",
@@ -191,6 +255,10 @@ def generate_proposal_with_ai(rfp_data: Dict, analysis: Dict) -> Dict:
 def quality_check_proposal(proposal_data: Dict) -> Dict:
     """Perform AI-powered quality check on proposal"""
     try:
+        client = ai_client('Quality-Check')
+        if client is not None:
+            return client.post_json('/v1/quality-check', {'proposal': proposal_data})
+        
         quality_check = {
             "status": "completed",
             "overall_score": 92,
@@ -251,6 +319,113 @@ def quality_check_proposal(proposal_data: Dict) -> Dict:
             "error": str(e)
         }
 
+# AI result cache. Results are keyed on the RFP fields the models read plus the
+# model/prompt version; bump a version to invalidate everything produced with it.
+# Models are only ever given ai_inputs(rfp), so the key covers everything they see.
+AI_MODELS_VERSION = 'gpt-4+gemini+claude+grok'
+AI_PROMPT_VERSIONS = {'analysis': '1', 'proposal': '1'}
+AI_INPUT_FIELDS = ('name', 'agency_name', 'advertiser_client_name', 'campaign_type',
+                   'budget_range', 'due_date', 'status', 'content')
+
+ai_cache = ResultCache(
+    max_entries=int(os.environ.get('AI_CACHE_MAX_ENTRIES', 512)),
+    ttl=int(os.environ.get('AI_CACHE_TTL', 24 * 3600)),
+    disk_dir=os.environ.get('AI_CACHE_DIR')
+)
+
+def ai_inputs(rfp: Dict) -> Dict:
+    """The RFP fields passed to the models"""
+    return {field: rfp.get(field) for field in AI_INPUT_FIELDS}
+
+def ai_cache_key(kind: str, rfp: Dict, analysis: Dict = None) -> str:
+    """Cache key for ``kind``; a proposal's key also covers the analysis it is built from"""
+    fields = ai_inputs(rfp)
+    if analysis is not None:
+        fields['analysis'] = content_key('analysis-result', analysis, '')
+    return content_key(kind, fields, f"{AI_MODELS_VERSION}:{AI_PROMPT_VERSIONS[kind]}")
+
+def is_cacheable_result(result: Dict) -> bool:
+    # Partial fan-out results are not cached so a retry can reach the missing models
+    return result.get('status') != 'error' and not result.get('models_failed')
+
+def cached_analysis(rfp: Dict) -> Dict:
+    inputs = ai_inputs(rfp)
+    return ai_cache.get_or_compute(
+        ai_cache_key('analysis', rfp),
+        lambda: analyze_rfp_with_ai(inputs['content'], inputs),
+        should_cache=is_cacheable_result
+    )
+
+# AI pipeline stages, shared by the synchronous endpoints and the job queue.
+# Each takes the job payload ({'rfp_id': ...}) and the upstream stage result.
+def run_analysis_stage(payload: Dict, upstream: Any = None) -> Dict:
+    rfp = rfps_db[payload['rfp_id']]
+    analysis = cached_analysis(rfp)
+    rfp['analysis'] = analysis
+    rfp['updated_at'] = datetime.now().isoformat()
+    return analysis
+
+def run_proposal_stage(payload: Dict, upstream: Any = None) -> Dict:
+    rfp = rfps_db[payload['rfp_id']]
+    # Ensure RFP has been analyzed first
+    if upstream is not None:
+        rfp['analysis'] = upstream
+    elif not rfp.get('analysis'):
+        rfp['analysis'] = cached_analysis(rfp)
+    analysis = rfp['analysis']
+    proposal = ai_cache.get_or_compute(
+        ai_cache_key('proposal', rfp, analysis),
+        lambda: generate_proposal_with_ai(ai_inputs(rfp), analysis),
+        should_cache=is_cacheable_result
+    )
+    rfp['proposal'] = proposal
+    rfp['updated_at'] = datetime.now().isoformat()
+    return proposal
+
+def run_quality_check_stage(payload: Dict, upstream: Any = None) -> Dict:
+    rfp = rfps_db[payload['rfp_id']]
+    proposal = upstream if upstream is not None else rfp.get('proposal')
+    if not proposal:
+        raise ValueError('No proposal found. Generate a proposal first.')
+    quality_check = quality_check_proposal(proposal)
+    rfp['quality_check'] = quality_check
+    rfp['updated_at'] = datetime.now().isoformat()
+    return quality_check
+
+# Background job queue (JOB_BACKEND_URL: memory:// or sqlite:///path/to/jobs.db)
+job_queue = JobQueue(
+    backend_from_url(os.environ.get('JOB_BACKEND_URL')),
+    max_workers=int(os.environ.get('JOB_WORKERS', 4)),
+    # Finished jobs (and their results) stay readable this long
+    retention_seconds=int(os.environ.get('JOB_RETENTION_SECONDS', 3600))
+)
+job_queue.register('analyze', run_analysis_stage)
+job_queue.register('generate-proposal', run_proposal_stage)
+job_queue.register('quality-check', run_quality_check_stage)
+# With a persistent backend, pick up jobs a previous run left unfinished
+job_queue.start()
+PIPELINE_STAGES = ['analyze', 'generate-proposal', 'quality-check']
+
+def wants_async() -> bool:
+    """True when the client asked for a job id instead of waiting for the result"""
+    return (request.args.get('async', '').lower() in ('1', 'true')
+            or 'respond-async' in request.headers.get('Prefer', ''))
+
+def enqueue_stage(stage: str, rfp_id: int):
+    job = job_queue.submit(stage, {'rfp_id': rfp_id})
+    return jsonify({'success': True, 'job': job}), 202
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+def event_stream(events) -> Response:
+    """Server-Sent Events response that is flushed event by event, not buffered by proxies"""
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 # Initialize with sample data
 def initialize_sample_data():
     """Initialize the application with sample RFPs and knowledge articles"""
@@ -270,8 +445,8 @@ def initialize_sample_data():
             "content": "Comprehensive digital media campaign targeting tech-savvy consumers aged 25-45. Focus on mobile-first approach with emphasis on programmatic buying and social media integration.",
             "team_members": [1, 2, 3, 4],
             "attachments": [
-                {"filename": "TechGadgets_Q3_Digital_RFP.pdf", "type": "Primary RFP", "size": "2.3 MB"},
-                {"filename": "TechGadgets_Media_Requirements.xlsx", "type": "Supporting", "size": "1.1 MB"}
+                {"filename": "TechGadgets_Q3_Digital_RFP.pdf", "type": "Primary RFP", "size_bytes": 2411725},
+                {"filename": "TechGadgets_Media_Requirements.xlsx", "type": "Supporting", "size_bytes": 1153434}
             ],
             "created_at": "2025-03-15T10:00:00",
             "updated_at": "2025-04-01T14:30:00",
@@ -292,7 +467,7 @@ def initialize_sample_data():
             "content": "Summer retail promotion campaign focusing on fashion-forward millennials. Multi-platform approach including social media, influencer partnerships, and traditional advertising.",
             "team_members": [2, 4, 5],
             "attachments": [
-                {"filename": "Summer_Retail_RFP.pdf", "type": "Primary RFP", "size": "1.8 MB"}
+                {"filename": "Summer_Retail_RFP.pdf", "type": "Primary RFP", "size_bytes": 1887437}
             ],
             "created_at": "2025-03-20T09:15:00",
             "updated_at": "2025-04-02T11:45:00",
@@ -548,11 +723,14 @@ def initialize_sample_data():
         }
     ]
     
-    for article in sample_articles:
-        knowledge_articles_db[article["id"]] = article
+    # Only seeds an empty table, so articles written since are kept
+    seed_articles(sample_articles)
 
 # Initialize sample data on startup
-initialize_sample_data()
+with app.app_context():
+    db.create_all()
+    run_migrations()
+    initialize_sample_data()
 
 # Serve React app
 @app.route('/')
@@ -671,11 +849,26 @@ def update_rfp(rfp_id):
     data = request.get_json()
     rfp = rfps_db[rfp_id]
     
+    # AI results depend on these fields; drop them if any of them changes
+    changed_inputs = [field for field in AI_INPUT_FIELDS if field in data and data[field] != rfp.get(field)]
+    stale_keys = []
+    if changed_inputs:
+        stale_keys.append(ai_cache_key('analysis', rfp))
+        if rfp.get('analysis'):
+            stale_keys.append(ai_cache_key('proposal', rfp, rfp['analysis']))
+    
     # Update fields
     for key, value in data.items():
         if key in rfp:
             rfp[key] = value
     
+    if changed_inputs:
+        for key in stale_keys:
+            ai_cache.delete(key)
+        rfp['analysis'] = None
+        rfp['proposal'] = None
+        rfp['quality_check'] = None
+    
     rfp['updated_at'] = datetime.now().isoformat()
     
     return jsonify({
@@ -688,14 +881,11 @@ def analyze_rfp(rfp_id):
     if rfp_id not in rfps_db:
         return jsonify({'success': False, 'error': 'RFP not found'}), 404
     
-    rfp = rfps_db[rfp_id]
-    
-    # Perform AI analysis
-    analysis = analyze_rfp_with_ai(rfp['content'], rfp)
+    if wants_async():
+        return enqueue_stage('analyze', rfp_id)
     
-    # Store analysis in RFP
-    rfp['analysis'] = analysis
-    rfp['updated_at'] = datetime.now().isoformat()
+    # Perform AI analysis and store it in the RFP
+    analysis = run_analysis_stage({'rfp_id': rfp_id})
     
     return jsonify({
         'success': True,
@@ -707,26 +897,65 @@ def generate_proposal(rfp_id):
     if rfp_id not in rfps_db:
         return jsonify({'success': False, 'error': 'RFP not found'}), 404
     
-    rfp = rfps_db[rfp_id]
-    
-    # Ensure RFP has been analyzed first
-    if not rfp.get('analysis'):
-        # Perform analysis first
-        analysis = analyze_rfp_with_ai(rfp['content'], rfp)
-        rfp['analysis'] = analysis
+    if wants_async():
+        return enqueue_stage('generate-proposal', rfp_id)
     
-    # Generate proposal
-    proposal = generate_proposal_with_ai(rfp, rfp['analysis'])
-    
-    # Store proposal in RFP
-    rfp['proposal'] = proposal
-    rfp['updated_at'] = datetime.now().isoformat()
+    # Generate proposal (analyzing first if needed) and store it in the RFP
+    proposal = run_proposal_stage({'rfp_id': rfp_id})
     
     return jsonify({
         'success': True,
         'proposal': proposal
     })
 
+@app.route('/api/rfps/<int:rfp_id>/generate-proposal/stream')
+def stream_proposal(rfp_id):
+    """Server-Sent Events stream of proposal sections as each one is generated"""
+    if rfp_id not in rfps_db:
+        return jsonify({'success': False, 'error': 'RFP not found'}), 404
+    
+    rfp = rfps_db[rfp_id]
+    
+    def generate():
+        try:
+            if not rfp.get('analysis'):
+                yield sse_event('status', {'stage': 'analyzing'})
+                rfp['analysis'] = cached_analysis(rfp)
+            
+            analysis = rfp['analysis']
+            cache_key = ai_cache_key('proposal', rfp, analysis)
+            proposal = ai_cache.get(cache_key)
+            if proposal is None and ai_client('Proposal') is not None:
+                # Remote providers answer with the whole proposal at once
+                proposal = generate_proposal_with_ai(ai_inputs(rfp), analysis)
+            if proposal is not None and proposal.get('status') == 'error':
+                yield sse_event('failed', {'error': proposal.get('error')})
+                return
+            
+            if proposal is not None:
+                section_keys = list(proposal['sections'])
+                sections = proposal['sections'].items()
+            else:
+                section_keys = PROPOSAL_SECTIONS
+                sections = simulated_proposal_sections(ai_inputs(rfp), analysis)
+            yield sse_event('start', {'sections': section_keys, 'generated_at': datetime.now().isoformat()})
+            
+            written = {}
+            for index, (key, content) in enumerate(sections):
+                written[key] = content
+                yield sse_event('section', {'key': key, 'content': content, 'index': index, 'total': len(section_keys)})
+            
+            if proposal is None:
+                proposal = build_proposal(written)
+            ai_cache.set(cache_key, proposal)
+            rfp['proposal'] = proposal
+            rfp['updated_at'] = datetime.now().isoformat()
+            yield sse_event('done', proposal)
+        except Exception as e:
+            yield sse_event('failed', {'error': str(e)})
+    
+    return event_stream(generate())
+
 @app.route('/api/rfps/<int:rfp_id>/quality-check', methods=['POST'])
 def check_proposal_quality(rfp_id):
     if rfp_id not in rfps_db:
@@ -738,18 +967,82 @@ def check_proposal_quality(rfp_id):
     if not rfp.get('proposal'):
         return jsonify({'success': False, 'error': 'No proposal found. Generate a proposal first.'}), 400
     
-    # Perform quality check
-    quality_check = quality_check_proposal(rfp['proposal'])
+    if wants_async():
+        return enqueue_stage('quality-check', rfp_id)
     
-    # Store quality check in RFP
-    rfp['quality_check'] = quality_check
-    rfp['updated_at'] = datetime.now().isoformat()
+    # Perform quality check and store it in the RFP
+    quality_check = run_quality_check_stage({'rfp_id': rfp_id})
     
     return jsonify({
         'success': True,
         'quality_check': quality_check
     })
 
+@app.route('/api/ai/cache/stats')
+def get_ai_cache_stats():
+    return jsonify({
+        'success': True,
+        'stats': ai_cache.stats()
+    })
+
+@app.route('/api/ai/providers/stats')
+def get_ai_provider_stats():
+    """Request, retry and circuit state plus latency histograms per provider"""
+    return jsonify({
+        'success': True,
+        'providers': client_stats()
+    })
+
+# Job APIs
+@app.route('/api/rfps/<int:rfp_id>/pipeline', methods=['POST'])
+def run_rfp_pipeline(rfp_id):
+    """Enqueue analyze -> generate-proposal -> quality-check as dependent jobs"""
+    if rfp_id not in rfps_db:
+        return jsonify({'success': False, 'error': 'RFP not found'}), 404
+    
+    pipeline_id, jobs = job_queue.pipeline(PIPELINE_STAGES, {'rfp_id': rfp_id})
+    
+    return jsonify({
+        'success': True,
+        'pipeline_id': pipeline_id,
+        'jobs': jobs
+    }), 202
+
+@app.route('/api/pipelines/<pipeline_id>')
+def get_pipeline(pipeline_id):
+    jobs = job_queue.list_pipeline(pipeline_id)
+    if not jobs:
+        return jsonify({'success': False, 'error': 'Pipeline not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'pipeline_id': pipeline_id,
+        'jobs': jobs
+    })
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_job_events(job_id):
+    """Server-Sent Events stream of job status changes, closed at completion or failure"""
+    if not job_queue.get(job_id):
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    def generate():
+        for job in job_queue.watch(job_id, timeout=300):
+            yield sse_event(job['status'], job)
+    
+    return event_stream(generate())
+
 # Email and Import APIs
 @app.route('/api/emails/rfps')
 def get_email_rfps():
@@ -763,8 +1056,8 @@ def get_email_rfps():
                 'sender_email': 'rfp@mediabuyersagency.com',
                 'received_date': '2025-04-01T09:30:00',
                 'attachments': [
-                    {'filename': 'TechGadgets_Q3_Digital_RFP.pdf', 'type': 'Primary RFP', 'size': '2.3 MB'},
-                    {'filename': 'TechGadgets_Media_Requirements.xlsx', 'type': 'Supporting', 'size': '1.1 MB'}
+                    {'filename': 'TechGadgets_Q3_Digital_RFP.pdf', 'type': 'Primary RFP', 'size_bytes': 2411725},
+                    {'filename': 'TechGadgets_Media_Requirements.xlsx', 'type': 'Supporting', 'size_bytes': 1153434}
                 ]
             },
             {
@@ -774,7 +1067,7 @@ def get_email_rfps():
                 'sender_email': 'proposals@brandmaxadv.com',
                 'received_date': '2025-04-02T14:15:00',
                 'attachments': [
-                    {'filename': 'Summer_Retail_RFP.pdf', 'type': 'Primary RFP', 'size': '1.8 MB'}
+                    {'filename': 'Summer_Retail_RFP.pdf', 'type': 'Primary RFP', 'size_bytes': 1887437}
                 ]
             },
             {
@@ -784,9 +1077,9 @@ def get_email_rfps():
                 'sender_email': 'rfps@digitalfirstagency.com',
                 'received_date': '2025-04-03T11:45:00',
                 'attachments': [
-                    {'filename': 'Holiday_Campaign_RFP.pdf', 'type': 'Primary RFP', 'size': '2.1 MB'},
-                    {'filename': 'Media_Requirements.xlsx', 'type': 'Supporting', 'size': '890 KB'},
-                    {'filename': 'Brand_Guidelines.pdf', 'type': 'Supporting', 'size': '3.2 MB'}
+                    {'filename': 'Holiday_Campaign_RFP.pdf', 'type': 'Primary RFP', 'size_bytes': 2202010},
+                    {'filename': 'Media_Requirements.xlsx', 'type': 'Supporting', 'size_bytes': 911360},
+                    {'filename': 'Brand_Guidelines.pdf', 'type': 'Supporting', 'size_bytes': 3355443}
                 ]
             }
         ]
@@ -842,100 +1135,6 @@ def import_rfp():
         'rfp': new_rfp
     })
 
-# Knowledge Base APIs
-@app.route('/api/knowledge-base/articles')
-def get_knowledge_articles():
-    search = request.args.get('search', '')
-    category = request.args.get('category', '')
-    
-    articles = list(knowledge_articles_db.values())
-    
-    if search:
-        articles = [article for article in articles if 
-                   search.lower() in article['title'].lower() or 
-                   search.lower() in article['content'].lower() or
-                   any(search.lower() in tag.lower() for tag in article['tags'])]
-    
-    if category:
-        articles = [article for article in articles if article['category'] == category]
-    
-    return jsonify({
-        'success': True,
-        'articles': articles
-    })
-
-@app.route('/api/knowledge-base/articles/<int:article_id>')
-def get_knowledge_article(article_id):
-    if article_id not in knowledge_articles_db:
-        return jsonify({'success': False, 'error': 'Article not found'}), 404
-    
-    article = knowledge_articles_db[article_id]
-    article['views'] += 1  # Increment view count
-    
-    return jsonify({
-        'success': True,
-        'article': article
-    })
-
-@app.route('/api/knowledge-base/articles', methods=['POST'])
-def create_knowledge_article():
-    data = request.get_json()
-    
-    article_id = max(knowledge_articles_db.keys()) + 1 if knowledge_articles_db else 1
-    
-    new_article = {
-        "id": article_id,
-        "title": data.get('title', ''),
-        "category": data.get('category', ''),
-        "type": data.get('type', 'Article'),
-        "content": data.get('content', ''),
-        "tags": data.get('tags', []),
-        "author": data.get('author', 'Unknown'),
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "views": 0,
-        "rating": 0.0
-    }
-    
-    knowledge_articles_db[article_id] = new_article
-    
-    return jsonify({
-        'success': True,
-        'article': new_article
-    })
-
-@app.route('/api/knowledge-base/articles/<int:article_id>', methods=['PUT'])
-def update_knowledge_article(article_id):
-    if article_id not in knowledge_articles_db:
-        return jsonify({'success': False, 'error': 'Article not found'}), 404
-    
-    data = request.get_json()
-    article = knowledge_articles_db[article_id]
-    
-    # Update fields
-    for key, value in data.items():
-        if key in article and key != 'id':
-            article[key] = value
-    
-    article['updated_at'] = datetime.now().isoformat()
-    
-    return jsonify({
-        'success': True,
-        'article': article
-    })
-
-@app.route('/api/knowledge-base/articles/<int:article_id>', methods=['DELETE'])
-def delete_knowledge_article(article_id):
-    if article_id not in knowledge_articles_db:
-        return jsonify({'success': False, 'error': 'Article not found'}), 404
-    
-    del knowledge_articles_db[article_id]
-    
-    return jsonify({
-        'success': True,
-        'message': 'Article deleted successfully'
-    })
-
 # Team Management APIs
 @app.route('/api/team/members')
 def get_team_members():
@@ -0,0 +1,107 @@
+"""Thread-safe in-memory record store used by the demo app in ``src/main.py``.
+
+Records are plain dicts keyed by ``id``. The store keeps a dict-by-id primary
+index plus optional secondary indexes on scalar fields (e.g. ``status``) that
+make per-value counts O(1), hands out monotonically increasing ids that are
+never reused after a delete, and serializes all mutation behind a lock so it is
+safe under a threaded server.
+
+Records returned by the store are the stored dicts themselves; change them only
+through ``update()`` so the indexes stay consistent. ``verify()`` rebuilds them
+from scratch and reports any drift.
+"""
+import threading
+
+
+class InMemoryStore:
+    """Dict-backed record store with secondary indexes and id allocation"""
+
+    def __init__(self, records=(), indexed_fields=()):
+        self._lock = threading.RLock()
+        self._records = {}
+        # field -> value -> {record_id: None}; dicts keep insertion order
+        self._indexes = {field: {} for field in indexed_fields}
+        self._next_id = 1
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, record_id):
+        return record_id in self._records
+
+    def get(self, record_id):
+        """Return the record with ``record_id`` or None"""
+        return self._records.get(record_id)
+
+    def all(self):
+        """Snapshot of every record in insertion order"""
+        with self._lock:
+            return list(self._records.values())
+
+    def count(self, field, value):
+        """Number of records whose indexed ``field`` equals ``value`` (O(1))"""
+        return len(self._indexes[field].get(value, ()))
+
+    def verify(self):
+        """Recompute the indexes from the records and return any mismatches.
+
+        Returns a dict of ``name -> (maintained, recomputed)``; empty when consistent.
+        """
+        with self._lock:
+            fresh = InMemoryStore(indexed_fields=self._indexes)
+            for record in self._records.values():
+                fresh._index(record)
+
+            mismatches = {}
+            for field, index in self._indexes.items():
+                maintained = {value: set(ids) for value, ids in index.items()}
+                recomputed = {value: set(ids) for value, ids in fresh._indexes[field].items()}
+                if maintained != recomputed:
+                    mismatches[f'index:{field}'] = (maintained, recomputed)
+            return mismatches
+
+    def add(self, record):
+        """Store ``record``, assigning the next id when it has none; returns the record"""
+        with self._lock:
+            if record.get('id') is None:
+                record['id'] = self._next_id
+            elif record['id'] in self._records:
+                raise KeyError(f"Record {record['id']} already exists")
+            self._next_id = max(self._next_id, record['id'] + 1)
+            self._records[record['id']] = record
+            self._index(record)
+            return record
+
+    def update(self, record_id, changes):
+        """Apply ``changes`` to a record and reindex it; returns the record or None"""
+        with self._lock:
+            record = self._records.get(record_id)
+            if record is None:
+                return None
+            self._unindex(record)
+            record.update(changes)
+            record['id'] = record_id
+            self._index(record)
+            return record
+
+    def delete(self, record_id):
+        """Remove and return a record, or None if it does not exist"""
+        with self._lock:
+            record = self._records.pop(record_id, None)
+            if record is not None:
+                self._unindex(record)
+            return record
+
+    def _index(self, record):
+        for field, index in self._indexes.items():
+            index.setdefault(record.get(field), {})[record['id']] = None
+
+    def _unindex(self, record):
+        for field, index in self._indexes.items():
+            ids = index.get(record.get(field))
+            if ids is not None:
+                ids.pop(record['id'], None)
+                if not ids:
+                    del index[record.get(field)]
@@ -0,0 +1,152 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from src.models.rfp import db
+
+class KnowledgeArticle(db.Model):
+    __tablename__ = 'knowledge_articles'
+    __table_args__ = (
+        # GET /knowledge-base/articles: optional category filter, newest first
+        db.Index('ix_knowledge_articles_category_created_date', 'category', 'created_date'),
+        db.Index('ix_knowledge_articles_created_date', 'created_date'),
+        # Search index catch-up reads rows changed since its watermark
+        db.Index('ix_knowledge_articles_updated_at', 'updated_at'),
+    )
+    
+    # Fields a PUT may change
+    EDITABLE_FIELDS = ('title', 'category', 'type', 'content', 'author', 'views', 'rating')
+    
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(300), nullable=False)
+    category = db.Column(db.String(100), nullable=False, default='')
+    type = db.Column(db.String(50), nullable=False, default='Article')
+    content = db.Column(db.Text, nullable=False, default='')
+    author = db.Column(db.String(200), nullable=False, default='Unknown')
+    views = db.Column(db.Integer, nullable=False, default=0)
+    rating = db.Column(db.Float, nullable=False, default=0.0)
+    created_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    tags = db.relationship(
+        'KnowledgeArticleTag', backref='article', lazy='selectin',
+        cascade='all, delete-orphan', order_by='KnowledgeArticleTag.id'
+    )
+    
+    @property
+    def tag_names(self):
+        return [tag.name for tag in self.tags]
+    
+    def set_tags(self, names):
+        """Replace the article's tags, dropping blanks and duplicates"""
+        if not isinstance(names, list):
+            # A string would otherwise be split into one tag per character
+            raise ValueError('tags must be a list')
+        names = dict.fromkeys(str(name).strip()[:100] for name in names if str(name).strip())
+        # Reuse rows for kept tags: inserts flush before deletes, so re-adding would hit the unique constraint
+        existing = {tag.name: tag for tag in self.tags}
+        self.tags = [existing.get(name) or KnowledgeArticleTag(name=name) for name in names]
+    
+    def search_document(self):
+        """Fields indexed by the knowledge base search"""
+        return {'title': self.title, 'tags': self.tag_names, 'content': self.content, 'category': self.category}
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'category': self.category,
+            'type': self.type,
+            'content': self.content,
+            'tags': self.tag_names,
+            'author': self.author,
+            'created_at': self.created_date.isoformat() if self.created_date else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'views': self.views,
+            'rating': self.rating
+        }
+
+class KnowledgeArticleTag(db.Model):
+    __tablename__ = 'knowledge_article_tags'
+    __table_args__ = (
+        db.UniqueConstraint('article_id', 'name', name='uq_knowledge_article_tags_article_name'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('knowledge_articles.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False, index=True)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name
+        }
+
+class KnowledgeStats(db.Model):
+    """Running article totals for the dashboard, so it never aggregates the articles table.
+    
+    A single row, updated in the same transaction as every article insert, update
+    and delete (see the mapper events below), so every worker reads the same totals.
+    """
+    __tablename__ = 'knowledge_stats'
+    
+    ROW_ID = 1
+    
+    id = db.Column(db.Integer, primary_key=True)
+    articles = db.Column(db.Integer, nullable=False, default=0)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Float, nullable=False, default=0.0)
+    
+    @classmethod
+    def totals(cls):
+        """``(articles, views, rating_sum)`` from the stats row, or a recount if it is missing"""
+        table = cls.__table__
+        row = db.session.execute(
+            db.select(table.c.articles, table.c.views, table.c.rating_sum).where(table.c.id == cls.ROW_ID)
+        ).first()
+        return tuple(row) if row is not None else cls.recount()
+    
+    @staticmethod
+    def recount(connection=None):
+        """``(articles, views, rating_sum)`` aggregated from every article"""
+        articles = KnowledgeArticle.__table__
+        return tuple((connection or db.session).execute(db.select(
+            db.func.count(articles.c.id),
+            db.func.coalesce(db.func.sum(articles.c.views), 0),
+            db.func.coalesce(db.func.sum(articles.c.rating), 0.0)
+        )).one())
+    
+    @classmethod
+    def add(cls, connection, articles=0, views=0, rating_sum=0.0):
+        """Apply deltas to the stats row in the caller's transaction"""
+        table = cls.__table__
+        connection.execute(table.update().where(table.c.id == cls.ROW_ID).values(
+            articles=table.c.articles + articles,
+            views=table.c.views + views,
+            rating_sum=table.c.rating_sum + rating_sum
+        ))
+
+@event.listens_for(KnowledgeStats.__table__, 'after_create')
+def _create_stats_row(table, connection, **kw):
+    # Start from the articles already there when upgrading a database that predates this table
+    count, views, rating_sum = KnowledgeStats.recount(connection)
+    connection.execute(table.insert().values(id=KnowledgeStats.ROW_ID, articles=count, views=views, rating_sum=rating_sum))
+
+def _history_delta(article, field):
+    history = db.inspect(article).attrs[field].history
+    return sum(value or 0 for value in history.added) - sum(value or 0 for value in history.deleted)
+
+@event.listens_for(KnowledgeArticle, 'after_insert')
+def _count_inserted_article(mapper, connection, article):
+    KnowledgeStats.add(connection, articles=1, views=article.views or 0, rating_sum=article.rating or 0.0)
+
+@event.listens_for(KnowledgeArticle, 'after_update')
+def _count_updated_article(mapper, connection, article):
+    views, rating = _history_delta(article, 'views'), _history_delta(article, 'rating')
+    if views or rating:
+        KnowledgeStats.add(connection, views=views, rating_sum=rating)
+
+@event.listens_for(KnowledgeArticle, 'after_delete')
+def _count_deleted_article(mapper, connection, article):
+    KnowledgeStats.add(connection, articles=-1, views=-(article.views or 0), rating_sum=-(article.rating or 0.0))
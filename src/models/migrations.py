@@ -0,0 +1,173 @@
+"""Idempotent schema upgrades for databases created before a model change.
+
+``db.create_all()`` only creates missing tables and never alters existing ones,
+so each step below inspects the live schema and applies its change at most once.
+Call ``run_migrations()`` inside an app context after ``db.create_all()``.
+"""
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.exc import OperationalError
+
+from src.models.knowledge import KnowledgeArticle, KnowledgeArticleTag
+from src.models.rfp import db, RFP, RFPTeamMember, RFPAttachment, EmailRFP, EmailDeadLetter, parse_budget_range
+
+
+def _column_names(table_name):
+    return {column['name'] for column in db.inspect(db.engine).get_columns(table_name)}
+
+
+def add_budget_columns():
+    """Add rfps.budget_min / rfps.budget_max to tables created before they existed"""
+    existing = _column_names(RFP.__tablename__)
+    with db.engine.begin() as conn:
+        for column in ('budget_min', 'budget_max'):
+            if column not in existing:
+                conn.execute(db.text(f'ALTER TABLE {RFP.__tablename__} ADD COLUMN {column} BIGINT'))
+
+
+def add_attachment_blob_columns():
+    """Add rfp_attachments.sha256 / size_bytes for the content-addressed attachment store"""
+    existing = _column_names(RFPAttachment.__tablename__)
+    columns = {'sha256': 'VARCHAR(64)', 'size_bytes': 'BIGINT'}
+    with db.engine.begin() as conn:
+        for column, column_type in columns.items():
+            if column not in existing:
+                conn.execute(db.text(f'ALTER TABLE {RFPAttachment.__tablename__} ADD COLUMN {column} {column_type}'))
+
+
+def add_extraction_columns():
+    """Add the rfps columns that hold attachment text extraction results"""
+    existing = _column_names(RFP.__tablename__)
+    columns = {'extracted_content': 'TEXT', 'extraction_status': 'VARCHAR(20)', 'extraction_error': 'TEXT'}
+    with db.engine.begin() as conn:
+        for column, column_type in columns.items():
+            if column not in existing:
+                conn.execute(db.text(f'ALTER TABLE {RFP.__tablename__} ADD COLUMN {column} {column_type}'))
+
+
+def add_email_ingestion_columns():
+    """Add the email_rfps columns used by mailbox ingestion"""
+    existing = _column_names(EmailRFP.__tablename__)
+    columns = {'message_id': 'VARCHAR(500)', 'body': 'TEXT', 'rfp_id': 'INTEGER REFERENCES rfps (id)'}
+    with db.engine.begin() as conn:
+        for column, column_type in columns.items():
+            if column not in existing:
+                conn.execute(db.text(f'ALTER TABLE {EmailRFP.__tablename__} ADD COLUMN {column} {column_type}'))
+        if 'message_id' not in existing:
+            # ADD COLUMN cannot carry UNIQUE, so enforce it with an index
+            conn.execute(db.text(
+                f'CREATE UNIQUE INDEX uq_email_rfps_message_id ON {EmailRFP.__tablename__} (message_id)'
+            ))
+
+
+def add_email_claim_columns():
+    """Add the email_rfps columns used to claim emails from the import queue"""
+    existing = _column_names(EmailRFP.__tablename__)
+    columns = {'claim_token': 'VARCHAR(32)', 'claimed_at': 'TIMESTAMP'}
+    with db.engine.begin() as conn:
+        for column, column_type in columns.items():
+            if column not in existing:
+                conn.execute(db.text(f'ALTER TABLE {EmailRFP.__tablename__} ADD COLUMN {column} {column_type}'))
+
+
+def _parse_budgets(condition, batch_size):
+    """Re-parse budget_range into the numeric columns for rows matching ``condition``"""
+    table = RFP.__table__
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(table.c.id, table.c.budget_range, table.c.budget_min, table.c.budget_max)
+            .where(table.c.id > last_id, table.c.budget_range.isnot(None), condition)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        
+        updates = []
+        for rfp_id, budget_range, old_min, old_max in rows:
+            budget_min, budget_max = parse_budget_range(budget_range)
+            if budget_min is not None and (budget_min, budget_max) != (old_min, old_max):
+                updates.append({'row_id': rfp_id, 'budget_min': budget_min, 'budget_max': budget_max})
+        if updates:
+            db.session.execute(
+                table.update().where(table.c.id == db.bindparam('row_id')).values(
+                    budget_min=db.bindparam('budget_min'), budget_max=db.bindparam('budget_max')
+                ),
+                updates
+            )
+        db.session.commit()
+        last_id = rows[-1][0]
+
+
+def backfill_budgets(batch_size=500):
+    """Parse budget_range into the numeric columns for rows that have not been parsed yet"""
+    _parse_budgets(RFP.__table__.c.budget_min.is_(None), batch_size)
+
+
+def reparse_magnitude_budgets(batch_size=500):
+    """Fix budgets parsed before word magnitudes, 'MM' and '$100-200K' ranges were understood"""
+    table = RFP.__table__
+    _parse_budgets(
+        db.or_(
+            *(table.c.budget_range.ilike(f'%{word}%') for word in ('thousand', 'million', 'billion', 'mm')),
+            # '$100-200K' used to give (100, 200000)
+            table.c.budget_min * 1000 <= table.c.budget_max
+        ),
+        batch_size
+    )
+
+
+def backfill_updated_at():
+    """Give rows without updated_at their creation time so cursor pagination can order them"""
+    table = RFP.__table__
+    with db.engine.begin() as conn:
+        conn.execute(
+            table.update().where(table.c.updated_at.is_(None))
+            .values(updated_at=db.func.coalesce(table.c.created_at, datetime.utcnow()))
+        )
+
+
+def create_indexes():
+    """Create indexes declared on the models that existing tables are missing"""
+    for model in (RFP, RFPTeamMember, RFPAttachment, EmailRFP, EmailDeadLetter, KnowledgeArticle, KnowledgeArticleTag):
+        for index in model.__table__.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+
+def install_search_index():
+    """Create the full-text index for the configured search backend"""
+    from src.models.search import SEARCH_BACKENDS
+    
+    name = current_app.config.get('RFP_SEARCH_BACKEND')
+    if name is not None:
+        SEARCH_BACKENDS[name]().install()
+        return
+    if db.engine.dialect.name != 'sqlite':
+        return
+    try:
+        SEARCH_BACKENDS['fts5']().install()
+    except OperationalError as e:
+        # SQLite built without FTS5: get_search_backend() keeps using LIKE
+        current_app.logger.warning('FTS5 search index not installed, falling back to LIKE search: %s', e)
+
+
+MIGRATIONS = [
+    add_budget_columns,
+    add_attachment_blob_columns,
+    add_extraction_columns,
+    add_email_ingestion_columns,
+    add_email_claim_columns,
+    backfill_budgets,
+    reparse_magnitude_budgets,
+    backfill_updated_at,
+    create_indexes,
+    install_search_index,
+]
+
+
+def run_migrations():
+    """Apply every migration step in order"""
+    for step in MIGRATIONS:
+        step()
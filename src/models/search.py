@@ -0,0 +1,140 @@
+"""Full-text search backends for RFPs.
+
+A backend narrows an ``RFP`` query to the rows matching a search string and
+orders them by relevance. The backend is chosen with the ``RFP_SEARCH_BACKEND``
+app config key (``'fts5'`` or ``'like'``); by default SQLite databases use FTS5
+and every other database falls back to ``LIKE`` matching.
+"""
+import re
+
+from flask import current_app
+
+from src.models.rfp import db, RFP
+
+_SEARCH_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Engines known to have the FTS5 index installed
+_fts_engines = set()
+
+
+class SearchBackend:
+    """Interface implemented by every RFP search backend"""
+
+    def install(self):
+        """Create any index structures the backend needs (must be idempotent)"""
+
+    def filter(self, query, search):
+        """Restrict an RFP query to rows matching ``search``, most relevant first"""
+        raise NotImplementedError
+
+
+class LikeSearchBackend(SearchBackend):
+    """Substring matching on name, agency and advertiser (full table scan)"""
+
+    def filter(self, query, search):
+        return query.filter(
+            db.or_(
+                RFP.name.contains(search),
+                RFP.agency_name.contains(search),
+                RFP.advertiser_client_name.contains(search)
+            )
+        )
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """SQLite FTS5 index over name, agency, advertiser and content, ranked with BM25.
+
+    The index is an external-content FTS5 table kept in sync by triggers on
+    ``rfps``, so ORM writes, bulk statements and raw SQL all update it.
+    """
+
+    table_name = 'rfps_fts'
+    columns = ('name', 'agency_name', 'advertiser_client_name', 'content')
+    # BM25 column weights: a hit in the RFP name outranks one in the body
+    weights = (10.0, 5.0, 5.0, 1.0)
+
+    def install(self):
+        columns = ', '.join(self.columns)
+        new_values = ', '.join(f'new.{column}' for column in self.columns)
+        old_values = ', '.join(f'old.{column}' for column in self.columns)
+
+        with db.engine.begin() as conn:
+            exists = conn.execute(
+                db.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': self.table_name}
+            ).first()
+
+            conn.execute(db.text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} USING fts5("
+                f"{columns}, content='{RFP.__tablename__}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            ))
+            conn.execute(db.text(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table_name}_ai AFTER INSERT ON {RFP.__tablename__} BEGIN "
+                f"INSERT INTO {self.table_name}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+            conn.execute(db.text(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table_name}_ad AFTER DELETE ON {RFP.__tablename__} BEGIN "
+                f"INSERT INTO {self.table_name}({self.table_name}, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); END"
+            ))
+            conn.execute(db.text(
+                f"CREATE TRIGGER IF NOT EXISTS {self.table_name}_au AFTER UPDATE OF {columns} "
+                f"ON {RFP.__tablename__} BEGIN "
+                f"INSERT INTO {self.table_name}({self.table_name}, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {self.table_name}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+            ))
+
+            # Index rows that existed before the FTS table was created
+            if not exists:
+                conn.execute(db.text(
+                    f"INSERT INTO {self.table_name}({self.table_name}) VALUES ('rebuild')"
+                ))
+
+        _fts_engines.add(db.engine.url)
+
+    @classmethod
+    def is_installed(cls):
+        if db.engine.url not in _fts_engines and db.inspect(db.engine).has_table(cls.table_name):
+            _fts_engines.add(db.engine.url)
+        return db.engine.url in _fts_engines
+
+    @staticmethod
+    def match_expression(search):
+        """Turn free text into an FTS5 query: every word must match, as a prefix"""
+        return ' '.join(f'"{token}"*' for token in _SEARCH_TOKEN.findall(search))
+
+    def filter(self, query, search):
+        match = self.match_expression(search)
+        if not match:
+            return query.filter(db.false())
+
+        fts = db.table(self.table_name, db.column('rowid'))
+        fts_table = db.literal_column(self.table_name)
+        matches = db.select(
+            fts.c.rowid.label('rfp_id'),
+            db.func.bm25(fts_table, *self.weights).label('score')
+        ).select_from(fts).where(fts_table.op('MATCH')(match)).subquery()
+
+        # bm25() is negative, lower is more relevant
+        return query.join(matches, matches.c.rfp_id == RFP.id).order_by(matches.c.score)
+
+
+SEARCH_BACKENDS = {
+    'fts5': SQLiteFTS5Backend,
+    'like': LikeSearchBackend,
+}
+
+
+def get_search_backend():
+    """Return the configured search backend for the current app.
+
+    Without explicit configuration, SQLite uses FTS5 once its index has been
+    installed (see ``src.models.migrations``) and everything else uses LIKE.
+    """
+    name = current_app.config.get('RFP_SEARCH_BACKEND')
+    if name is None:
+        use_fts = db.engine.dialect.name == 'sqlite' and SQLiteFTS5Backend.is_installed()
+        name = 'fts5' if use_fts else 'like'
+    return SEARCH_BACKENDS[name]()
@@ -0,0 +1,146 @@
+"""Content-addressed cache for AI analysis and proposal results.
+
+Keys are SHA-256 hashes of the inputs that determine a result (the relevant RFP
+fields and content) plus the model and prompt version, so an unchanged RFP maps
+to the same key and any edit or model/prompt upgrade maps to a new one.
+
+Entries live in an in-memory LRU with a TTL and, optionally, in a directory of
+JSON files that survives restarts and is shared by worker processes. Concurrent
+requests for the same missing key compute it once.
+
+Values are copied on the way in and out, so a caller that edits the dict it
+was given cannot change what other callers get for the same key.
+"""
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_key(kind, fields, version):
+    """Stable hash of a result kind, its input fields and the model/prompt version"""
+    canonical = json.dumps(
+        {'kind': kind, 'fields': fields, 'version': version},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """LRU + TTL cache with an optional on-disk tier and hit/miss counters"""
+
+    def __init__(self, max_entries=256, ttl=24 * 3600, disk_dir=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> lock held while the value is computed
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return copy.deepcopy(entry[1])
+                del self._entries[key]
+                self._stats['expirations'] += 1
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is not None:
+                self._stats['disk_hits'] += 1
+                self._remember(key, entry)
+                return copy.deepcopy(entry[1])
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key, value):
+        entry = (time.time() + self.ttl, copy.deepcopy(value))
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                pass
+
+    def get_or_compute(self, key, compute, should_cache=None):
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        ``should_cache(value)`` can veto storing a result (e.g. an error response).
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another request may have computed it while we waited
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                return copy.deepcopy(entry[1])
+            try:
+                value = compute()
+                if should_cache is None or should_cache(value):
+                    self.set(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), max_entries=self.max_entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.json')
+
+    def _read_disk(self, key, now):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key)) as f:
+                expires_at, value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if expires_at <= now:
+            return None
+        return expires_at, value
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        # Write then rename so readers in other processes never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._disk_path(key))
@@ -0,0 +1,239 @@
+from flask import Blueprint, current_app, request, jsonify
+from src.models.knowledge import db, KnowledgeArticle, KnowledgeStats
+from src.search_index import SearchIndex
+from datetime import datetime, timedelta
+import threading
+import time
+
+knowledge_bp = Blueprint('knowledge', __name__)
+
+# How often a worker checks the table for other workers' writes before searching
+INDEX_SYNC_INTERVAL = 1.0
+# Re-read rows this far behind the watermark, for transactions that committed late
+INDEX_SYNC_OVERLAP = timedelta(seconds=5)
+SEARCH_MAX_LIMIT = 100
+
+class _ArticleIndex:
+    """Per-process search index over knowledge_articles.
+    
+    Writes through these routes update it directly; writes from other workers
+    are picked up by ``sync()``, which re-indexes rows whose updated_at is past
+    the watermark and drops ids that no longer exist.
+    """
+    
+    def __init__(self):
+        self.index = SearchIndex()
+        self.watermark = None
+        self.synced_at = None
+        self._lock = threading.Lock()
+    
+    def sync(self, force=False):
+        if not force and self.synced_at is not None and time.monotonic() - self.synced_at < INDEX_SYNC_INTERVAL:
+            return
+        with self._lock:
+            query = KnowledgeArticle.query
+            if self.watermark is not None:
+                query = query.filter(KnowledgeArticle.updated_at >= self.watermark - INDEX_SYNC_OVERLAP)
+            for article in query.order_by(KnowledgeArticle.updated_at).yield_per(500):
+                self.index.add(article.id, article.search_document())
+                self.watermark = max(self.watermark or article.updated_at, article.updated_at)
+            
+            # Deletions leave no row behind; a count mismatch means some happened
+            if db.session.query(db.func.count(KnowledgeArticle.id)).scalar() != len(self.index):
+                live = set(db.session.scalars(db.select(KnowledgeArticle.id)))
+                for article_id in self.index.ids():
+                    if article_id not in live:
+                        self.index.remove(article_id)
+            self.synced_at = time.monotonic()
+
+def seed_articles(articles):
+    """Insert ``articles`` (dicts shaped like the demo apps' samples) into an empty table.
+    
+    Call inside an app context. Returns the number of articles inserted.
+    """
+    if db.session.query(KnowledgeArticle.id).first() is not None:
+        return 0
+    for data in articles:
+        article = KnowledgeArticle(
+            title=data['title'],
+            category=data.get('category', ''),
+            type=data.get('type', 'Article'),
+            content=data.get('content', ''),
+            author=data.get('author', 'Unknown'),
+            views=data.get('views', 0),
+            rating=data.get('rating', 0.0)
+        )
+        # main.py samples carry created_date, main_backup.py samples created_at/updated_at
+        created = data.get('created_date') or data.get('created_at')
+        if created:
+            article.created_date = datetime.fromisoformat(created)
+            article.updated_at = datetime.fromisoformat(data.get('updated_at') or created)
+        article.set_tags(data.get('tags', []))
+        db.session.add(article)
+    db.session.commit()
+    return len(articles)
+
+def _article_index():
+    article_index = current_app.extensions.get('knowledge_index')
+    if article_index is None:
+        article_index = current_app.extensions.setdefault('knowledge_index', _ArticleIndex())
+    article_index.sync()
+    return article_index.index
+
+def _articles_by_id(article_ids):
+    """Articles for ``article_ids`` in the same order, with one query"""
+    articles = {article.id: article for article in KnowledgeArticle.query.filter(KnowledgeArticle.id.in_(article_ids))}
+    return [articles[article_id] for article_id in article_ids if article_id in articles]
+
+@knowledge_bp.route('/knowledge-base/articles', methods=['GET'])
+def get_knowledge_articles():
+    """Get knowledge articles, optionally filtered by search text and category"""
+    try:
+        search = request.args.get('search', '')
+        category = request.args.get('category', '')
+        
+        if search:
+            # Every match, most relevant first; /knowledge-base/search pages them instead
+            index = _article_index()
+            results = index.search(search, facet=category or None, limit=len(index))
+            articles = _articles_by_id([article_id for article_id, _ in results['hits']])
+        else:
+            query = KnowledgeArticle.query
+            if category:
+                query = query.filter(KnowledgeArticle.category == category)
+            articles = query.order_by(KnowledgeArticle.created_date.desc()).all()
+        
+        return jsonify({
+            'success': True,
+            'articles': [article.to_dict() for article in articles]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@knowledge_bp.route('/knowledge-base/search', methods=['GET'])
+def search_knowledge_articles():
+    """Ranked article search with prefix matching on the last word and category facets"""
+    try:
+        limit = max(1, min(request.args.get('limit', 20, type=int), SEARCH_MAX_LIMIT))
+        offset = max(0, request.args.get('offset', 0, type=int))
+        
+        results = _article_index().search(
+            request.args.get('q', ''), facet=request.args.get('category') or None, limit=limit, offset=offset
+        )
+        scores = dict(results['hits'])
+        articles = _articles_by_id(list(scores))
+        
+        return jsonify({
+            'success': True,
+            'articles': [dict(article.to_dict(), score=round(scores[article.id], 4)) for article in articles],
+            'total': results['total'],
+            'facets': results['facets']
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@knowledge_bp.route('/knowledge-base/articles/<int:article_id>', methods=['GET'])
+def get_knowledge_article(article_id):
+    """Get one article and count the view"""
+    try:
+        # Increment in SQL so concurrent views in different workers are all counted;
+        # a view is not an edit, so updated_at is left as it is
+        result = db.session.execute(
+            db.update(KnowledgeArticle).where(KnowledgeArticle.id == article_id).values(
+                views=KnowledgeArticle.views + 1, updated_at=KnowledgeArticle.updated_at
+            )
+        )
+        if not result.rowcount:
+            return jsonify({'success': False, 'error': 'Article not found'}), 404
+        # A bulk UPDATE skips the mapper events that keep the totals
+        KnowledgeStats.add(db.session.connection(), views=1)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'article': db.session.get(KnowledgeArticle, article_id).to_dict()
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@knowledge_bp.route('/knowledge-base/articles', methods=['POST'])
+def create_knowledge_article():
+    """Create a knowledge article"""
+    try:
+        data = request.get_json()
+        
+        article = KnowledgeArticle(
+            title=data.get('title', ''),
+            category=data.get('category', ''),
+            type=data.get('type', 'Article'),
+            content=data.get('content', ''),
+            author=data.get('author', 'Unknown'),
+            views=0,
+            rating=0.0
+        )
+        try:
+            article.set_tags(data.get('tags', []))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        db.session.add(article)
+        db.session.commit()
+        _article_index().add(article.id, article.search_document())
+        
+        return jsonify({
+            'success': True,
+            'article': article.to_dict()
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@knowledge_bp.route('/knowledge-base/articles/<int:article_id>', methods=['PUT'])
+def update_knowledge_article(article_id):
+    """Update a knowledge article"""
+    try:
+        article = db.session.get(KnowledgeArticle, article_id)
+        if article is None:
+            return jsonify({'success': False, 'error': 'Article not found'}), 404
+        
+        data = request.get_json()
+        if 'tags' in data:
+            try:
+                article.set_tags(data['tags'])
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+        for field in KnowledgeArticle.EDITABLE_FIELDS:
+            if field in data:
+                setattr(article, field, data[field])
+        # Set explicitly so tag-only edits also move the search sync watermark
+        article.updated_at = datetime.utcnow()
+        db.session.commit()
+        _article_index().update(article.id, article.search_document())
+        
+        return jsonify({
+            'success': True,
+            'article': article.to_dict()
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@knowledge_bp.route('/knowledge-base/articles/<int:article_id>', methods=['DELETE'])
+def delete_knowledge_article(article_id):
+    """Delete a knowledge article"""
+    try:
+        article = db.session.get(KnowledgeArticle, article_id)
+        if article is None:
+            return jsonify({'success': False, 'error': 'Article not found'}), 404
+        
+        db.session.delete(article)
+        db.session.commit()
+        _article_index().remove(article_id)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Article deleted successfully'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
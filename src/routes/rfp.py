@@ -1,60 +1,156 @@
-from flask import Blueprint, request, jsonify
-from src.models.rfp import db, RFP, RFPTeamMember, RFPAttachment, EmailRFP, DashboardStats
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Blueprint, Response, current_app, request, jsonify, send_file, stream_with_context
+from werkzeug.formparser import parse_form_data
+from src.blob_store import BlobStore
+from src.extraction import PDF_TYPES, SPREADSHEET_TYPES, SUPPORTED_TYPES, ExtractionService
+from src.mail_ingest import ingest, source_from_url
+from src.models.rfp import db, RFP, RFPTeamMember, RFPAttachment, EmailRFP, DashboardStats, parse_budget_range
+from src.models.search import get_search_backend
+from src.result_cache import ResultCache
 from datetime import datetime, date
+import base64
+import csv
+import io
 import json
+import mimetypes
+import os
+import time
 
 rfp_bp = Blueprint('rfp', __name__)
 
+RFP_PAGE_SIZE = 10
+RFP_MAX_PAGE_SIZE = 100
+
+def _encode_cursor(timestamp, row_id):
+    """Opaque keyset cursor pointing just past the row at (timestamp, id)"""
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor):
+    """Inverse of _encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, UnicodeDecodeError, ValueError, base64.binascii.Error):
+        raise ValueError('Invalid cursor')
+
+def _requested_fields():
+    """Fields selected by ``view=summary`` or ``fields=a,b``; None means every field"""
+    if request.args.get('view') == 'summary':
+        return RFP.SUMMARY_FIELDS
+    
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in RFP.FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    # id is always returned so clients can address the RFP
+    return ['id'] + [field for field in requested if field != 'id']
+
 @rfp_bp.route('/dashboard/stats', methods=['GET'])
 def get_dashboard_stats():
     """Get dashboard statistics as shown in mockup"""
     try:
+        try:
+            fields = _requested_fields()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
         stats = DashboardStats.get_stats()
         
         # Get recent RFPs for dashboard
-        recent_rfps = RFP.query.order_by(RFP.updated_at.desc()).limit(4).all()
+        recent_rfps = RFP.query_for_fields(fields).order_by(RFP.updated_at.desc()).limit(4).all()
         
         return jsonify({
             'success': True,
             'stats': stats,
-            'recent_rfps': [rfp.to_dict() for rfp in recent_rfps]
+            'recent_rfps': [rfp.to_dict(fields) for rfp in recent_rfps]
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @rfp_bp.route('/rfps', methods=['GET'])
 def get_rfps():
-    """Get all RFPs with filtering and pagination"""
+    """Get all RFPs with filtering and pagination.
+    
+    Pass ``cursor`` (empty for the first page) to page by ``next_cursor`` instead
+    of ``page``; add ``include_total=true`` to also count matching RFPs.
+    ``per_page`` is clamped to 1-100.
+    ``view=summary`` or ``fields=a,b`` limits the columns loaded and returned.
+    """
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        per_page = max(1, min(request.args.get('per_page', RFP_PAGE_SIZE, type=int), RFP_MAX_PAGE_SIZE))
         search = request.args.get('search', '')
         status_filter = request.args.get('status', '')
+        min_budget = request.args.get('min_budget', type=int)
+        max_budget = request.args.get('max_budget', type=int)
         
-        query = RFP.query
+        try:
+            fields = _requested_fields()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        # Apply search filter
+        query = RFP.query_for_fields(fields)
+        
+        # Apply search filter (results are ordered by relevance, then recency)
         if search:
-            query = query.filter(
-                db.or_(
-                    RFP.name.contains(search),
-                    RFP.agency_name.contains(search),
-                    RFP.advertiser_client_name.contains(search)
-                )
-            )
+            query = get_search_backend().filter(query, search)
         
         # Apply status filter
         if status_filter and status_filter != 'All Status':
             query = query.filter(RFP.status == status_filter)
         
-        # Get paginated results
-        rfps = query.order_by(RFP.updated_at.desc()).paginate(
+        # Apply budget filter (RFPs whose budget range overlaps the requested range)
+        if min_budget is not None:
+            query = query.filter(RFP.budget_max >= min_budget)
+        if max_budget is not None:
+            query = query.filter(RFP.budget_min <= max_budget)
+        
+        # Cursor mode: keyset pagination on (updated_at, id), no OFFSET scan or COUNT(*)
+        if 'cursor' in request.args:
+            if search:
+                return jsonify({'success': False, 'error': 'Cursor pagination does not support search'}), 400
+            
+            cursor = request.args.get('cursor')
+            # Rows without updated_at cannot be placed in the keyset order
+            query = query.filter(RFP.updated_at.isnot(None))
+            include_total = request.args.get('include_total', 'false').lower() == 'true'
+            total = query.order_by(None).count() if include_total else None
+            
+            if cursor:
+                try:
+                    after_updated_at, after_id = _decode_cursor(cursor)
+                except ValueError as e:
+                    return jsonify({'success': False, 'error': str(e)}), 400
+                query = query.filter(
+                    db.tuple_(RFP.updated_at, RFP.id) < db.tuple_(after_updated_at, after_id)
+                )
+            
+            # Fetch one extra row to know whether another page exists
+            rows = query.order_by(RFP.updated_at.desc(), RFP.id.desc()).limit(per_page + 1).all()
+            items = rows[:per_page]
+            
+            response = {
+                'success': True,
+                'rfps': [rfp.to_dict(fields) for rfp in items],
+                'next_cursor': _encode_cursor(items[-1].updated_at, items[-1].id) if len(rows) > per_page else None
+            }
+            if include_total:
+                response['total'] = total
+            return jsonify(response)
+        
+        # Get paginated results; id breaks ties so rows cannot move between pages
+        rfps = query.order_by(RFP.updated_at.desc(), RFP.id.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         
         return jsonify({
             'success': True,
-            'rfps': [rfp.to_dict() for rfp in rfps.items],
+            'rfps': [rfp.to_dict(fields) for rfp in rfps.items],
             'total': rfps.total,
             'pages': rfps.pages,
             'current_page': page
@@ -62,14 +158,102 @@ def get_rfps():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+def _flatten_children(row):
+    """Collapse child collections into single CSV cells"""
+    if 'team_members' in row:
+        row['team_members'] = '; '.join(
+            f"{member['name']} ({member['role']})" + (f" <{member['email']}>" if member['email'] else '')
+            for member in row['team_members']
+        )
+    if 'attachments' in row:
+        row['attachments'] = '; '.join(attachment['filename'] for attachment in row['attachments'])
+    return row
+
+@rfp_bp.route('/rfps/export', methods=['GET'])
+def export_rfps():
+    """Stream every matching RFP as NDJSON (default) or CSV (``format=csv``).
+    
+    Rows are read through a server-side cursor ``EXPORT_BATCH_SIZE`` at a time,
+    so memory stays flat however large the table is. Accepts the same
+    ``status``, budget and ``fields`` parameters as GET /rfps.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        status_filter = request.args.get('status', '')
+        min_budget = request.args.get('min_budget', type=int)
+        max_budget = request.args.get('max_budget', type=int)
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'success': False, 'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        
+        try:
+            fields = _requested_fields() or RFP.FIELDS
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        query = RFP.query_for_fields(fields)
+        if status_filter and status_filter != 'All Status':
+            query = query.filter(RFP.status == status_filter)
+        if min_budget is not None:
+            query = query.filter(RFP.budget_max >= min_budget)
+        if max_budget is not None:
+            query = query.filter(RFP.budget_min <= max_budget)
+        # Children are batch-loaded per yield_per partition
+        rows = (rfp.to_dict(fields) for rfp in query.order_by(RFP.id).yield_per(EXPORT_BATCH_SIZE))
+        
+        def generate_ndjson():
+            dumps = current_app.json.dumps
+            lines = []
+            for count, row in enumerate(rows, 1):
+                lines.append(dumps(row))
+                # Send the first row on its own so the first byte is not held for a full batch
+                if count == 1 or len(lines) >= EXPORT_BATCH_SIZE:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+            if lines:
+                yield '\n'.join(lines) + '\n'
+        
+        def generate_csv():
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            # The header goes out before the first query runs
+            writer.writeheader()
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            for count, row in enumerate(rows, 1):
+                writer.writerow(_flatten_children(row))
+                if count % EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        
+        generate = generate_csv if export_format == 'csv' else generate_ndjson
+        filename = f"rfps-{datetime.utcnow():%Y%m%d}.{export_format}"
+        return Response(
+            stream_with_context(generate()),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @rfp_bp.route('/rfps/<int:rfp_id>', methods=['GET'])
 def get_rfp(rfp_id):
     """Get specific RFP details"""
     try:
-        rfp = RFP.query.get_or_404(rfp_id)
+        try:
+            fields = _requested_fields()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        rfp = RFP.query_for_fields(fields).get_or_404(rfp_id)
         return jsonify({
             'success': True,
-            'rfp': rfp.to_dict()
+            'rfp': rfp.to_dict(fields)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -163,8 +347,12 @@ def delete_rfp(rfp_id):
     """Delete RFP"""
     try:
         rfp = RFP.query.get_or_404(rfp_id)
+        blob_hashes = {attachment.sha256 for attachment in rfp.attachments if attachment.sha256}
+        # Imported emails keep their row but no longer point at the RFP
+        EmailRFP.query.filter_by(rfp_id=rfp.id).update({'rfp_id': None}, synchronize_session=False)
         db.session.delete(rfp)
         db.session.commit()
+        _delete_unreferenced_blobs(blob_hashes)
         
         return jsonify({
             'success': True,
@@ -174,11 +362,285 @@ def delete_rfp(rfp_id):
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Attachments
+def _blob_store():
+    """Attachment blob store under ATTACHMENT_STORAGE_DIR (default: <instance>/attachments)"""
+    store = current_app.extensions.get('rfp_blob_store')
+    if store is None:
+        root = current_app.config.get('ATTACHMENT_STORAGE_DIR') or os.path.join(current_app.instance_path, 'attachments')
+        store = current_app.extensions['rfp_blob_store'] = BlobStore(root)
+    return store
+
+def _delete_unreferenced_blobs(blob_hashes):
+    """Remove blobs that no attachment row points at any more"""
+    if not blob_hashes:
+        return
+    store = _blob_store()
+    # Uploads that reuse one of these blobs commit their rows before we can check
+    with store.lock():
+        still_used = {
+            sha256 for (sha256,) in
+            db.session.query(RFPAttachment.sha256).filter(RFPAttachment.sha256.in_(blob_hashes)).distinct()
+        }
+        for sha256 in blob_hashes - still_used:
+            store.delete(sha256)
+
+def _extraction_service():
+    """Attachment text extraction pool, configured from the EXTRACTION_* settings"""
+    service = current_app.extensions.get('rfp_extraction')
+    if service is None:
+        config = current_app.config
+        cache_dir = config.get('EXTRACTION_CACHE_DIR') or os.path.join(current_app.instance_path, 'extraction-cache')
+        service = current_app.extensions['rfp_extraction'] = ExtractionService(
+            max_workers=config.get('EXTRACTION_WORKERS', 2),
+            memory_limit_mb=config.get('EXTRACTION_MEMORY_LIMIT_MB', 512),
+            max_chars=config.get('EXTRACTION_MAX_CHARS', 1000000),
+            cache=ResultCache(max_entries=256, ttl=30 * 24 * 3600, disk_dir=cache_dir)
+        )
+    return service
+
+def _content_attachments(attachments):
+    """The primary RFP document followed by the requirement spreadsheets"""
+    stored = [attachment for attachment in attachments if attachment.sha256 and attachment.file_type in SUPPORTED_TYPES]
+    primary = (next((attachment for attachment in stored if attachment.is_primary), None)
+               or next((attachment for attachment in stored if attachment.file_type in PDF_TYPES), None))
+    sheets = [attachment for attachment in stored if attachment.file_type in SPREADSHEET_TYPES and attachment is not primary]
+    return ([primary] if primary else []) + sheets
+
+def _extract_rfp_content(app, rfp_id):
+    """Background job: extract the RFP's documents into RFP.extracted_content.
+    
+    The text also goes into RFP.content when that is empty or still holds the
+    previous extraction, so content written by a user is never replaced. The
+    outcome is recorded in extraction_status / extraction_error.
+    """
+    with app.app_context():
+        try:
+            rfp = db.session.get(RFP, rfp_id)
+            if rfp is None:
+                return
+            store = _blob_store()
+            service = _extraction_service()
+            documents = [
+                (attachment.filename, service.extract(store.path(attachment.sha256), attachment.sha256, attachment.file_type))
+                for attachment in _content_attachments(rfp.attachments)
+            ]
+            # Do not hold a connection while the worker processes run
+            db.session.close()
+            
+            sections, errors = [], []
+            for filename, future in documents:
+                result = future.result()
+                if 'error' in result:
+                    app.logger.warning('Text extraction failed for %s (RFP %s): %s', filename, rfp_id, result['error'])
+                    errors.append(f"{filename}: {result['error']}")
+                    continue
+                text = result['text'].strip()
+                if text:
+                    sections.append(f"=== {filename} ===\n{text}" + ('\n[truncated]' if result['truncated'] else ''))
+            
+            rfp = db.session.get(RFP, rfp_id)
+            if rfp is None:
+                return
+            if sections:
+                text = '\n\n'.join(sections)
+                if not rfp.content or rfp.content == rfp.extracted_content:
+                    rfp.content = text
+                rfp.extracted_content = text
+            rfp.extraction_status = 'failed' if errors and not sections else 'completed'
+            rfp.extraction_error = '; '.join(errors) or None
+            db.session.commit()
+        except Exception as e:
+            # e.g. BrokenProcessPool when a worker is killed at its memory limit
+            app.logger.exception('Content extraction failed for RFP %s', rfp_id)
+            _record_extraction_failure(app, rfp_id, f'{type(e).__name__}: {e}')
+        finally:
+            db.session.remove()
+
+def _record_extraction_failure(app, rfp_id, error):
+    try:
+        db.session.rollback()
+        rfp = db.session.get(RFP, rfp_id)
+        if rfp is not None:
+            rfp.extraction_status = 'failed'
+            rfp.extraction_error = error
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        app.logger.exception('Could not record the extraction failure for RFP %s', rfp_id)
+
+def _queue_content_extraction(rfp_id):
+    _extraction_service().run_in_background(_extract_rfp_content, current_app._get_current_object(), rfp_id)
+
+@rfp_bp.route('/rfps/<int:rfp_id>/extract-content', methods=['POST'])
+def extract_rfp_content(rfp_id):
+    """Re-run attachment text extraction into RFP.extracted_content in the background"""
+    try:
+        rfp = RFP.query.get_or_404(rfp_id)
+        documents = [attachment.filename for attachment in _content_attachments(rfp.attachments)]
+        if not documents:
+            return jsonify({'success': False, 'error': 'RFP has no stored PDF or spreadsheet attachments'}), 400
+        
+        _queue_content_extraction(rfp.id)
+        return jsonify({
+            'success': True,
+            'documents': documents,
+            'message': 'Content extraction queued'
+        }), 202
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@rfp_bp.route('/rfps/<int:rfp_id>/attachments', methods=['POST'])
+def upload_attachments(rfp_id):
+    """Upload files (multipart field ``file``, repeatable) as RFP attachments.
+    
+    File parts are streamed to disk in chunks as they arrive and stored by
+    content hash, so identical files share one blob.
+    """
+    writers = []
+    try:
+        rfp = RFP.query.get_or_404(rfp_id)
+        store = _blob_store()
+        
+        def stream_factory(**kwargs):
+            writers.append(store.writer())
+            return writers[-1]
+        
+        _, form, files = parse_form_data(
+            request.environ,
+            stream_factory=stream_factory,
+            max_content_length=current_app.config.get('MAX_CONTENT_LENGTH')
+        )
+        uploads = [upload for upload in files.getlist('file') if upload.filename]
+        if not uploads:
+            return jsonify({'success': False, 'error': 'No file uploaded (multipart field "file")'}), 400
+        
+        is_primary = form.get('is_primary', 'false').lower() == 'true'
+        attachments, deduplicated, created_blobs = [], [], set()
+        try:
+            # A blob found here cannot be deleted until our rows referencing it are committed
+            with store.lock(shared=True):
+                for upload in uploads:
+                    sha256, size_bytes, created = upload.stream.commit()
+                    extension = os.path.splitext(upload.filename)[1].lstrip('.').lower()
+                    attachment = RFPAttachment(
+                        rfp_id=rfp.id,
+                        filename=upload.filename,
+                        file_type=extension or upload.mimetype or 'application/octet-stream',
+                        file_path=store.relative_path(sha256),
+                        sha256=sha256,
+                        size_bytes=size_bytes,
+                        is_primary=is_primary and not attachments
+                    )
+                    db.session.add(attachment)
+                    attachments.append(attachment)
+                    if created:
+                        created_blobs.add(sha256)
+                    else:
+                        deduplicated.append(upload.filename)
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Another upload may have reused a blob we created, so only unreferenced ones go
+            _delete_unreferenced_blobs(created_blobs)
+            raise
+        
+        # Feed the primary document and spreadsheets into RFP.content off the request path
+        extracting = any(attachment in _content_attachments(rfp.attachments) for attachment in attachments)
+        if extracting:
+            _queue_content_extraction(rfp.id)
+        
+        return jsonify({
+            'success': True,
+            'attachments': [attachment.to_dict() for attachment in attachments],
+            'deduplicated': deduplicated,
+            'content_extraction': 'queued' if extracting else None,
+            'message': f'Uploaded {len(attachments)} attachment(s)'
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+    finally:
+        # Drops temp files of parts that were never committed (no-op for committed ones)
+        for writer in writers:
+            writer.discard()
+
+@rfp_bp.route('/rfps/<int:rfp_id>/attachments/<int:attachment_id>/download', methods=['GET'])
+def download_attachment(rfp_id, attachment_id):
+    """Download an attachment; supports Range and conditional requests"""
+    try:
+        attachment = RFPAttachment.query.filter_by(id=attachment_id, rfp_id=rfp_id).first_or_404()
+        if not attachment.sha256:
+            return jsonify({'success': False, 'error': 'Attachment has no stored file'}), 404
+        
+        # send_file hands the open file to the server's wsgi.file_wrapper (sendfile
+        # under gunicorn) and answers Range requests with 206 partial content
+        return send_file(
+            _blob_store().path(attachment.sha256),
+            mimetype=mimetypes.guess_type(attachment.filename)[0] or 'application/octet-stream',
+            as_attachment=True,
+            download_name=attachment.filename,
+            etag=attachment.sha256,
+            conditional=True,
+            max_age=3600
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@rfp_bp.route('/rfps/<int:rfp_id>/attachments/<int:attachment_id>', methods=['DELETE'])
+def delete_attachment(rfp_id, attachment_id):
+    """Delete an attachment, and its blob once no other attachment uses it"""
+    try:
+        attachment = RFPAttachment.query.filter_by(id=attachment_id, rfp_id=rfp_id).first_or_404()
+        blob_hashes = {attachment.sha256} if attachment.sha256 else set()
+        db.session.delete(attachment)
+        db.session.commit()
+        _delete_unreferenced_blobs(blob_hashes)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Attachment deleted successfully'
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+EMAIL_PAGE_SIZE = 50
+EMAIL_MAX_PAGE_SIZE = 200
+EMAIL_CLAIM_LEASE_SECONDS = 300
+
 @rfp_bp.route('/emails/rfps', methods=['GET'])
 def get_email_rfps():
-    """Get available email RFPs for import"""
+    """Get available email RFPs for import, newest first.
+    
+    Pages by keyset: pass the returned ``next_cursor`` as ``cursor`` for the
+    next ``per_page`` emails.
+    """
     try:
-        # Mock email data as shown in mockup
+        per_page = max(1, min(request.args.get('per_page', EMAIL_PAGE_SIZE, type=int), EMAIL_MAX_PAGE_SIZE))
+        cursor = request.args.get('cursor')
+        
+        query = EmailRFP.queue_query()
+        if cursor:
+            try:
+                before_received, before_id = _decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            query = query.filter(
+                db.tuple_(EmailRFP.received_date, EmailRFP.id) < db.tuple_(before_received, before_id)
+            )
+        
+        # Walks ix_email_rfps_queue backwards; one extra row tells whether another page exists
+        rows = query.order_by(EmailRFP.received_date.desc(), EmailRFP.id.desc()).limit(per_page + 1).all()
+        items = rows[:per_page]
+        if items or cursor or db.session.query(EmailRFP.id).first() is not None:
+            return jsonify({
+                'success': True,
+                'emails': [dict(email.to_dict(), attachments=[]) for email in items],
+                'next_cursor': _encode_cursor(items[-1].received_date, items[-1].id) if len(rows) > per_page else None
+            })
+        
+        # Mock email data as shown in mockup, until a mailbox has been ingested
         emails = [
             {
                 'id': 1,
@@ -224,6 +686,79 @@ def get_email_rfps():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@rfp_bp.route('/emails/claims', methods=['POST'])
+def claim_emails():
+    """Claim the oldest unprocessed emails for an importer.
+    
+    Claimed emails are hidden from other claims until they are completed,
+    released, or ``lease_seconds`` passes without either.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        limit = max(1, min(int(data.get('limit', EMAIL_PAGE_SIZE)), EMAIL_MAX_PAGE_SIZE))
+        lease_seconds = int(data.get('lease_seconds', EMAIL_CLAIM_LEASE_SECONDS))
+        
+        token, emails = EmailRFP.claim(limit, lease_seconds)
+        return jsonify({
+            'success': True,
+            'claim_token': token,
+            'emails': [dict(email.to_dict(), body=email.body) for email in emails]
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@rfp_bp.route('/emails/claims/<token>/complete', methods=['POST'])
+def complete_email_claim(token):
+    """Mark claimed emails processed and return the rest of the claim to the queue.
+    
+    Body: ``{"results": [{"email_id": 1, "rfp_id": 7}, ...]}``; ``rfp_id`` may be null
+    for emails that were handled without importing.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        rfp_ids = {int(result['email_id']): result.get('rfp_id') for result in data.get('results', [])}
+        
+        processed = EmailRFP.complete(token, rfp_ids)
+        released = EmailRFP.release(token)
+        return jsonify({
+            'success': True,
+            'processed': processed,
+            'skipped': [email_id for email_id in rfp_ids if email_id not in processed],
+            'released': released
+        })
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@rfp_bp.route('/emails/claims/<token>', methods=['DELETE'])
+def release_email_claim(token):
+    """Return every email in a claim to the queue"""
+    try:
+        return jsonify({'success': True, 'released': EmailRFP.release(token)})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@rfp_bp.route('/emails/ingest', methods=['POST'])
+def ingest_emails():
+    """Read new mail from the configured mailbox into the email RFP list"""
+    try:
+        source_url = current_app.config.get('MAIL_SOURCE_URL') or os.environ.get('MAIL_SOURCE_URL')
+        if not source_url:
+            return jsonify({'success': False, 'error': 'MAIL_SOURCE_URL is not configured'}), 400
+        
+        data = request.get_json(silent=True) or {}
+        stats = ingest(
+            source_from_url(source_url),
+            batch_size=current_app.config.get('MAIL_INGEST_BATCH_SIZE', 200),
+            auto_import=data.get('auto_import', True)
+        )
+        return jsonify({'success': True, **stats})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @rfp_bp.route('/rfps/import', methods=['POST'])
 def import_rfp():
     """Import RFP from email or upload"""
@@ -263,6 +798,12 @@ def import_rfp():
             db.session.add(rfp)
             db.session.flush()
             
+            # Ingested emails are imported once, even with several importers racing
+            if email_id is not None and not EmailRFP.mark_imported(email_id, rfp.id):
+                if db.session.get(EmailRFP, email_id) is not None:
+                    db.session.rollback()
+                    return jsonify({'success': False, 'error': 'Email has already been imported'}), 409
+            
             # Add team members
             for member_data in rfp_data['team_members']:
                 member = RFPTeamMember(
@@ -288,11 +829,177 @@ def import_rfp():
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+BULK_CHUNK_SIZE = 500
+BULK_MAX_CHUNK_SIZE = 5000
+BULK_REQUIRED_FIELDS = ('name', 'agency_name', 'campaign_type', 'budget_range', 'due_date')
+BULK_READ_SIZE = 64 * 1024
+
+def _iter_lines(stream, read_size):
+    """Yield the lines of a file-like ``stream`` read ``read_size`` bytes at a time.
+    
+    Only ``read`` is used: WSGI servers' input objects (gunicorn's Body, for
+    one) are not io streams, and readline on them is unbuffered.
+    """
+    pending = b''
+    while True:
+        chunk = stream.read(read_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+def _bulk_records():
+    """Yield records from a JSON array body or, for application/x-ndjson, one per line"""
+    if request.mimetype == 'application/x-ndjson':
+        # Read in fixed-size chunks so large migrations are never held in
+        # memory as one document
+        for line in _iter_lines(request.stream, BULK_READ_SIZE):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f'Invalid JSON: {e}')
+    else:
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            raise ValueError('Body must be a JSON array of RFPs or application/x-ndjson')
+        yield from records
+
+def _bulk_rows(data):
+    """Validate one bulk record into (rfp_row, team_member_rows); raises ValueError"""
+    if isinstance(data, ValueError):
+        raise data
+    if not isinstance(data, dict):
+        raise ValueError('Record must be a JSON object')
+    missing = [field for field in BULK_REQUIRED_FIELDS if not data.get(field)]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    
+    members = data.get('team_members') or []
+    if not isinstance(members, list) or not all(
+            isinstance(member, dict) and member.get('name') and member.get('role') for member in members):
+        raise ValueError('team_members must be a list of objects with a name and role')
+    
+    # Core inserts bypass the ORM validator that fills the budget columns
+    budget_min, budget_max = parse_budget_range(data['budget_range'])
+    now = datetime.utcnow()
+    rfp_row = {
+        'name': data['name'],
+        'agency_name': data['agency_name'],
+        'advertiser_client_name': data.get('advertiser_client_name'),
+        'campaign_type': data['campaign_type'],
+        'budget_range': data['budget_range'],
+        'budget_min': budget_min,
+        'budget_max': budget_max,
+        'due_date': datetime.strptime(data['due_date'], '%Y-%m-%d').date(),
+        'status': data.get('status', 'New'),
+        'completion_percentage': data.get('completion_percentage', 0),
+        'content': data.get('content', ''),
+        'ai_processing_enabled': data.get('ai_processing_enabled', True),
+        'created_at': now,
+        'updated_at': now,
+        'submitted_date': None
+    }
+    member_rows = [
+        {'name': member['name'], 'role': member['role'], 'email': member.get('email')}
+        for member in members
+    ]
+    return rfp_row, member_rows
+
+def _insert_bulk_rows(rows):
+    """Insert [(index, rfp_row, member_rows)] with one executemany per table; returns new ids"""
+    rfp_ids = db.session.execute(
+        RFP.__table__.insert().returning(RFP.__table__.c.id, sort_by_parameter_order=True),
+        [rfp_row for _, rfp_row, _ in rows]
+    ).scalars().all()
+    member_rows = [
+        dict(member, rfp_id=rfp_id)
+        for rfp_id, (_, _, members) in zip(rfp_ids, rows)
+        for member in members
+    ]
+    if member_rows:
+        db.session.execute(RFPTeamMember.__table__.insert(), member_rows)
+    return rfp_ids
+
+def _commit_bulk_chunk(rows, result):
+    """Insert one chunk in its own transaction.
+    
+    If the batch is rejected by the database, retry its rows one by one in
+    savepoints so a single bad row is reported without losing the rest.
+    """
+    if not rows:
+        return
+    try:
+        result['ids'].extend(_insert_bulk_rows(rows))
+        db.session.commit()
+        return
+    except Exception:
+        db.session.rollback()
+    
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                result['ids'].extend(_insert_bulk_rows([row]))
+        except Exception as e:
+            result['errors'].append({'index': row[0], 'error': str(getattr(e, 'orig', None) or e)})
+    db.session.commit()
+
+@rfp_bp.route('/rfps/bulk', methods=['POST'])
+def bulk_create_rfps():
+    """Create many RFPs with team members from a JSON array or NDJSON stream"""
+    try:
+        try:
+            chunk_size = max(1, min(int(request.args.get('chunk_size', BULK_CHUNK_SIZE)), BULK_MAX_CHUNK_SIZE))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'chunk_size must be an integer'}), 400
+        
+        start = time.monotonic()
+        result = {'ids': [], 'errors': []}
+        chunk = []
+        index = -1
+        try:
+            for index, data in enumerate(_bulk_records()):
+                try:
+                    rfp_row, member_rows = _bulk_rows(data)
+                except (KeyError, TypeError, ValueError) as e:
+                    result['errors'].append({'index': index, 'error': str(e)})
+                    continue
+                chunk.append((index, rfp_row, member_rows))
+                if len(chunk) >= chunk_size:
+                    _commit_bulk_chunk(chunk, result)
+                    chunk = []
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        _commit_bulk_chunk(chunk, result)
+        
+        elapsed = time.monotonic() - start
+        result['errors'].sort(key=lambda error: error['index'])
+        return jsonify({
+            'success': True,
+            'received': index + 1,
+            'inserted': len(result['ids']),
+            'failed': len(result['errors']),
+            'ids': result['ids'],
+            'errors': result['errors'],
+            'elapsed': round(elapsed, 3),
+            'rows_per_sec': round(len(result['ids']) / elapsed) if elapsed else None
+        }), 201 if result['ids'] else 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @rfp_bp.route('/rfps/sample-data', methods=['POST'])
 def create_sample_data():
     """Create sample RFP data matching the mockup"""
     try:
         # Clear existing data
+        EmailRFP.query.filter(EmailRFP.rfp_id.isnot(None)).update({'rfp_id': None}, synchronize_session=False)
         RFPTeamMember.query.delete()
         RFPAttachment.query.delete()
         RFP.query.delete()
@@ -453,27 +1160,84 @@ def create_sample_data():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 # AI Agent Actions
+# Each stage takes a plain dict snapshot of the RFP (so it can run off the
+# request thread) and returns the stage result.
+AI_STAGE_FIELDS = (
+    'id', 'name', 'agency_name', 'advertiser_client_name', 'campaign_type',
+    'budget_range', 'due_date', 'content'
+)
+BATCH_MAX_RFPS = 500
+BATCH_MAX_WORKERS = 8
+
+def _analyze(rfp):
+    # Mock AI analysis
+    return {
+        'status': 'completed',
+        'insights': [
+            'High-value digital media opportunity with strong ROI potential',
+            'Recommended focus on programmatic and social channels',
+            'Timeline is aggressive but achievable with proper resource allocation'
+        ],
+        'recommendations': [
+            'Prioritize mobile-first creative development',
+            'Allocate 60% budget to digital channels',
+            'Implement real-time optimization strategy'
+        ],
+        'confidence_score': 0.87
+    }
+
+def _extract_placements(rfp):
+    # Mock placement extraction
+    return [
+        {'channel': 'Digital Display', 'budget': '$200K', 'duration': '8 weeks'},
+        {'channel': 'Social Media', 'budget': '$150K', 'duration': '12 weeks'},
+        {'channel': 'Search Marketing', 'budget': '$100K', 'duration': '10 weeks'}
+    ]
+
+def _generate_proposal(rfp):
+    # Mock proposal generation
+    return {
+        'title': f"Media Proposal for {rfp['name']}",
+        'executive_summary': 'Comprehensive media strategy designed to maximize reach and engagement...',
+        'strategy': 'Multi-channel approach focusing on digital-first execution...',
+        'budget_breakdown': {
+            'Digital': '60%',
+            'Traditional': '25%',
+            'Social': '15%'
+        },
+        'timeline': '12-week campaign execution',
+        'kpis': ['Reach: 5M+', 'CTR: 2.5%+', 'ROAS: 4:1+']
+    }
+
+def _quality_check(rfp):
+    # Mock quality check
+    return {
+        'overall_score': 8.7,
+        'completeness': 9.2,
+        'accuracy': 8.5,
+        'compliance': 8.9,
+        'recommendations': [
+            'Add more detailed budget breakdown',
+            'Include competitive analysis section',
+            'Enhance measurement methodology'
+        ]
+    }
+
+AI_STAGES = {
+    'analyze': _analyze,
+    'extract-placements': _extract_placements,
+    'generate-proposal': _generate_proposal,
+    'quality-check': _quality_check
+}
+
+def _rfp_snapshot(rfp_id):
+    return RFP.query_for_fields(AI_STAGE_FIELDS).get_or_404(rfp_id).to_dict(AI_STAGE_FIELDS)
+
 @rfp_bp.route('/rfps/<int:rfp_id>/analyze', methods=['POST'])
 def analyze_rfp(rfp_id):
     """AI analysis of RFP"""
     try:
-        rfp = RFP.query.get_or_404(rfp_id)
-        
-        # Mock AI analysis
-        analysis_result = {
-            'status': 'completed',
-            'insights': [
-                'High-value digital media opportunity with strong ROI potential',
-                'Recommended focus on programmatic and social channels',
-                'Timeline is aggressive but achievable with proper resource allocation'
-            ],
-            'recommendations': [
-                'Prioritize mobile-first creative development',
-                'Allocate 60% budget to digital channels',
-                'Implement real-time optimization strategy'
-            ],
-            'confidence_score': 0.87
-        }
+        analysis_result = _analyze(_rfp_snapshot(rfp_id))
         
         return jsonify({
             'success': True,
@@ -488,14 +1252,7 @@ def analyze_rfp(rfp_id):
 def extract_placements(rfp_id):
     """Extract media placements from RFP"""
     try:
-        rfp = RFP.query.get_or_404(rfp_id)
-        
-        # Mock placement extraction
-        placements = [
-            {'channel': 'Digital Display', 'budget': '$200K', 'duration': '8 weeks'},
-            {'channel': 'Social Media', 'budget': '$150K', 'duration': '12 weeks'},
-            {'channel': 'Search Marketing', 'budget': '$100K', 'duration': '10 weeks'}
-        ]
+        placements = _extract_placements(_rfp_snapshot(rfp_id))
         
         return jsonify({
             'success': True,
@@ -510,21 +1267,7 @@ def extract_placements(rfp_id):
 def generate_proposal(rfp_id):
     """Generate proposal for RFP"""
     try:
-        rfp = RFP.query.get_or_404(rfp_id)
-        
-        # Mock proposal generation
-        proposal = {
-            'title': f'Media Proposal for {rfp.name}',
-            'executive_summary': 'Comprehensive media strategy designed to maximize reach and engagement...',
-            'strategy': 'Multi-channel approach focusing on digital-first execution...',
-            'budget_breakdown': {
-                'Digital': '60%',
-                'Traditional': '25%',
-                'Social': '15%'
-            },
-            'timeline': '12-week campaign execution',
-            'kpis': ['Reach: 5M+', 'CTR: 2.5%+', 'ROAS: 4:1+']
-        }
+        proposal = _generate_proposal(_rfp_snapshot(rfp_id))
         
         return jsonify({
             'success': True,
@@ -539,20 +1282,7 @@ def generate_proposal(rfp_id):
 def quality_check(rfp_id):
     """Quality check for RFP proposal"""
     try:
-        rfp = RFP.query.get_or_404(rfp_id)
-        
-        # Mock quality check
-        quality_result = {
-            'overall_score': 8.7,
-            'completeness': 9.2,
-            'accuracy': 8.5,
-            'compliance': 8.9,
-            'recommendations': [
-                'Add more detailed budget breakdown',
-                'Include competitive analysis section',
-                'Enhance measurement methodology'
-            ]
-        }
+        quality_result = _quality_check(_rfp_snapshot(rfp_id))
         
         return jsonify({
             'success': True,
@@ -562,3 +1292,70 @@ def quality_check(rfp_id):
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+@rfp_bp.route('/rfps/batch-actions', methods=['POST'])
+def batch_ai_actions():
+    """Run AI stages for many RFPs concurrently, streaming one NDJSON line per result"""
+    try:
+        data = request.get_json(silent=True) or {}
+        rfp_ids = data.get('rfp_ids')
+        stages = data.get('stages', ['analyze'])
+        
+        # bool is a subclass of int, but true/false are not RFP ids
+        if (not isinstance(rfp_ids, list) or not rfp_ids
+                or not all(isinstance(rfp_id, int) and not isinstance(rfp_id, bool) for rfp_id in rfp_ids)):
+            return jsonify({'success': False, 'error': 'rfp_ids must be a non-empty list of integers'}), 400
+        if len(rfp_ids) > BATCH_MAX_RFPS:
+            return jsonify({'success': False, 'error': f'At most {BATCH_MAX_RFPS} RFPs per batch'}), 400
+        if not isinstance(stages, list) or not stages or not all(isinstance(stage, str) for stage in stages):
+            return jsonify({'success': False, 'error': 'stages must be a non-empty list of stage names'}), 400
+        stages = list(dict.fromkeys(stages))
+        unknown = [stage for stage in stages if stage not in AI_STAGES]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown stages: {', '.join(unknown)}"}), 400
+        try:
+            max_workers = max(1, min(int(data.get('max_workers', BATCH_MAX_WORKERS)), BATCH_MAX_WORKERS))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'max_workers must be an integer'}), 400
+        
+        rfp_ids = list(dict.fromkeys(rfp_ids))
+        # One query for the whole batch; workers only see plain dicts
+        rfps = {
+            rfp.id: rfp.to_dict(AI_STAGE_FIELDS)
+            for rfp in RFP.query_for_fields(AI_STAGE_FIELDS).filter(RFP.id.in_(rfp_ids))
+        }
+        dumps = current_app.json.dumps
+        
+        def generate():
+            start = time.monotonic()
+            counts = {'succeeded': 0, 'failed': 0}
+            for rfp_id in rfp_ids:
+                if rfp_id not in rfps:
+                    counts['failed'] += 1
+                    yield dumps({'rfp_id': rfp_id, 'success': False, 'error': 'RFP not found'}) + '\n'
+            
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='rfp-batch')
+            try:
+                futures = {
+                    executor.submit(AI_STAGES[stage], rfp): (rfp_id, stage)
+                    for rfp_id, rfp in rfps.items() for stage in stages
+                }
+                for future in as_completed(futures):
+                    rfp_id, stage = futures[future]
+                    try:
+                        line = {'rfp_id': rfp_id, 'stage': stage, 'success': True, 'result': future.result()}
+                        counts['succeeded'] += 1
+                    except Exception as e:
+                        line = {'rfp_id': rfp_id, 'stage': stage, 'success': False, 'error': str(e)}
+                        counts['failed'] += 1
+                    yield dumps(line) + '\n'
+            finally:
+                # Stop queued work if the client goes away mid-stream
+                executor.shutdown(wait=False, cancel_futures=True)
+            
+            yield dumps({'done': True, **counts, 'elapsed': round(time.monotonic() - start, 3)}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,309 @@
+"""In-memory inverted index with BM25 ranking for knowledge base articles.
+
+Documents are dicts whose configured text fields are tokenized into weighted
+term frequencies (a title hit counts more than a body hit). Each document
+keeps a forward map ``term -> tf`` and each term keeps its postings grouped
+into impact tiers by ``tf / document length``; ``add()``, ``update()`` and
+``remove()`` touch only the document's own terms, so the index is maintained
+incrementally rather than rebuilt.
+
+Queries match every term (AND). The last term is a prefix unless the query
+ends with whitespace, so results follow the user as they type; prefixes are
+expanded against a sorted vocabulary with ``bisect``.
+
+Ranking never scores every match. A tier's tf/length ceiling gives an upper
+bound on the BM25 score of any document in it, so tiers are visited best
+bound first and the scan stops once the k-th best score found beats the sum of
+the bounds still unvisited (the threshold algorithm). Totals and facet counts
+come from per-term bitmaps over document ordinals (Python ints, ANDed and
+popcounted in C), built on first use and then kept up to date.
+"""
+import bisect
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    'a an and are as at be but by for from has have in is it its of on or that the their this to was were will with'.split()
+)
+# Prefixes expand to at most this many vocabulary terms (the most frequent ones)
+MAX_PREFIX_TERMS = 50
+# Impact tiers per halving of tf / document length
+TIERS_PER_OCTAVE = 8
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of ``text`` without stopwords"""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _tier(tf, length):
+    """``(tf ceiling, tf / length tier)`` of a posting"""
+    tf_ceiling = math.ceil(tf) if tf <= 16 else 2 ** math.ceil(math.log2(tf))
+    return tf_ceiling, int(-math.log2(tf / length) * TIERS_PER_OCTAVE)
+
+
+class SearchIndex:
+    """Incrementally maintained inverted index with BM25 ranking, prefix queries and facets"""
+
+    def __init__(self, fields=None, facet_field='category', k1=1.2, b=0.75):
+        # field -> weight; a term in the title counts three times a term in the body
+        self.fields = fields or {'title': 3.0, 'tags': 2.0, 'content': 1.0}
+        self.facet_field = facet_field
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        # term -> (tf ceiling, tf / length tier) -> {doc_id, ...}
+        self._postings = {}
+        self._doc_freq = {}
+        self._vocabulary = []
+        # doc_id -> {term: tf}
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._total_length = 0.0
+        self._doc_facets = {}
+        self._facet_docs = {}
+        # Bitmaps: bit n is set for the document with ordinal n
+        self._ordinals = {}
+        self._free_ordinals = []
+        self._term_masks = {}
+        self._facet_masks = {}
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_lengths
+
+    def ids(self):
+        """Snapshot of the indexed document ids"""
+        with self._lock:
+            return list(self._doc_lengths)
+
+    def _weighted_terms(self, doc):
+        counts = Counter()
+        for field, weight in self.fields.items():
+            value = doc.get(field)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = ' '.join(str(item) for item in value)
+            for token, count in Counter(tokenize(str(value))).items():
+                counts[token] += count * weight
+        return counts
+
+    def add(self, doc_id, doc):
+        """Index ``doc`` under the integer ``doc_id``, replacing any previous version"""
+        terms = self._weighted_terms(doc)
+        facet = doc.get(self.facet_field)
+        with self._lock:
+            self._remove(doc_id)
+            ordinal = self._free_ordinals.pop() if self._free_ordinals else len(self._ordinals)
+            self._ordinals[doc_id] = ordinal
+            bit = 1 << ordinal
+
+            length = sum(terms.values())
+            for term, tf in terms.items():
+                tiers = self._postings.get(term)
+                if tiers is None:
+                    tiers = self._postings[term] = {}
+                    self._doc_freq[term] = 0
+                    bisect.insort(self._vocabulary, term)
+                tiers.setdefault(_tier(tf, length), set()).add(doc_id)
+                self._doc_freq[term] += 1
+                if term in self._term_masks:
+                    self._term_masks[term] |= bit
+            self._doc_terms[doc_id] = dict(terms)
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+
+            self._doc_facets[doc_id] = facet
+            self._facet_docs.setdefault(facet, {})[doc_id] = None
+            self._facet_masks[facet] = self._facet_masks.get(facet, 0) | bit
+
+    update = add
+
+    def remove(self, doc_id):
+        """Drop ``doc_id`` from the index; unknown ids are ignored"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        ordinal = self._ordinals.pop(doc_id)
+        self._free_ordinals.append(ordinal)
+        bit = 1 << ordinal
+
+        length = self._doc_lengths.pop(doc_id)
+        self._total_length -= length
+        for term, tf in terms.items():
+            tiers = self._postings[term]
+            tier = _tier(tf, length)
+            tiers[tier].discard(doc_id)
+            if not tiers[tier]:
+                del tiers[tier]
+            self._doc_freq[term] -= 1
+            if term in self._term_masks:
+                self._term_masks[term] ^= bit
+            if not tiers:
+                del self._postings[term]
+                del self._doc_freq[term]
+                self._term_masks.pop(term, None)
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+
+        facet = self._doc_facets.pop(doc_id)
+        del self._facet_docs[facet][doc_id]
+        self._facet_masks[facet] ^= bit
+        if not self._facet_docs[facet]:
+            del self._facet_docs[facet]
+            del self._facet_masks[facet]
+
+    def _expand(self, prefix):
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff', start)
+        terms = self._vocabulary[start:end]
+        if len(terms) > MAX_PREFIX_TERMS:
+            terms = heapq.nlargest(MAX_PREFIX_TERMS, terms, key=self._doc_freq.__getitem__)
+        return terms
+
+    def _term_mask(self, term):
+        mask = self._term_masks.get(term)
+        if mask is None:
+            bits = bytearray(len(self._ordinals) + len(self._free_ordinals) + 7 >> 3)
+            ordinals = self._ordinals
+            for ids in self._postings[term].values():
+                for doc_id in ids:
+                    ordinal = ordinals[doc_id]
+                    bits[ordinal >> 3] |= 1 << (ordinal & 7)
+            mask = self._term_masks[term] = int.from_bytes(bits, 'little')
+        return mask
+
+    def facet_counts(self):
+        """Number of indexed documents per facet value"""
+        with self._lock:
+            return {facet: len(ids) for facet, ids in self._facet_docs.items()}
+
+    def search(self, query, facet=None, limit=20, offset=0):
+        """Rank documents matching every term of ``query``.
+
+        Returns ``{'hits': [(doc_id, score), ...], 'total', 'facets'}`` where
+        ``facets`` counts the matches per facet value before ``facet`` is applied.
+        An empty query matches every document with a score of 0; a query made
+        only of stopwords or punctuation matches nothing. ``limit`` <= 0 returns
+        no hits (but still the total and facets) and a negative ``offset`` counts as 0.
+        """
+        limit, offset = max(0, limit), max(0, offset)
+        tokens = tokenize(query)
+        prefix = bool(tokens) and not query[-1:].isspace()
+
+        with self._lock:
+            if not tokens:
+                if query.strip():
+                    return {'hits': [], 'total': 0, 'facets': {}}
+                ids = self._facet_docs.get(facet, {}) if facet is not None else self._doc_lengths
+                return {
+                    'hits': [(doc_id, 0.0) for doc_id in list(ids)[offset:offset + limit]],
+                    'total': len(ids),
+                    'facets': self.facet_counts()
+                }
+
+            # One group of alternative terms per query position; only the last may be a prefix
+            exact = dict.fromkeys(tokens[:-1] if prefix else tokens)
+            groups = [[token] if token in self._postings else [] for token in exact]
+            if prefix:
+                groups.append(self._expand(tokens[-1]))
+            if not all(groups):
+                return {'hits': [], 'total': 0, 'facets': {}}
+
+            matches = None
+            for group in groups:
+                group_mask = 0
+                for term in group:
+                    group_mask |= self._term_mask(term)
+                matches = group_mask if matches is None else matches & group_mask
+            facets = {value: count for value, mask in self._facet_masks.items() if (count := (matches & mask).bit_count())}
+            total = facets.get(facet, 0) if facet is not None else matches.bit_count()
+
+            if not limit or offset >= total:
+                return {'hits': [], 'total': total, 'facets': facets}
+            hits = self._top(groups, facet, min(offset + limit, total))
+        return {'hits': hits[offset:], 'total': total, 'facets': facets}
+
+    def _top(self, groups, facet, k):
+        if k <= 0:
+            return []
+        count = len(self._doc_lengths)
+        k1, b = self.k1, self.b
+        average_length = self._total_length / count
+        idf = {
+            term: math.log(1 + (count - self._doc_freq[term] + 0.5) / (self._doc_freq[term] + 0.5))
+            for group in groups for term in group
+        }
+
+        # Each group visits its (term, tier) postings from the highest score bound down.
+        # BM25's term weight tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avgdl))
+        # equals (k1 + 1) / (1 + k1 * (1 - b) / tf + k1 * b / (avgdl * tf / length)),
+        # so the tier's ceilings on tf and on tf / length bound it from above.
+        streams = []
+        for group in groups:
+            stream = []
+            for term in group:
+                for (tf_ceiling, ratio_tier), ids in self._postings[term].items():
+                    ratio_ceiling = 2 ** (-ratio_tier / TIERS_PER_OCTAVE)
+                    bound = (k1 + 1) / (1 + k1 * (1 - b) / tf_ceiling + k1 * b / (average_length * ratio_ceiling))
+                    stream.append((idf[term] * bound, ids))
+            stream.sort(key=lambda entry: entry[0], reverse=True)
+            streams.append(stream)
+        positions = [0] * len(streams)
+
+        def score(doc_id):
+            terms = self._doc_terms[doc_id]
+            norm = k1 * (1 - b + b * self._doc_lengths[doc_id] / average_length)
+            total = 0.0
+            for group in groups:
+                best = 0.0
+                for term in group:
+                    tf = terms.get(term)
+                    if tf is not None:
+                        best = max(best, idf[term] * tf * (k1 + 1) / (tf + norm))
+                if not best:
+                    return 0.0
+                total += best
+            return total
+
+        # Heap of (score, -doc_id): equal scores rank the lower id first, so
+        # pages of any size cut one fixed order
+        heap, seen = [], set()
+        while True:
+            bounds = [stream[position][0] if position < len(stream) else 0.0
+                      for stream, position in zip(streams, positions)]
+            # Unvisited documents cannot score more than the sum of the next bounds
+            # (strictly: one scoring exactly that could still win a tie)
+            if len(heap) == k and heap[0][0] > sum(bounds):
+                break
+            # Once a group is exhausted every document matching it has been seen
+            if not all(bounds):
+                break
+            best_group = max(range(len(streams)), key=bounds.__getitem__)
+            ids = streams[best_group][positions[best_group]][1]
+            positions[best_group] += 1
+            for doc_id in ids:
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                if facet is not None and self._doc_facets[doc_id] != facet:
+                    continue
+                value = score(doc_id)
+                if not value:
+                    continue
+                entry = (value, -doc_id)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return [(-negated_id, value) for value, negated_id in sorted(heap, reverse=True)]
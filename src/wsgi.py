@@ -0,0 +1,11 @@
+"""Production WSGI entry point.
+
+Serve with gunicorn from the repository root, which picks up ``gunicorn.conf.py``:
+
+    gunicorn src.wsgi:app
+
+``python src/main.py`` still starts the Werkzeug development server for local work.
+"""
+from src.main import app
+
+application = app
@@ -0,0 +1,106 @@
+import os
+from datetime import date, timedelta
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from src.models.migrations import install_search_index
+from src.models.rfp import db, RFP, RFPTeamMember, RFPAttachment
+from src.routes.knowledge import knowledge_bp
+from src.routes.rfp import rfp_bp
+
+# The demo apps create their tables on import; keep them out of the instance folder
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+
+def create_app(data_dir):
+    """App with the RFP and knowledge blueprints at /api and a SQLite database in ``data_dir``.
+
+    Also importable by a real server, e.g. ``gunicorn 'tests.conftest:create_app("/tmp/x")'``.
+    """
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(data_dir, 'app.db')}",
+        ATTACHMENT_STORAGE_DIR=os.path.join(data_dir, 'attachments'),
+        EXTRACTION_CACHE_DIR=os.path.join(data_dir, 'extraction-cache'),
+    )
+    db.init_app(app)
+    app.register_blueprint(rfp_bp, url_prefix='/api')
+    app.register_blueprint(knowledge_bp, url_prefix='/api')
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app(str(tmp_path))
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def fts_index(app):
+    """Install the FTS5 RFP search index, as run_migrations() does for a real database"""
+    install_search_index()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class QueryCounter:
+    """Records the SQL statements run against the engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries(app):
+    return lambda: QueryCounter(db.engine)
+
+
+def make_rfps(count, members=2, attachments=2, **overrides):
+    """Insert ``count`` RFPs, each with team members and attachments; returns their ids"""
+    rfps = []
+    for n in range(count):
+        fields = {
+            'name': f'RFP {n}',
+            'agency_name': f'Agency {n % 5}',
+            'advertiser_client_name': f'Client {n}',
+            'campaign_type': 'Digital Media',
+            'budget_range': '$100K - $200K',
+            'due_date': date.today() + timedelta(days=n),
+            'status': ('New', 'In Progress', 'Completed')[n % 3],
+            'content': f'Campaign content {n}',
+        }
+        fields.update(overrides)
+        rfp = RFP(**fields)
+        rfp.team_members = [RFPTeamMember(name=f'Member {m}', role='Planner') for m in range(members)]
+        rfp.attachments = [RFPAttachment(filename=f'doc{m}.pdf', file_type='pdf') for m in range(attachments)]
+        rfps.append(rfp)
+    db.session.add_all(rfps)
+    db.session.commit()
+    return [rfp.id for rfp in rfps]
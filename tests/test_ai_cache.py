@@ -0,0 +1,67 @@
+import pytest
+
+import src.main_backup as backup
+from src.result_cache import ResultCache
+
+
+@pytest.fixture
+def rfp():
+    """A fresh copy of sample RFP 1 with an empty cache"""
+    original = dict(backup.rfps_db[1])
+    backup.ai_cache = ResultCache(max_entries=64)
+    backup.rfps_db[1] = dict(original, analysis=None, proposal=None, quality_check=None)
+    yield backup.rfps_db[1]
+    backup.rfps_db[1] = original
+
+
+def test_status_change_is_a_cache_miss(rfp):
+    first = backup.run_analysis_stage({'rfp_id': 1})
+    assert not any('aggressive' in insight for insight in first['key_insights'])
+
+    rfp['status'] = 'Urgent'
+    second = backup.run_analysis_stage({'rfp_id': 1})
+
+    assert any('aggressive' in insight for insight in second['key_insights'])
+    assert backup.ai_cache.stats()['misses'] == 2
+
+
+def test_unrelated_fields_keep_the_cache(rfp):
+    backup.run_analysis_stage({'rfp_id': 1})
+    rfp['completion_percentage'] = 99
+    rfp['updated_at'] = '2030-01-01T00:00:00'
+    backup.run_analysis_stage({'rfp_id': 1})
+
+    assert backup.ai_cache.stats()['hits'] == 1
+
+
+def test_proposal_key_follows_the_analysis(rfp):
+    backup.run_proposal_stage({'rfp_id': 1})
+    analysis = rfp['analysis']
+    assert backup.ai_cache_key('proposal', rfp, analysis) != backup.ai_cache_key(
+        'proposal', rfp, dict(analysis, estimated_timeline='12 weeks'))
+
+    rfp['analysis'] = dict(analysis, estimated_timeline='12 weeks')
+    proposal = backup.run_proposal_stage({'rfp_id': 1})
+
+    assert 'Campaign Duration: 12 weeks' in proposal['sections']['media_plan']
+
+
+def test_callers_cannot_corrupt_cached_results(rfp):
+    first = backup.run_analysis_stage({'rfp_id': 1})
+    first['key_insights'].append('edited by a caller')
+    first['confidence_score'] = 0
+
+    second = backup.run_analysis_stage({'rfp_id': 1})
+
+    assert 'edited by a caller' not in second['key_insights']
+    assert second['confidence_score'] > 0
+    assert second is not first
+
+
+def test_models_only_see_key_fields(rfp, monkeypatch):
+    seen = []
+    monkeypatch.setattr(backup.analysis_fanout, 'run',
+                        lambda content, data: seen.append(data) or {'results': {}, 'errors': {}, 'elapsed': 0})
+    backup.run_analysis_stage({'rfp_id': 1})
+
+    assert set(seen[0]) == set(backup.AI_INPUT_FIELDS)
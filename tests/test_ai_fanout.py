@@ -0,0 +1,114 @@
+import threading
+import time
+
+from src.ai_fanout import FakeProvider, FanOutExecutor, ModelProvider
+
+
+class BlockingProvider(ModelProvider):
+    """Provider that ignores its timeout and hangs until released"""
+
+    def __init__(self, name):
+        self.name = name
+        self.release = threading.Event()
+        self.calls = 0
+
+    def analyze(self, rfp_content, rfp_data, timeout=None):
+        self.calls += 1
+        self.release.wait(5)
+        return {'confidence_score': 0.5}
+
+
+def test_all_models_answer_concurrently():
+    providers = [FakeProvider(name, result={'confidence_score': 0.9}, latency=0.2) for name in 'abc']
+    fanout = FanOutExecutor(providers, model_timeout=1, deadline=2)
+
+    fan_out = fanout.run('content', {})
+
+    assert set(fan_out['results']) == {'a', 'b', 'c'}
+    assert fan_out['elapsed'] < 0.5
+
+
+def test_timeout_is_per_call_and_passed_to_the_provider():
+    seen = []
+    fast = FakeProvider('fast', result={}, latency=0.0)
+    slow = FakeProvider('slow', result={}, latency=1.0)
+    original = slow.analyze
+    slow.analyze = lambda content, data, timeout=None: seen.append(timeout) or original(content, data, timeout)
+    fanout = FanOutExecutor([fast, slow], model_timeout=0.2, deadline=2)
+
+    fan_out = fanout.run('content', {})
+
+    assert fan_out['errors'] == {'slow': 'model timeout'}
+    assert seen and seen[0] <= 0.2
+    assert fan_out['elapsed'] < 0.5
+
+
+def test_hedged_call_gets_its_own_timeout():
+    latencies = iter([1.0, 0.25])
+    provider = FakeProvider('model', result={'confidence_score': 0.7}, latency=lambda: next(latencies))
+    fanout = FanOutExecutor([provider], model_timeout=0.4, deadline=2, hedge_after=0.3)
+
+    fan_out = fanout.run('content', {})
+
+    # The hedge is sent at 0.3s and answers at 0.55s, after the first call's 0.4s timeout
+    assert fan_out['results'] == {'model': {'confidence_score': 0.7}}
+    assert provider.calls == 2
+
+
+def test_abandoned_calls_do_not_block_other_models():
+    hung = BlockingProvider('hung')
+    healthy = FakeProvider('healthy', result={'confidence_score': 0.8}, latency=0.05)
+    fanout = FanOutExecutor([hung, healthy], model_timeout=0.1, deadline=1, max_in_flight_per_model=2)
+    try:
+        for _ in range(5):
+            fan_out = fanout.run('content', {})
+            assert 'healthy' in fan_out['results']
+            assert fan_out['errors'] == {'hung': 'model timeout'}
+            assert fan_out['elapsed'] < 0.5
+
+        # Two calls hold both of the hung model's threads; later calls time out in its queue
+        assert hung.calls == 2
+    finally:
+        hung.release.set()
+
+
+def test_calls_over_the_cap_wait_for_a_free_slot():
+    hung = BlockingProvider('hung')
+    fanout = FanOutExecutor([hung], model_timeout=0.05, deadline=1, max_in_flight_per_model=1)
+
+    assert fanout.run('content', {})['errors'] == {'hung': 'model timeout'}
+    assert fanout.run('content', {})['errors'] == {'hung': 'model timeout'}
+    assert hung.calls == 1
+
+    hung.release.set()
+    time.sleep(0.05)
+    assert 'hung' in fanout.run('content', {})['results']
+
+
+def test_concurrent_analyses_get_every_model():
+    providers = [FakeProvider(name, result={'confidence_score': 0.9}, latency=0.3) for name in 'abcd']
+    fanout = FanOutExecutor(providers, model_timeout=2, deadline=3, max_in_flight_per_model=2)
+    fan_outs = []
+
+    threads = [threading.Thread(target=lambda: fan_outs.append(fanout.run('content', {}))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Four analyses on two slots per model: the second pair queues behind the first
+    assert len(fan_outs) == 4
+    for fan_out in fan_outs:
+        assert set(fan_out['results']) == {'a', 'b', 'c', 'd'}
+        assert fan_out['errors'] == {}
+    assert all(provider.calls == 4 for provider in providers)
+
+
+def test_deadline_bounds_the_fan_out():
+    provider = FakeProvider('slow', result={}, latency=1.0)
+    fanout = FanOutExecutor([provider], model_timeout=5, deadline=0.2)
+
+    fan_out = fanout.run('content', {})
+
+    assert fan_out['errors'] == {'slow': 'deadline exceeded'}
+    assert fan_out['elapsed'] < 0.4
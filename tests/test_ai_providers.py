@@ -0,0 +1,148 @@
+import itertools
+import time
+
+import pytest
+import requests
+
+from scripts.stub_provider import serve
+from src.ai_fanout import FanOutExecutor
+from src.ai_providers import CircuitBreaker, CircuitOpenError, HTTPModelProvider, ProviderClient, ProviderError
+
+
+@pytest.fixture
+def stub():
+    server, state = serve(port=0)
+    state.url = f'http://127.0.0.1:{server.server_port}'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(stub, **options):
+    options = dict({'backoff_base': 0.01, 'backoff_cap': 0.05, 'read_timeout': 2.0}, **options)
+    return ProviderClient('stub', stub.url, **options)
+
+
+def test_keep_alive_reuses_one_connection(stub):
+    client = make_client(stub)
+    for _ in range(5):
+        assert client.post_json('/v1/analyze', {})['confidence_score'] == 0.8
+
+    assert stub.requests == 5
+    assert stub.connections == 1
+
+
+def test_retries_server_errors_then_gives_up(stub):
+    stub.error_rate = 1.0
+    client = make_client(stub, max_retries=2)
+
+    with pytest.raises(ProviderError, match='HTTP 503 after 2 retries'):
+        client.post_json('/v1/analyze', {})
+
+    assert stub.requests == 3
+    assert client.stats()['retries'] == 2
+    assert client.stats()['failures'] == 1
+
+
+def test_retry_succeeds_after_transient_errors(stub):
+    outcomes = iter([1.0, 1.0, 0.0])
+    stub.latency = lambda: setattr(stub, 'error_rate', next(outcomes)) or 0
+    client = make_client(stub, max_retries=3)
+
+    assert client.post_json('/v1/analyze', {})['confidence_score'] == 0.8
+    assert stub.requests == 3
+
+
+def test_client_errors_are_not_retried(stub):
+    stub.error_rate, stub.status = 1.0, 400
+    client = make_client(stub)
+
+    with pytest.raises(ProviderError, match='HTTP 400'):
+        client.post_json('/v1/analyze', {})
+
+    assert stub.requests == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_other_request_exceptions_are_retried(stub, monkeypatch):
+    client = make_client(stub, max_retries=2)
+    calls = itertools.count()
+
+    def broken_post(*args, **kwargs):
+        next(calls)
+        raise requests.exceptions.ChunkedEncodingError('connection broken')
+
+    monkeypatch.setattr(client.session, 'post', broken_post)
+    with pytest.raises(ProviderError, match='connection broken'):
+        client.post_json('/v1/analyze', {})
+
+    assert next(calls) == 3
+
+
+def test_timeout_bounds_the_whole_call(stub):
+    stub.latency = 1.0
+    client = make_client(stub, max_retries=3)
+
+    start = time.monotonic()
+    with pytest.raises(ProviderError):
+        client.post_json('/v1/analyze', {}, timeout=0.2)
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_breaker_opens_probes_and_closes(stub):
+    stub.error_rate = 1.0
+    client = make_client(stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.1))
+
+    for _ in range(2):
+        with pytest.raises(ProviderError):
+            client.post_json('/v1/analyze', {})
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        client.post_json('/v1/analyze', {})
+    assert stub.requests == 2
+
+    # A failed trial call reopens the breaker
+    time.sleep(0.1)
+    with pytest.raises(ProviderError):
+        client.post_json('/v1/analyze', {})
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+    # A successful one closes it
+    time.sleep(0.1)
+    stub.error_rate = 0.0
+    assert client.post_json('/v1/analyze', {})
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_unexpected_error_in_trial_call_reopens_breaker(stub, monkeypatch):
+    client = make_client(stub, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+    client.breaker.record_failure()
+    time.sleep(0.05)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError('bug in the caller')
+
+    monkeypatch.setattr(client.session, 'post', crash)
+    with pytest.raises(RuntimeError):
+        client.post_json('/v1/analyze', {})
+
+    assert client.breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.05)
+    monkeypatch.undo()
+    assert client.post_json('/v1/analyze', {})
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedged_http_call_answers_before_slow_first_attempt(stub):
+    latencies = iter([1.0, 0.05])
+    stub.latency = lambda: next(latencies, 0.05)
+    provider = HTTPModelProvider(make_client(stub, max_retries=0))
+    fanout = FanOutExecutor([provider], model_timeout=2, deadline=3, hedge_after=0.1)
+
+    fan_out = fanout.run('content', {})
+
+    assert fan_out['results']['stub']['confidence_score'] == 0.8
+    assert fan_out['elapsed'] < 0.5
+    assert stub.requests == 2
@@ -0,0 +1,78 @@
+import pytest
+
+from src.models.migrations import reparse_magnitude_budgets
+from src.models.rfp import db, RFP, DashboardStats, parse_budget_range
+from tests.conftest import make_rfps
+
+
+@pytest.mark.parametrize('budget_range, expected', [
+    ('$500K - $750K', (500000, 750000)),
+    ('$1M - $1.5M', (1000000, 1500000)),
+    ('$1.25M-$2M', (1250000, 2000000)),
+    ('$250k – $400k', (250000, 400000)),
+    ('$100,000 - $250,000', (100000, 250000)),
+    ('$100 - 200', (100, 200)),
+    ('USD 50,000 to 75,000', (50000, 75000)),
+    ('€2M', (2000000, 2000000)),
+    ('500K', (500000, 500000)),
+    ('Up to $2B', (2000000000, 2000000000)),
+    ('$3M for Q3 2025', (3000000, 3000000)),
+    ('Q3 2025: $200K - $300K', (200000, 300000)),
+    ('$1.5 million', (1500000, 1500000)),
+    ('$250 thousand - $400 thousand', (250000, 400000)),
+    ('USD 2 billion', (2000000000, 2000000000)),
+    ('$1.5MM', (1500000, 1500000)),
+    ('$1MM - $2MM', (1000000, 2000000)),
+    ('$100-200K', (100000, 200000)),
+    ('$1.5 - 2M', (1500000, 2000000)),
+    ('$100 - 200 million', (100000000, 200000000)),
+    # The end's magnitude only carries over when the range stays ascending
+    ('$500 - $1M', (500, 1000000)),
+])
+def test_parse_budget_range(budget_range, expected):
+    assert parse_budget_range(budget_range) == expected
+
+
+@pytest.mark.parametrize('budget_range', [None, '', 'TBD', 'Q3 2025', '2025-04-15', '12 weeks', '5 Months'])
+def test_parse_budget_range_without_amounts(budget_range):
+    assert parse_budget_range(budget_range) == (None, None)
+
+
+def test_budget_columns_follow_budget_range(app):
+    rfp_id = make_rfps(1, budget_range='$1M - $1.5M')[0]
+    rfp = db.session.get(RFP, rfp_id)
+    assert (rfp.budget_min, rfp.budget_max) == (1000000, 1500000)
+
+    rfp.budget_range = 'TBD'
+    db.session.commit()
+    assert (rfp.budget_min, rfp.budget_max) == (None, None)
+
+
+def test_dashboard_placements_floor_each_rfp(app):
+    # 15 + 2 placements; summing before flooring would give 18
+    make_rfps(1, members=0, attachments=0, budget_range='$155K - $200K')
+    make_rfps(1, members=0, attachments=0, budget_range='$29K - $30K')
+    make_rfps(1, members=0, attachments=0, budget_range='TBD')
+
+    stats = DashboardStats.get_stats()
+
+    assert stats['pending_placements'] == 17
+    assert stats['potential_revenue'] == 0.23
+
+
+def test_reparse_fixes_budgets_parsed_by_the_old_rules(app):
+    ranges = ['$1.5 million', '$1.5MM', '$100-200K', '$500K - $750K']
+    ids = [make_rfps(1, members=0, attachments=0, budget_range=budget_range)[0] for budget_range in ranges]
+    # What the parser used to store for each, written past the model's own parsing
+    old_values = [(1, 1), (1, 1), (100, 200000), (500000, 750000)]
+    table = RFP.__table__
+    for rfp_id, (budget_min, budget_max) in zip(ids, old_values):
+        db.session.execute(table.update().where(table.c.id == rfp_id).values(budget_min=budget_min, budget_max=budget_max))
+    db.session.commit()
+
+    reparse_magnitude_budgets(batch_size=2)
+
+    rows = db.session.execute(db.select(table.c.budget_min, table.c.budget_max).order_by(table.c.id)).all()
+    assert [tuple(row) for row in rows] == [
+        (1500000, 1500000), (1500000, 1500000), (100000, 200000), (500000, 750000)
+    ]
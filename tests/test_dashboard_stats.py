@@ -0,0 +1,79 @@
+"""Article totals kept in knowledge_stats, and the demo app's dashboard consistency check"""
+import pytest
+
+from src.models.knowledge import KnowledgeArticle, KnowledgeStats
+from src.models.rfp import db
+
+
+def test_article_totals_follow_every_write(app, client):
+    assert KnowledgeStats.totals() == (0, 0, 0.0)
+
+    first = client.post('/api/knowledge-base/articles', json={'title': 'Planning'}).get_json()['article']['id']
+    second = client.post('/api/knowledge-base/articles', json={'title': 'Buying'}).get_json()['article']['id']
+    client.put(f'/api/knowledge-base/articles/{first}', json={'views': 10, 'rating': 4.5})
+    client.put(f'/api/knowledge-base/articles/{second}', json={'rating': 3.5})
+    client.get(f'/api/knowledge-base/articles/{second}')
+    client.get(f'/api/knowledge-base/articles/{second}')
+    assert KnowledgeStats.totals() == (2, 12, 8.0)
+
+    client.delete(f'/api/knowledge-base/articles/{first}')
+
+    assert KnowledgeStats.totals() == (1, 2, 3.5)
+    assert KnowledgeStats.totals() == KnowledgeStats.recount()
+
+
+def test_totals_are_read_without_touching_the_articles(app, count_queries):
+    with count_queries() as counter:
+        KnowledgeStats.totals()
+
+    assert len(counter.statements) == 1
+    assert KnowledgeArticle.__tablename__ not in counter.statements[0]
+
+
+def test_stats_table_starts_from_existing_articles(app):
+    # A database that had articles before knowledge_stats existed
+    db.session.add_all([KnowledgeArticle(title='a', views=3, rating=4.0), KnowledgeArticle(title='b', views=4, rating=2.0)])
+    db.session.commit()
+    KnowledgeStats.__table__.drop(db.engine)
+
+    KnowledgeStats.__table__.create(db.engine)
+
+    assert KnowledgeStats.totals() == (2, 7, 6.0)
+
+
+@pytest.fixture
+def demo_app():
+    import src.main as demo
+
+    with demo.app.app_context():
+        yield demo
+
+
+def test_check_dashboard_stats_is_empty_when_consistent(demo_app):
+    assert demo_app.check_dashboard_stats() == {}
+
+
+def test_check_dashboard_stats_reports_article_drift(demo_app):
+    table = KnowledgeStats.__table__
+    # Views added in SQL without going through the counters
+    db.session.execute(db.update(KnowledgeArticle).values(views=KnowledgeArticle.views + 5))
+    db.session.commit()
+    try:
+        mismatches = demo_app.check_dashboard_stats()
+        views = db.session.execute(db.select(table.c.views)).scalar()
+        assert mismatches == {'total_views': (views, views + 5 * KnowledgeArticle.query.count())}
+    finally:
+        db.session.execute(db.update(KnowledgeArticle).values(views=KnowledgeArticle.views - 5))
+        db.session.commit()
+
+
+def test_check_dashboard_stats_reports_rfp_index_drift(demo_app):
+    rfp = demo_app.rfp_store.get(1)
+    status = rfp['status']
+    rfp['status'] = 'Completed'
+    try:
+        mismatches = demo_app.check_dashboard_stats()
+        assert 'rfps.index:status' in mismatches
+        assert mismatches['active_rfps'] == (2, 1)
+    finally:
+        rfp['status'] = status
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.jobs import COMPLETED, FAILED, QUEUED, RUNNING, WAITING, JobQueue, SQLiteJobBackend
+
+
+def _wait_for_status(queue, job_id, statuses, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'{job_id} still {queue.get(job_id)["status"]}')
+
+
+def _queue(backend, **kwargs):
+    queue = JobQueue(backend, max_workers=2, **kwargs)
+    queue.register('double', lambda payload, upstream: (upstream or payload['value']) * 2)
+    return queue
+
+
+@pytest.fixture
+def blocked():
+    """A stage that hangs until the test ends, standing in for a process that died mid-job"""
+    release = threading.Event()
+    yield lambda payload, upstream: release.wait()
+    release.set()
+
+
+def test_pipeline_passes_results_downstream():
+    queue = _queue(None)
+    _, jobs = queue.pipeline(['double', 'double', 'double'], {'value': 3})
+
+    last = _wait_for_status(queue, jobs[-1]['id'], (COMPLETED, FAILED))
+
+    assert last['status'] == COMPLETED
+    assert last['result'] == 24
+    queue.shutdown()
+
+
+def test_failed_upstream_fails_dependents():
+    queue = _queue(None)
+    queue.register('boom', lambda payload, upstream: 1 / 0)
+    _, jobs = queue.pipeline(['boom', 'double'], {'value': 3})
+
+    dependent = _wait_for_status(queue, jobs[1]['id'], (COMPLETED, FAILED))
+
+    assert dependent['status'] == FAILED
+    assert jobs[0]['id'] in dependent['error']
+    queue.shutdown()
+
+
+def test_restart_reruns_interrupted_jobs_and_rebuilds_dependents(tmp_path, blocked):
+    path = str(tmp_path / 'jobs.db')
+    # The first process never renews its leases again, as if it had crashed
+    crashed = _queue(SQLiteJobBackend(path), lease_seconds=0.2, maintenance_interval=3600)
+    crashed.register('double', blocked)
+    _, jobs = crashed.pipeline(['double', 'double'], {'value': 5})
+    queued = crashed.submit('double', {'value': 7})
+    _wait_for_status(crashed, jobs[0]['id'], (RUNNING,))
+    assert crashed.get(jobs[1]['id'])['status'] == WAITING
+    time.sleep(0.3)
+
+    restarted = _queue(SQLiteJobBackend(path), lease_seconds=5, maintenance_interval=0.05)
+    restarted.start()
+
+    assert _wait_for_status(restarted, jobs[1]['id'], (COMPLETED, FAILED))['result'] == 20
+    assert _wait_for_status(restarted, queued['id'], (COMPLETED, FAILED))['result'] == 14
+    assert restarted.get(jobs[0]['id'])['owner'] is None
+    restarted.shutdown()
+
+
+def test_live_leases_are_not_taken_over(tmp_path, blocked):
+    path = str(tmp_path / 'jobs.db')
+    running = _queue(SQLiteJobBackend(path), lease_seconds=0.3, maintenance_interval=0.05)
+    running.register('double', blocked)
+    job = running.submit('double', {'value': 1})
+    _wait_for_status(running, job['id'], (RUNNING,))
+    time.sleep(0.5)
+
+    other = _queue(SQLiteJobBackend(path))
+    assert other.recover() == []
+    assert other.get(job['id'])['owner'] == running.id
+    other.shutdown()
+
+
+def test_waiting_job_starts_when_another_process_finishes_its_upstream(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    gate = threading.Event()
+    first = _queue(SQLiteJobBackend(path))
+    first.register('gated', lambda payload, upstream: gate.wait() and payload['value'])
+    second = _queue(SQLiteJobBackend(path), maintenance_interval=0.05)
+    second.start()
+    upstream = first.submit('gated', {'value': 2})
+    dependent = second.submit('double', {'value': 0}, depends_on=upstream['id'])
+    assert second.get(dependent['id'])['status'] == WAITING
+
+    gate.set()
+
+    assert _wait_for_status(second, dependent['id'], (COMPLETED,))['result'] == 4
+    first.shutdown()
+    second.shutdown()
+
+
+def test_graceful_shutdown_hands_queued_jobs_over(tmp_path, blocked):
+    path = str(tmp_path / 'jobs.db')
+    stopping = JobQueue(SQLiteJobBackend(path), max_workers=1)
+    stopping.register('double', blocked)
+    stopping.submit('double', {'value': 1})
+    waiting = stopping.submit('double', {'value': 4})
+    stopping.shutdown(wait=False)
+    assert stopping.get(waiting['id'])['status'] == QUEUED
+
+    successor = _queue(SQLiteJobBackend(path))
+    successor.start()
+
+    assert _wait_for_status(successor, waiting['id'], (COMPLETED,))['result'] == 8
+    successor.shutdown()
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_finished_jobs_are_pruned_after_retention(tmp_path, blocked, backend):
+    queue = _queue(SQLiteJobBackend(str(tmp_path / 'jobs.db')) if backend == 'sqlite' else None,
+                   retention_seconds=0.2, maintenance_interval=3600)
+    queue.register('block', blocked)
+    failed = queue.submit('double', {})
+    done = queue.submit('double', {'value': 2})
+    running = queue.submit('block', {})
+    _wait_for_status(queue, failed['id'], (FAILED,))
+    _wait_for_status(queue, done['id'], (COMPLETED,))
+    _wait_for_status(queue, running['id'], (RUNNING,))
+
+    # Inside the retention window finished jobs stay readable
+    assert queue.prune() == 0
+    time.sleep(0.3)
+    fresh = queue.submit('double', {'value': 5})
+    _wait_for_status(queue, fresh['id'], (COMPLETED,))
+
+    assert queue.prune() == 2
+    assert queue.get(failed['id']) is None
+    assert queue.get(done['id']) is None
+    # Unfinished and recently finished jobs are kept
+    assert queue.get(running['id'])['status'] == RUNNING
+    assert queue.get(fresh['id'])['result'] == 10
+    queue.shutdown(wait=False)
+
+
+def test_submit_prunes_once_per_maintenance_interval():
+    queue = _queue(None, retention_seconds=0, maintenance_interval=0)
+    first = queue.submit('double', {'value': 1})
+    _wait_for_status(queue, first['id'], (COMPLETED,))
+    time.sleep(0.01)
+
+    queue.submit('double', {'value': 2})
+
+    assert queue.get(first['id']) is None
+    queue.shutdown()
+
+
+def test_maintenance_prunes_other_processes_jobs(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    finished_elsewhere = _queue(SQLiteJobBackend(path), retention_seconds=None)
+    job = finished_elsewhere.submit('double', {'value': 3})
+    _wait_for_status(finished_elsewhere, job['id'], (COMPLETED,))
+    finished_elsewhere.shutdown()
+
+    maintaining = _queue(SQLiteJobBackend(path), retention_seconds=0, maintenance_interval=0.05)
+    maintaining.start()
+
+    deadline = time.monotonic() + 5
+    while maintaining.get(job['id']) is not None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert maintaining.get(job['id']) is None
+    maintaining.shutdown()
+
+
+def test_old_job_files_get_finished_at_backfilled(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE jobs (id TEXT PRIMARY KEY, pipeline_id TEXT, data TEXT NOT NULL)')
+    job = {'id': 'old', 'pipeline_id': None, 'status': COMPLETED, 'stage': 'double',
+           'updated_at': '2020-01-01T00:00:00', 'finished_at': '2020-01-01T00:00:00'}
+    conn.execute('INSERT INTO jobs (id, pipeline_id, data) VALUES (?, ?, ?)', ('old', None, json.dumps(job)))
+    conn.commit()
+    conn.close()
+
+    queue = _queue(SQLiteJobBackend(path))
+
+    assert queue.prune() == 1
+    assert queue.get('old') is None
+    queue.shutdown()
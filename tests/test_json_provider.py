@@ -0,0 +1,105 @@
+"""FastJSONProvider encodes the same way with orjson and with the standard library fallback"""
+import json
+from datetime import date, datetime
+
+import pytest
+from flask import Flask, jsonify
+
+import src.json_provider as json_provider
+from src.json_provider import FastJSONProvider
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def app(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    with app.test_request_context():
+        yield app
+
+
+def body_of(response):
+    """Every chunk of a (possibly streamed) response, in order"""
+    return [chunk if isinstance(chunk, bytes) else chunk.encode() for chunk in response.response]
+
+
+def test_dates_are_iso_8601(app):
+    payload = {'due_date': date(2025, 4, 15), 'updated_at': datetime(2025, 4, 1, 9, 30, 5, 120000)}
+
+    encoded = json.loads(app.json.dumps(payload))
+
+    assert encoded == {'due_date': '2025-04-15', 'updated_at': '2025-04-01T09:30:05.120000'}
+
+
+def test_dumps_bytes_keeps_key_order_and_accepts_int_keys(app):
+    encoded = app.json.dumps_bytes({'b': 1, 'a': [1, 2], 3: 'three', 'name': 'Café'})
+
+    assert isinstance(encoded, bytes)
+    assert list(json.loads(encoded)) == ['b', 'a', '3', 'name']
+    assert json.loads(encoded)['name'] == 'Café'
+    assert app.json.loads(encoded) == {'b': 1, 'a': [1, 2], '3': 'three', 'name': 'Café'}
+
+
+def test_unserializable_values_raise_type_error(app):
+    with pytest.raises(TypeError):
+        app.json.dumps_bytes({'value': object()})
+
+
+def test_response_is_json(app):
+    response = jsonify(success=True, due_date=date(2025, 4, 15))
+
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {'success': True, 'due_date': '2025-04-15'}
+
+
+def test_stream_plain_array(app):
+    response = app.json.stream({'id': n} for n in range(3))
+
+    assert response.mimetype == 'application/json'
+    assert json.loads(b''.join(body_of(response))) == [{'id': 0}, {'id': 1}, {'id': 2}]
+
+
+def test_stream_with_envelope(app):
+    response = app.json.stream(iter([{'id': 1}]), key='rfps', success=True, total=1)
+
+    assert json.loads(b''.join(body_of(response))) == {'success': True, 'total': 1, 'rfps': [{'id': 1}]}
+
+
+@pytest.mark.parametrize('key, envelope, expected', [
+    (None, {}, []),
+    ('rfps', {}, {'rfps': []}),
+    ('rfps', {'success': True}, {'success': True, 'rfps': []}),
+])
+def test_stream_empty_iterable(app, key, envelope, expected):
+    response = app.json.stream([], key=key, **envelope)
+
+    assert json.loads(b''.join(body_of(response))) == expected
+
+
+def test_stream_sends_items_in_chunks(app):
+    items = [{'id': n, 'due_date': date(2025, 1, n + 1)} for n in range(5)]
+
+    chunks = body_of(app.json.stream(items, key='rfps', chunk_size=2, success=True))
+
+    # Prefix, two full chunks, the remainder, suffix
+    assert len(chunks) == 5
+    assert json.loads(b''.join(chunks)) == {
+        'success': True,
+        'rfps': [{'id': n, 'due_date': f'2025-01-0{n + 1}'} for n in range(5)]
+    }
+
+
+def test_stream_consumes_items_lazily(app):
+    consumed = []
+
+    def rows():
+        for n in range(4):
+            consumed.append(n)
+            yield {'id': n}
+
+    chunks = iter(app.json.stream(rows(), chunk_size=2).response)
+    next(chunks)
+    assert consumed == []
+    next(chunks)
+    assert consumed == [0, 1]
@@ -0,0 +1,133 @@
+"""Knowledge article routes: tag validation, seeding and search sync between workers"""
+from datetime import timedelta
+
+import pytest
+
+import src.routes.knowledge as knowledge
+from src.models.knowledge import KnowledgeArticle
+from src.models.rfp import db
+from src.routes.knowledge import seed_articles
+from tests.conftest import create_app
+
+
+@pytest.fixture
+def other_worker(app, tmp_path, monkeypatch):
+    """Client for a second app on the same database, standing in for another gunicorn worker"""
+    # Check the table on every search instead of at most once a second
+    monkeypatch.setattr(knowledge, 'INDEX_SYNC_INTERVAL', 0)
+    other = create_app(str(tmp_path))
+    yield other.test_client()
+    with other.app_context():
+        db.engine.dispose()
+
+
+def search_ids(client, q):
+    response = client.get(f'/api/knowledge-base/search?q={q}')
+    assert response.status_code == 200
+    return [article['id'] for article in response.get_json()['articles']]
+
+
+def create_article(client, **fields):
+    response = client.post('/api/knowledge-base/articles', json=dict({'title': 'Untitled'}, **fields))
+    assert response.status_code == 201
+    return response.get_json()['article']['id']
+
+
+def test_search_sees_articles_created_by_another_worker(client, other_worker):
+    assert search_ids(other_worker, 'programmatic') == []
+
+    article_id = create_article(client, title='Programmatic buying')
+
+    assert search_ids(other_worker, 'programmatic') == [article_id]
+
+
+def test_search_sees_updates_from_another_worker(client, other_worker):
+    article_id = create_article(client, title='Programmatic buying')
+    assert search_ids(other_worker, 'programmatic') == [article_id]
+
+    response = client.put(f'/api/knowledge-base/articles/{article_id}', json={'title': 'Retail media'})
+    assert response.status_code == 200
+
+    assert search_ids(other_worker, 'programmatic') == []
+    assert search_ids(other_worker, 'retail') == [article_id]
+
+
+def test_search_sees_tag_only_updates_from_another_worker(client, other_worker):
+    article_id = create_article(client, title='Planning')
+    assert search_ids(other_worker, 'ctv') == []
+
+    client.put(f'/api/knowledge-base/articles/{article_id}', json={'tags': ['CTV']})
+
+    assert search_ids(other_worker, 'ctv') == [article_id]
+
+
+def test_search_drops_articles_deleted_by_another_worker(client, other_worker):
+    kept = create_article(client, title='Programmatic guide')
+    deleted = create_article(client, title='Programmatic checklist')
+    assert sorted(search_ids(other_worker, 'programmatic')) == [kept, deleted]
+
+    response = client.delete(f'/api/knowledge-base/articles/{deleted}')
+    assert response.status_code == 200
+
+    assert search_ids(other_worker, 'programmatic') == [kept]
+
+
+def test_search_sees_rows_committed_behind_the_watermark(app, client, other_worker):
+    create_article(client, title='Audience research')
+    search_ids(other_worker, 'audience')
+
+    # A transaction that stamped updated_at before the last sync but committed after it
+    newest = db.session.query(db.func.max(KnowledgeArticle.updated_at)).scalar()
+    late = KnowledgeArticle(title='Audience late', updated_at=newest - timedelta(seconds=2))
+    db.session.add(late)
+    db.session.commit()
+
+    assert late.id in search_ids(other_worker, 'audience')
+
+
+@pytest.mark.parametrize('tags', ['a, b', {'name': 'a'}, 'Digital'])
+def test_create_rejects_tags_that_are_not_a_list(client, tags):
+    response = client.post('/api/knowledge-base/articles', json={'title': 'Bad tags', 'tags': tags})
+
+    assert response.status_code == 400
+    assert KnowledgeArticle.query.count() == 0
+
+
+def test_update_rejects_tags_that_are_not_a_list(app, client):
+    article_id = create_article(client, title='Original', tags=['Digital'])
+
+    response = client.put(f'/api/knowledge-base/articles/{article_id}', json={'title': 'Changed', 'tags': 'Video'})
+
+    assert response.status_code == 400
+    db.session.expire_all()
+    article = db.session.get(KnowledgeArticle, article_id)
+    assert (article.title, article.tag_names) == ('Original', ['Digital'])
+
+
+def test_seed_articles_only_fills_an_empty_table(app):
+    samples = [
+        {'id': 7, 'title': 'Planning', 'tags': ['Digital'], 'views': 5, 'created_date': '2025-03-01'},
+        {'id': 8, 'title': 'Buying', 'created_at': '2025-02-15T14:20:00', 'updated_at': '2025-03-28T09:15:00'},
+    ]
+
+    assert seed_articles(samples) == 2
+    assert seed_articles(samples) == 0
+
+    articles = {article.title: article for article in KnowledgeArticle.query}
+    assert len(articles) == 2
+    assert articles['Planning'].tag_names == ['Digital']
+    assert articles['Planning'].views == 5
+    assert articles['Planning'].created_date.isoformat() == '2025-03-01T00:00:00'
+    assert articles['Buying'].updated_at.isoformat() == '2025-03-28T09:15:00'
+
+
+def test_wsgi_app_serves_seeded_articles_from_the_database():
+    from src.wsgi import app as wsgi_app
+
+    client = wsgi_app.test_client()
+    articles = client.get('/api/knowledge-base/articles').get_json()['articles']
+    stats = client.get('/api/dashboard/stats').get_json()
+
+    assert len(articles) == 3
+    assert stats['total_articles'] == 3
+    assert stats['total_views'] == sum(article['views'] for article in articles)
@@ -0,0 +1,125 @@
+"""Incremental mailbox ingestion into EmailRFP"""
+import os
+import time
+
+import pytest
+from sqlalchemy import event
+
+import src.mail_ingest as mail_ingest
+from src.mail_ingest import MboxSource, ingest
+from src.models.rfp import db, RFP, EmailDeadLetter, EmailRFP, MailboxWatermark
+
+
+def message(n, subject=None, body='Budget: $100K - $200K\n'):
+    return (
+        f'From sender{n}@example.com Mon Oct 12 09:00:00 2026\n'
+        f'From: Sender {n} <sender{n}@example.com>\n'
+        f'Subject: {subject or f"RFP: Campaign {n}"}\n'
+        f'Message-ID: <m{n}@example.com>\n'
+        f'Date: Mon, 12 Oct 2026 09:{n:02d}:00 +0000\n'
+        f'\n{body}\n'
+    )
+
+
+def write_mbox(path, *messages, settled=True):
+    with open(path, 'a') as f:
+        f.write(''.join(messages))
+    if settled:
+        old = time.time() - 60
+        os.utime(path, (old, old))
+
+
+@pytest.fixture
+def mbox(tmp_path):
+    return str(tmp_path / 'inbox.mbox')
+
+
+def test_ingests_and_imports_new_messages(app, mbox):
+    write_mbox(mbox, message(1), message(2, subject='Lunch'))
+
+    stats = ingest(MboxSource(mbox))
+
+    assert (stats['read'], stats['inserted'], stats['imported'], stats['failed']) == (2, 2, 1, 0)
+    assert RFP.query.one().budget_min == 100000
+    assert ingest(MboxSource(mbox))['read'] == 0
+
+
+def test_last_message_waits_until_the_file_settles(app, mbox):
+    write_mbox(mbox, message(1), message(2)[:80], settled=False)
+
+    stats = ingest(MboxSource(mbox))
+
+    # Only the message closed by the next "From " line is read
+    assert stats['read'] == 1
+    cursor = int(stats['watermark']['cursor'])
+    assert cursor == len(message(1))
+
+    write_mbox(mbox, message(2)[80:])
+    stats = ingest(MboxSource(mbox))
+
+    assert stats['read'] == 1
+    assert EmailRFP.query.filter_by(message_id='<m2@example.com>').one().body.startswith('Budget')
+
+
+def test_unparseable_message_is_dead_lettered(app, mbox, monkeypatch):
+    parse = mail_ingest.parse_message
+
+    def fragile_parse(raw):
+        if b'POISON' in raw:
+            raise ValueError('cannot parse header')
+        return parse(raw)
+
+    monkeypatch.setattr(mail_ingest, 'parse_message', fragile_parse)
+    write_mbox(mbox, message(1), message(2, body='POISON'), message(3))
+
+    stats = ingest(MboxSource(mbox), batch_size=2)
+
+    assert (stats['read'], stats['inserted'], stats['failed']) == (3, 2, 1)
+    letter = EmailDeadLetter.query.one()
+    assert letter.error == 'ValueError: cannot parse header'
+    assert b'POISON' in letter.raw
+    assert int(letter.cursor) == len(message(1)) + len(message(2, body='POISON'))
+    # The watermark moved past the bad message, so it is not retried
+    assert db.session.get(MailboxWatermark, MboxSource(mbox).name).cursor == str(os.path.getsize(mbox))
+    assert ingest(MboxSource(mbox))['read'] == 0
+
+
+def test_rejected_row_is_dead_lettered_without_losing_the_batch(app, mbox, monkeypatch):
+    row_from_email = mail_ingest.rfp_row_from_email
+
+    def broken_row(message):
+        row = row_from_email(message)
+        if 'Broken' in message['subject']:
+            row['name'] = None  # violates NOT NULL
+        return row
+
+    monkeypatch.setattr(mail_ingest, 'rfp_row_from_email', broken_row)
+    write_mbox(mbox, message(1), message(2, subject='RFP: Broken'), message(3))
+
+    stats = ingest(MboxSource(mbox))
+
+    assert (stats['inserted'], stats['imported'], stats['failed']) == (2, 2, 1)
+    assert {email.message_id for email in EmailRFP.query} == {'<m1@example.com>', '<m3@example.com>'}
+    assert EmailDeadLetter.query.one().message_id == '<m2@example.com>'
+
+
+def test_deleting_an_imported_rfp_with_foreign_keys_enforced(app, client, mbox):
+    def enforce_foreign_keys(connection, record):
+        connection.execute('PRAGMA foreign_keys=ON')
+
+    event.listen(db.engine, 'connect', enforce_foreign_keys)
+    db.session.remove()
+    db.engine.dispose()
+    try:
+        write_mbox(mbox, message(1))
+        ingest(MboxSource(mbox))
+        rfp_id = RFP.query.one().id
+
+        response = client.delete(f'/api/rfps/{rfp_id}')
+
+        assert response.status_code == 200, response.get_json()
+        email = EmailRFP.query.one()
+        assert email.rfp_id is None
+        assert email.processed
+    finally:
+        event.remove(db.engine, 'connect', enforce_foreign_keys)
@@ -0,0 +1,128 @@
+import sys
+import threading
+
+import pytest
+
+from src.memory_store import InMemoryStore
+
+
+def make_store():
+    return InMemoryStore(
+        [{'name': 'a', 'status': 'New'}, {'name': 'b', 'status': 'In Progress'}, {'name': 'c', 'status': 'New'}],
+        indexed_fields=('status',)
+    )
+
+
+def test_verify_is_empty_after_updates_and_deletes():
+    store = make_store()
+    store.update(1, {'status': 'Completed'})
+    store.delete(2)
+    store.add({'name': 'd', 'status': 'New'})
+
+    assert store.verify() == {}
+    assert store.count('status', 'New') == 2
+
+
+def test_verify_reports_records_changed_behind_the_store():
+    store = make_store()
+
+    # Editing a returned record in place skips reindexing
+    store.get(1)['status'] = 'Completed'
+
+    mismatches = store.verify()
+    assert set(mismatches) == {'index:status'}
+    maintained, recomputed = mismatches['index:status']
+    assert maintained['New'] == {1, 3}
+    assert recomputed['New'] == {3}
+    assert recomputed['Completed'] == {1}
+
+
+def test_ids_are_not_reused_after_a_delete():
+    store = make_store()
+    store.delete(3)
+
+    added = store.add({'name': 'd', 'status': 'New'})
+
+    assert added['id'] == 4
+    assert store.get(3) is None
+    assert 3 not in store
+
+
+def test_explicit_ids_move_allocation_past_them():
+    store = InMemoryStore()
+    store.add({'id': 10, 'name': 'seeded'})
+
+    assert store.add({'name': 'next'})['id'] == 11
+    with pytest.raises(KeyError):
+        store.add({'id': 10, 'name': 'duplicate'})
+
+
+def test_update_moves_the_record_between_index_values():
+    store = make_store()
+
+    store.update(1, {'status': 'Completed', 'id': 99})
+
+    assert store.get(1)['status'] == 'Completed'
+    assert store.get(1)['id'] == 1
+    assert store.count('status', 'New') == 1
+    assert store.count('status', 'Completed') == 1
+    assert store.update(42, {'status': 'New'}) is None
+
+
+def test_delete_removes_the_record_from_its_index():
+    store = make_store()
+
+    assert store.delete(2)['name'] == 'b'
+    assert store.delete(2) is None
+
+    assert store.count('status', 'In Progress') == 0
+    assert store.verify() == {}
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    """Switch threads as often as possible, so unlocked read-modify-writes would interleave"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def hammer(store, threads=8, per_thread=200):
+    """Add, re-status and delete records from several threads at once; returns the ids handed out"""
+    barrier = threading.Barrier(threads)
+    ids = [[] for _ in range(threads)]
+    errors = []
+
+    def work(n):
+        barrier.wait()
+        try:
+            for i in range(per_thread):
+                record = store.add({'name': f'{n}-{i}', 'status': 'New'})
+                ids[n].append(record['id'])
+                store.update(record['id'], {'status': ('In Progress', 'Completed')[i % 2]})
+                if i % 5 == 0:
+                    store.delete(record['id'])
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == []
+    return [record_id for thread_ids in ids for record_id in thread_ids]
+
+
+@pytest.mark.parametrize('attempt', range(10))
+def test_concurrent_adds_and_updates_keep_ids_and_indexes_consistent(frequent_thread_switches, attempt):
+    store = InMemoryStore(indexed_fields=('status',))
+
+    ids = hammer(store)
+
+    assert sorted(ids) == list(range(1, 1601))
+    assert len(store) == 1280
+    assert store.count('status', 'New') == 0
+    assert store.count('status', 'In Progress') + store.count('status', 'Completed') == len(store)
+    assert store.verify() == {}
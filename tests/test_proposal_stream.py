@@ -0,0 +1,65 @@
+"""GET /api/rfps/<id>/generate-proposal/stream in the demo app"""
+import json
+
+import pytest
+
+import src.main_backup as backup
+from src.result_cache import ResultCache
+
+
+@pytest.fixture
+def client():
+    original = dict(backup.rfps_db[1])
+    backup.ai_cache = ResultCache(max_entries=64)
+    backup.rfps_db[1] = dict(original, analysis=None, proposal=None, quality_check=None)
+    yield backup.app.test_client()
+    backup.rfps_db[1] = original
+
+
+def events(response):
+    """Parse an SSE body into ``[(event, data), ...]``"""
+    parsed = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines())
+        parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+def test_stream_emits_each_section_then_the_proposal(client):
+    response = client.get('/api/rfps/1/generate-proposal/stream')
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    stream = events(response)
+    names = [name for name, _ in stream]
+    assert names == ['status', 'start'] + ['section'] * len(backup.PROPOSAL_SECTIONS) + ['done']
+    assert stream[1][1]['sections'] == backup.PROPOSAL_SECTIONS
+    assert [data['key'] for name, data in stream if name == 'section'] == backup.PROPOSAL_SECTIONS
+    assert stream[-1][1] == backup.rfps_db[1]['proposal']
+
+
+def test_cached_proposal_is_replayed_through_the_same_events(client):
+    first = events(client.get('/api/rfps/1/generate-proposal/stream'))
+    second = events(client.get('/api/rfps/1/generate-proposal/stream'))
+
+    # The analysis is stored by the first stream, so no status event
+    assert [name for name, _ in second] == [name for name, _ in first][1:]
+    assert second[-1][1] == first[-1][1]
+    assert backup.ai_cache.stats()['hits'] >= 1
+
+
+def test_stream_reports_failures_as_an_event(client, monkeypatch):
+    def broken_sections(rfp_data, analysis):
+        yield 'executive_summary', {'title': 'Executive Summary', 'content': '...'}
+        raise RuntimeError('generator crashed')
+
+    monkeypatch.setattr(backup, 'simulated_proposal_sections', broken_sections)
+    stream = events(client.get('/api/rfps/1/generate-proposal/stream'))
+
+    assert [name for name, _ in stream][-2:] == ['section', 'failed']
+    assert stream[-1][1] == {'error': 'generator crashed'}
+    assert backup.rfps_db[1]['proposal'] is None
+
+
+def test_unknown_rfp_is_404(client):
+    assert client.get('/api/rfps/999/generate-proposal/stream').status_code == 404
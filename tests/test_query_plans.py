@@ -0,0 +1,79 @@
+"""EXPLAIN QUERY PLAN regression checks: blueprint queries must not fall back to full table scans"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from src.models.rfp import db, EmailRFP
+from tests.conftest import make_rfps
+
+# A plan step reading a whole table without an index, e.g. "SCAN rfps"
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+
+@pytest.fixture
+def plans(app, fts_index):
+    """Run a request and return (sql, plan steps) for every query it issued"""
+    make_rfps(60)
+    start = datetime(2025, 1, 1)
+    db.session.add_all([
+        EmailRFP(subject=f'RFP {n}', sender='agency@example.com', received_date=start + timedelta(hours=n),
+                 processed=n % 4 == 0)
+        for n in range(60)
+    ])
+    db.session.commit()
+    client = app.test_client()
+
+    def run(method, url, json=None):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            # UPDATE and DELETE filter rows too, e.g. the email claim's UPDATE ... WHERE id IN (SELECT ...)
+            if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')) and not executemany:
+                statements.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = client.open(url, method=method, json=json)
+            response.get_data()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        assert response.status_code < 400, response.get_data(as_text=True)
+
+        with db.engine.connect() as conn:
+            return [
+                (statement, [row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)])
+                for statement, parameters in statements
+            ]
+
+    return run
+
+
+@pytest.mark.parametrize('method, url, body, full_scans_allowed', [
+    ('GET', '/api/rfps', None, ()),
+    ('GET', '/api/rfps?status=New', None, ()),
+    ('GET', '/api/rfps?view=summary&page=2', None, ()),
+    ('GET', '/api/rfps?min_budget=150000', None, ()),
+    ('GET', '/api/rfps?max_budget=150000', None, ()),
+    ('GET', '/api/rfps?cursor=', None, ()),
+    ('GET', '/api/rfps?search=campaign', None, ()),
+    ('GET', '/api/rfps?search=agency%201&status=New&page=2&per_page=5', None, ()),
+    ('GET', '/api/rfps?cursor=&status=In%20Progress&include_total=true', None, ()),
+    ('GET', '/api/rfps/7', None, ()),
+    ('GET', '/api/dashboard/stats', None, ()),
+    ('GET', '/api/emails/rfps', None, ()),
+    ('POST', '/api/emails/claims', {'limit': 5}, ()),
+    ('DELETE', '/api/emails/claims/unknown-token', None, ()),
+    ('POST', '/api/rfps/7/analyze', None, ()),
+    ('POST', '/api/rfps/batch-actions', {'rfp_ids': [1, 5, 9], 'stages': ['analyze']}, ()),
+    # Exports read every row by design, in primary key order
+    ('GET', '/api/rfps/export', None, ('rfps',)),
+])
+def test_no_full_table_scans(plans, method, url, body, full_scans_allowed):
+    results = plans(method, url, json=body)
+    assert results
+    for statement, steps in results:
+        for step in steps:
+            match = FULL_SCAN.match(step)
+            assert not match or match.group(1) in full_scans_allowed, f'{step}\n{statement}'
@@ -0,0 +1,99 @@
+"""Attachment blobs are shared by content hash and removed once unreferenced"""
+import io
+import os
+import threading
+
+import pytest
+
+from src.blob_store import BlobWriter
+from src.models.rfp import db
+from tests.conftest import make_rfps
+
+
+def upload(client, rfp_id, data, filename='brief.txt'):
+    return client.post(f'/api/rfps/{rfp_id}/attachments',
+                       data={'file': (io.BytesIO(data), filename)}, content_type='multipart/form-data')
+
+
+def blob_files(app):
+    root = app.config['ATTACHMENT_STORAGE_DIR']
+    return sorted(
+        name for folder in os.listdir(root) if len(folder) == 2
+        for name in os.listdir(os.path.join(root, folder))
+    )
+
+
+@pytest.fixture
+def rfp_id(app):
+    return make_rfps(1, attachments=0)[0]
+
+
+def test_identical_uploads_share_one_blob(client, app, rfp_id):
+    first = upload(client, rfp_id, b'same bytes').get_json()
+    second = upload(client, rfp_id, b'same bytes', 'copy.txt').get_json()
+
+    assert second['deduplicated'] == ['copy.txt']
+    assert len(blob_files(app)) == 1
+
+    client.delete(f"/api/rfps/{rfp_id}/attachments/{first['attachments'][0]['id']}")
+    assert len(blob_files(app)) == 1
+    client.delete(f"/api/rfps/{rfp_id}/attachments/{second['attachments'][0]['id']}")
+    assert blob_files(app) == []
+
+
+def test_delete_waits_for_an_upload_reusing_the_blob(client, app, rfp_id, monkeypatch):
+    existing = upload(client, rfp_id, b'shared pdf').get_json()['attachments'][0]
+    found_blob, finish_upload = threading.Event(), threading.Event()
+    commit = BlobWriter.commit
+
+    def paused_commit(writer):
+        result = commit(writer)
+        found_blob.set()
+        finish_upload.wait(5)
+        return result
+
+    monkeypatch.setattr(BlobWriter, 'commit', paused_commit)
+    responses = {}
+    uploader = threading.Thread(
+        target=lambda: responses.update(upload=upload(app.test_client(), rfp_id, b'shared pdf', 'again.txt'))
+    )
+    deleter = threading.Thread(
+        target=lambda: responses.update(delete=app.test_client().delete(
+            f"/api/rfps/{rfp_id}/attachments/{existing['id']}"))
+    )
+    uploader.start()
+    assert found_blob.wait(5)
+    # The upload has found the blob but not committed its row yet
+    deleter.start()
+    deleter.join(0.3)
+    assert deleter.is_alive()
+
+    finish_upload.set()
+    uploader.join(5)
+    deleter.join(5)
+
+    assert responses['upload'].status_code == 201
+    assert responses['delete'].status_code == 200
+    new_id = responses['upload'].get_json()['attachments'][0]['id']
+    download = client.get(f'/api/rfps/{rfp_id}/attachments/{new_id}/download')
+    assert download.status_code == 200
+    assert download.data == b'shared pdf'
+
+
+def test_failed_commit_removes_only_new_blobs(client, app, rfp_id, monkeypatch):
+    upload(client, rfp_id, b'already stored')
+    blobs = blob_files(app)
+
+    def failing_commit():
+        raise RuntimeError('database is locked')
+
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+    response = client.post(f'/api/rfps/{rfp_id}/attachments', data={'file': [
+        (io.BytesIO(b'already stored'), 'old.txt'),
+        (io.BytesIO(b'brand new'), 'new.txt'),
+    ]}, content_type='multipart/form-data')
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert blob_files(app) == blobs
+    assert os.listdir(os.path.join(app.config['ATTACHMENT_STORAGE_DIR'], 'tmp')) == []
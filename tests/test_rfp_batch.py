@@ -0,0 +1,66 @@
+"""POST /rfps/batch-actions runs AI stages over many RFPs and streams NDJSON results"""
+import json
+
+import pytest
+
+from tests.conftest import make_rfps
+
+
+def run_batch(client, body):
+    response = client.post('/api/rfps/batch-actions', json=body)
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return response, lines
+
+
+def test_streams_one_line_per_rfp_and_stage(client, count_queries):
+    ids = make_rfps(6)
+
+    with count_queries() as queries:
+        response, lines = run_batch(client, {'rfp_ids': ids, 'stages': ['analyze', 'quality-check']})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    results, summary = lines[:-1], lines[-1]
+    assert {(line['rfp_id'], line['stage']) for line in results} == {
+        (rfp_id, stage) for rfp_id in ids for stage in ('analyze', 'quality-check')
+    }
+    assert all(line['success'] for line in results)
+    assert summary['done'] and summary['succeeded'] == 12 and summary['failed'] == 0
+    # The RFPs and their team members are loaded once for the whole batch
+    assert queries.count <= 2
+
+
+def test_unknown_ids_are_reported_per_item(client):
+    ids = make_rfps(1)
+
+    _, lines = run_batch(client, {'rfp_ids': ids + [999]})
+
+    assert {'rfp_id': 999, 'success': False, 'error': 'RFP not found'} in lines
+    assert lines[-1]['succeeded'] == 1 and lines[-1]['failed'] == 1
+
+
+def test_duplicate_stages_run_once(client):
+    ids = make_rfps(1)
+
+    _, lines = run_batch(client, {'rfp_ids': ids, 'stages': ['analyze', 'analyze']})
+
+    assert lines[-1]['succeeded'] == 1
+
+
+@pytest.mark.parametrize('body, error', [
+    ({}, 'rfp_ids'),
+    ({'rfp_ids': []}, 'rfp_ids'),
+    ({'rfp_ids': [True]}, 'rfp_ids'),
+    ({'rfp_ids': [1, '2']}, 'rfp_ids'),
+    ({'rfp_ids': [1], 'stages': 'analyze'}, 'stages'),
+    ({'rfp_ids': [1], 'stages': []}, 'stages'),
+    ({'rfp_ids': [1], 'stages': {'analyze': True}}, 'stages'),
+    ({'rfp_ids': [1], 'stages': [['analyze']]}, 'stages'),
+    ({'rfp_ids': [1], 'stages': ['summarize']}, 'Unknown stages: summarize'),
+    ({'rfp_ids': [1], 'max_workers': 'many'}, 'max_workers'),
+])
+def test_invalid_requests_are_rejected(client, body, error):
+    response = client.post('/api/rfps/batch-actions', json=body)
+
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
@@ -0,0 +1,122 @@
+"""POST /rfps/bulk creates many RFPs from a JSON array or an NDJSON stream"""
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+import requests
+
+import src.routes.rfp as rfp_routes
+from src.models.rfp import RFP, RFPTeamMember
+from src.routes.rfp import _iter_lines
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def record(n, **overrides):
+    return dict({
+        'name': f'Bulk {n}',
+        'agency_name': 'Agency',
+        'campaign_type': 'Digital Media',
+        'budget_range': '$100K - $200K',
+        'due_date': '2026-01-31',
+        'team_members': [{'name': f'Member {n}', 'role': 'Planner'}],
+    }, **overrides)
+
+
+def ndjson(records):
+    return ''.join(json.dumps(r) + '\n' for r in records).encode()
+
+
+def test_iter_lines_splits_lines_across_reads():
+    body = b'{"a": 1}\n\n{"b": "' + b'x' * 50 + b'"}\n{"c": 3}'
+    lines = list(_iter_lines(io.BytesIO(body), 7))
+
+    assert lines == [b'{"a": 1}', b'', b'{"b": "' + b'x' * 50 + b'"}', b'{"c": 3}']
+
+
+def test_json_array_body(client):
+    response = client.post('/api/rfps/bulk', json=[record(n) for n in range(3)])
+
+    assert response.status_code == 201
+    assert response.get_json()['inserted'] == 3
+    assert RFPTeamMember.query.count() == 3
+
+
+def test_ndjson_body_in_small_reads_and_chunks(client, monkeypatch):
+    monkeypatch.setattr(rfp_routes, 'BULK_READ_SIZE', 16)
+    records = [record(n) for n in range(25)]
+    records[4] = record(4, due_date='not a date')
+
+    response = client.post('/api/rfps/bulk?chunk_size=10', data=ndjson(records) + b'{broken\n',
+                           content_type='application/x-ndjson')
+
+    body = response.get_json()
+    assert response.status_code == 201
+    assert body['received'] == 26
+    assert body['inserted'] == 24
+    assert [error['index'] for error in body['errors']] == [4, 25]
+    assert body['errors'][1]['error'].startswith('Invalid JSON')
+    assert RFP.query.count() == 24
+    assert RFP.query.filter_by(name='Bulk 24').one().budget_min == 100000
+
+
+def test_json_body_must_be_an_array(client):
+    response = client.post('/api/rfps/bulk', json={'name': 'x'})
+
+    assert response.status_code == 400
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def gunicorn_url(tmp_path):
+    pytest.importorskip('gunicorn')
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', '1',
+         f'tests.conftest:create_app({str(tmp_path)!r})'],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        for _ in range(100):
+            try:
+                requests.get(f'{url}/api/rfps', timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        else:
+            pytest.fail('gunicorn did not start')
+        yield url
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_ndjson_import_under_gunicorn(gunicorn_url, chunked):
+    body = ndjson(record(n) for n in range(1200))
+    if chunked:
+        # A generator body is sent with Transfer-Encoding: chunked
+        data = (body[i:i + 1000] for i in range(0, len(body), 1000))
+    else:
+        data = body
+
+    response = requests.post(f'{gunicorn_url}/api/rfps/bulk', data=data,
+                             headers={'Content-Type': 'application/x-ndjson'}, timeout=30)
+
+    assert response.status_code == 201, response.text
+    assert response.json()['inserted'] == 1200
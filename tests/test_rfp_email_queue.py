@@ -0,0 +1,68 @@
+"""Sample data, the email import queue and importing an email as an RFP"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.rfp import db, RFP, RFPTeamMember, EmailRFP
+
+
+def add_emails(count):
+    start = datetime(2026, 10, 1)
+    emails = [
+        EmailRFP(message_id=f'<m{n}@example.com>', subject=f'RFP {n}', sender='Agency',
+                 received_date=start + timedelta(hours=n), attachment_count=0, processed=False)
+        for n in range(count)
+    ]
+    db.session.add_all(emails)
+    db.session.commit()
+    return [email.id for email in emails]
+
+
+def test_sample_data_replaces_existing_rfps(client):
+    assert client.post('/api/rfps/sample-data').status_code == 200
+    created = RFP.query.count()
+    response = client.post('/api/rfps/sample-data')
+
+    assert response.status_code == 200
+    assert response.get_json()['message'] == f'Created {created} sample RFPs successfully'
+    assert RFP.query.count() == created
+    assert RFPTeamMember.query.count() > 0
+
+
+def test_sample_data_unlinks_imported_emails(client):
+    email_id = add_emails(1)[0]
+    client.post('/api/rfps/import', json={'import_method': 'email', 'email_id': email_id})
+
+    assert client.post('/api/rfps/sample-data').status_code == 200
+    assert db.session.get(EmailRFP, email_id).rfp_id is None
+
+
+def test_email_is_imported_once(client):
+    email_id = add_emails(1)[0]
+
+    first = client.post('/api/rfps/import', json={'import_method': 'email', 'email_id': email_id})
+    second = client.post('/api/rfps/import', json={'import_method': 'email', 'email_id': email_id})
+
+    assert first.status_code == 201
+    assert second.status_code == 409
+    assert RFP.query.count() == 1
+    db.session.expire_all()
+    assert db.session.get(EmailRFP, email_id).rfp_id == first.get_json()['rfp']['id']
+
+
+@pytest.mark.parametrize('per_page, expected', [(2, 2), (0, 1), (-5, 1), (1000, 5)])
+def test_email_page_size_is_clamped(client, per_page, expected):
+    add_emails(5)
+
+    response = client.get(f'/api/emails/rfps?per_page={per_page}')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['emails']) == expected
+
+
+def test_claim_limit_is_clamped(client):
+    add_emails(3)
+
+    response = client.post('/api/emails/claims', json={'limit': -1})
+
+    assert len(response.get_json()['emails']) == 1
@@ -0,0 +1,63 @@
+"""GET /rfps/export streams every matching RFP as NDJSON or CSV"""
+import csv
+import io
+import json
+
+import src.routes.rfp as rfp_routes
+from tests.conftest import make_rfps
+
+
+def test_ndjson_export_streams_every_row_in_id_order(client):
+    ids = make_rfps(7, members=2, attachments=1)
+
+    response = client.get('/api/rfps/export')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'].startswith('attachment; filename="rfps-')
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['id'] for row in rows] == ids
+    assert len(rows[0]['team_members']) == 2
+    assert rows[0]['attachments'][0]['filename'] == 'doc0.pdf'
+
+
+def test_csv_export_flattens_children(client):
+    make_rfps(3, members=2, attachments=2)
+
+    response = client.get('/api/rfps/export?format=csv&fields=id,name,team_members,attachments')
+
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 3
+    assert list(rows[0]) == ['id', 'name', 'team_members', 'attachments']
+    assert rows[0]['team_members'].startswith('Member 0 (Planner)')
+    assert rows[0]['team_members'].count('; ') == 1
+    assert rows[0]['attachments'] == 'doc0.pdf; doc1.pdf'
+
+
+def test_export_applies_filters(client):
+    make_rfps(9)
+
+    response = client.get('/api/rfps/export?status=Completed')
+
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == 3
+    assert {row['status'] for row in rows} == {'Completed'}
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get('/api/rfps/export?format=xml').status_code == 400
+
+
+def test_export_streams_in_partitions(client, count_queries, monkeypatch):
+    monkeypatch.setattr(rfp_routes, 'EXPORT_BATCH_SIZE', 4)
+    make_rfps(10, members=2, attachments=2)
+
+    with count_queries() as queries:
+        response = client.get('/api/rfps/export')
+        chunks = list(response.response)
+
+    # The first row goes out alone, then one chunk per full batch and the remainder
+    assert [chunk.count(b'\n') for chunk in chunks] == [1, 4, 4, 1]
+    # The RFP query plus one SELECT per child collection per partition
+    assert queries.count == 1 + 2 * 3
@@ -0,0 +1,164 @@
+"""Background extraction of attachment text into RFP.extracted_content"""
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import src.routes.rfp as rfp_routes
+from src.extraction import extract_text
+from src.models.rfp import RFP, RFPAttachment, db
+from tests.conftest import make_rfps
+
+
+def pdf_with_text(text):
+    """Smallest PDF with one page showing ``text``"""
+    stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode()
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R'
+        b' /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    out = io.BytesIO(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b'%010d 00000 n \n' % offset)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+class FakeExtraction:
+    """Extraction service answering from a dict of filename-keyed results"""
+
+    def __init__(self, results):
+        self.results = results
+
+    def extract(self, path, sha256, file_type):
+        future = Future()
+        result = self.results[open(path, 'rb').read()]
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+        return future
+
+
+@pytest.fixture
+def run_now(app, monkeypatch):
+    """Run queued extraction jobs synchronously"""
+    monkeypatch.setattr(rfp_routes, '_queue_content_extraction',
+                        lambda rfp_id: rfp_routes._extract_rfp_content(app, rfp_id))
+
+
+def upload(client, rfp_id, data, filename='brief.pdf'):
+    return client.post(f'/api/rfps/{rfp_id}/attachments', data={
+        'file': (io.BytesIO(data), filename), 'is_primary': 'true'
+    }, content_type='multipart/form-data')
+
+
+def reload(rfp_id):
+    # The job committed through its own session
+    db.session.expire_all()
+    return db.session.get(RFP, rfp_id)
+
+
+def test_extract_text_reads_pdf_pages(tmp_path):
+    pytest.importorskip('pypdf')
+    path = tmp_path / 'blob'
+    path.write_bytes(pdf_with_text('Deliver 10M impressions'))
+
+    result = extract_text(str(path), 'pdf')
+
+    assert result['text'] == '[Page 1]\nDeliver 10M impressions\n'
+
+
+def test_extract_text_passes_an_open_file_to_pypdf(tmp_path, monkeypatch):
+    pypdf = pytest.importorskip('pypdf')
+    path = tmp_path / 'blob'
+    path.write_bytes(pdf_with_text('x'))
+    seen = []
+    reader = pypdf.PdfReader
+    monkeypatch.setattr(pypdf, 'PdfReader', lambda stream: seen.append(stream) or reader(stream))
+
+    extract_text(str(path), 'pdf')
+
+    assert hasattr(seen[0], 'read') and seen[0].closed
+
+
+def test_pdf_upload_fills_empty_content(client, app, run_now):
+    pytest.importorskip('pypdf')
+    rfp_id = make_rfps(1, attachments=0, content='')[0]
+    try:
+        assert upload(client, rfp_id, pdf_with_text('Q3 launch brief')).status_code == 201
+    finally:
+        app.extensions['rfp_extraction'].shutdown()
+
+    rfp = reload(rfp_id)
+    assert rfp.extraction_status == 'completed'
+    assert 'Q3 launch brief' in rfp.extracted_content
+    assert rfp.content == rfp.extracted_content
+
+
+def test_user_content_is_not_replaced(client, app, run_now):
+    rfp_id = make_rfps(1, attachments=0, content='Written by the account team')[0]
+    app.extensions['rfp_extraction'] = FakeExtraction({
+        b'v1': {'text': 'Extracted v1', 'chars': 12, 'truncated': False},
+    })
+
+    upload(client, rfp_id, b'v1')
+
+    rfp = reload(rfp_id)
+    assert rfp.content == 'Written by the account team'
+    assert rfp.extracted_content == '=== brief.pdf ===\nExtracted v1'
+
+
+def test_reextraction_refreshes_content_it_filled(client, app, run_now):
+    rfp_id = make_rfps(1, attachments=0, content='')[0]
+    app.extensions['rfp_extraction'] = FakeExtraction({
+        b'v1': {'text': 'Extracted v1', 'chars': 12, 'truncated': False},
+        b'v2': {'text': 'Extracted v2', 'chars': 12, 'truncated': False},
+    })
+
+    upload(client, rfp_id, b'v1')
+    db.session.delete(RFPAttachment.query.filter_by(rfp_id=rfp_id).one())
+    db.session.commit()
+    upload(client, rfp_id, b'v2', 'brief-v2.pdf')
+
+    rfp = reload(rfp_id)
+    assert rfp.content == rfp.extracted_content == '=== brief-v2.pdf ===\nExtracted v2'
+
+
+def test_broken_pool_is_recorded_and_session_removed(client, app, run_now, monkeypatch):
+    rfp_id = make_rfps(1, attachments=0, content='')[0]
+    app.extensions['rfp_extraction'] = FakeExtraction({b'pdf': BrokenProcessPool('worker died')})
+    removed = []
+    remove = db.session.remove
+    monkeypatch.setattr(db.session, 'remove', lambda: removed.append(True) or remove())
+
+    assert upload(client, rfp_id, b'pdf').status_code == 201
+
+    assert removed
+    rfp = reload(rfp_id)
+    assert rfp.extraction_status == 'failed'
+    assert rfp.extraction_error == 'BrokenProcessPool: worker died'
+    assert rfp.content == ''
+
+
+def test_unparseable_documents_mark_extraction_failed(client, app, run_now):
+    rfp_id = make_rfps(1, attachments=0, content='')[0]
+    app.extensions['rfp_extraction'] = FakeExtraction({b'bad': {'error': 'PdfStreamError: truncated'}})
+
+    upload(client, rfp_id, b'bad')
+
+    rfp = reload(rfp_id)
+    assert rfp.extraction_status == 'failed'
+    assert rfp.extraction_error == 'brief.pdf: PdfStreamError: truncated'
+    assert rfp.extracted_content is None
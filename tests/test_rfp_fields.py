@@ -0,0 +1,98 @@
+"""Sparse fieldsets (``fields=``/``view=summary``) and the shape of the full RFP payload"""
+import pytest
+
+from src.models.rfp import RFP
+from tests.conftest import make_rfps
+
+FULL_KEYS = {
+    'id', 'name', 'agency_name', 'advertiser_client_name', 'campaign_type',
+    'budget_range', 'budget_min', 'budget_max', 'due_date', 'status',
+    'completion_percentage', 'content', 'ai_processing_enabled',
+    'extracted_content', 'extraction_status', 'extraction_error',
+    'created_at', 'updated_at', 'submitted_date', 'team_members', 'attachments'
+}
+SUMMARY_KEYS = {
+    'id', 'name', 'agency_name', 'advertiser_client_name', 'campaign_type',
+    'budget_range', 'due_date', 'status', 'completion_percentage'
+}
+
+
+def list_rfps(client, query=''):
+    response = client.get(f'/api/rfps?{query}')
+    assert response.status_code == 200
+    return response.get_json()['rfps']
+
+
+def get_rfp(client, rfp_id, query=''):
+    response = client.get(f'/api/rfps/{rfp_id}?{query}')
+    assert response.status_code == 200
+    return response.get_json()['rfp']
+
+
+def test_field_constants_match_the_documented_payloads():
+    assert set(RFP.FIELDS) == FULL_KEYS
+    assert set(RFP.SUMMARY_FIELDS) == SUMMARY_KEYS
+
+
+def test_full_payload_shape(app, client):
+    rfp_id = make_rfps(1)[0]
+
+    detail = get_rfp(client, rfp_id)
+    listed = list_rfps(client)
+
+    assert set(detail) == FULL_KEYS
+    assert [set(rfp) for rfp in listed] == [FULL_KEYS]
+    assert listed[0] == detail
+    assert set(detail['team_members'][0]) == {'id', 'name', 'role', 'email'}
+    assert set(detail['attachments'][0]) == {
+        'id', 'filename', 'file_type', 'size_bytes', 'sha256', 'is_primary', 'uploaded_at'
+    }
+
+
+def test_summary_payload_shape(app, client):
+    rfp_id = make_rfps(3)[0]
+
+    full = get_rfp(client, rfp_id)
+    summary = get_rfp(client, rfp_id, 'view=summary')
+    listed = list_rfps(client, 'view=summary')
+
+    assert set(summary) == SUMMARY_KEYS
+    assert summary == {key: full[key] for key in SUMMARY_KEYS}
+    assert [set(rfp) for rfp in listed] == [SUMMARY_KEYS] * 3
+
+
+@pytest.mark.parametrize('fields, expected', [
+    ('name,status', ['id', 'name', 'status']),
+    ('id,name', ['id', 'name']),
+    ('status, name ,', ['id', 'status', 'name']),
+    ('budget_min,team_members,attachments', ['id', 'budget_min', 'team_members', 'attachments']),
+])
+def test_fields_returns_exactly_the_requested_keys(app, client, fields, expected):
+    rfp_id = make_rfps(2)[0]
+    full = get_rfp(client, rfp_id)
+
+    detail = get_rfp(client, rfp_id, f'fields={fields}')
+    listed = list_rfps(client, f'fields={fields}')
+
+    assert set(detail) == set(expected)
+    assert detail == {key: full[key] for key in expected}
+    assert [set(rfp) for rfp in listed] == [set(expected)] * 2
+
+
+def test_fields_applies_to_cursor_pages(app, client):
+    make_rfps(3)
+
+    response = client.get('/api/rfps?cursor=&per_page=2&fields=name')
+
+    assert response.status_code == 200
+    assert [set(rfp) for rfp in response.get_json()['rfps']] == [{'id', 'name'}] * 2
+
+
+@pytest.mark.parametrize('url', ['/api/rfps', '/api/rfps/{id}', '/api/dashboard/stats'])
+def test_unknown_field_is_rejected(app, client, url):
+    rfp_id = make_rfps(1)[0]
+
+    response = client.get(url.format(id=rfp_id) + '?fields=name,password,secret')
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Unknown fields: password, secret'}
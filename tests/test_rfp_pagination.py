@@ -0,0 +1,53 @@
+import pytest
+
+from src.models.rfp import db, RFP
+from src.models.migrations import backfill_updated_at
+from tests.conftest import make_rfps
+
+
+def _pages(client, url):
+    """Follow next_cursor from the first page; returns the ids of every page"""
+    pages, cursor = [], ''
+    while cursor is not None:
+        body = client.get(f'{url}&cursor={cursor}').get_json()
+        assert body['success'], body
+        pages.append([rfp['id'] for rfp in body['rfps']])
+        cursor = body['next_cursor']
+    return pages
+
+
+def test_cursor_pages_cover_every_rfp_once(client):
+    ids = make_rfps(23, members=0, attachments=0)
+
+    pages = _pages(client, '/api/rfps?per_page=5')
+
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert sorted(sum(pages, [])) == sorted(ids)
+
+
+@pytest.mark.parametrize('per_page, expected', [(0, 1), (-5, 1), (1000, 100)])
+def test_per_page_is_clamped(client, per_page, expected):
+    make_rfps(120, members=0, attachments=0)
+
+    for url in (f'/api/rfps?per_page={per_page}', f'/api/rfps?cursor=&per_page={per_page}'):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.get_json()['rfps']) == expected
+
+
+def test_cursor_skips_rows_without_updated_at(client):
+    ids = make_rfps(4, members=0, attachments=0)
+    db.session.execute(db.update(RFP).where(RFP.id == ids[0]).values(updated_at=None))
+    db.session.commit()
+
+    pages = _pages(client, '/api/rfps?per_page=2')
+    assert sorted(sum(pages, [])) == ids[1:]
+
+    backfill_updated_at()
+    pages = _pages(client, '/api/rfps?per_page=2')
+    assert sorted(sum(pages, [])) == ids
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get('/api/rfps?cursor=not-a-cursor')
+    assert response.status_code == 400
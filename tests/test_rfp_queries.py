@@ -0,0 +1,64 @@
+"""The list, detail and dashboard endpoints load child collections in a fixed number of queries"""
+import pytest
+
+from tests.conftest import make_rfps
+
+
+@pytest.mark.parametrize('rfp_count, children', [(3, 1), (10, 2), (25, 6)])
+def test_list_query_count_is_independent_of_page_and_children(client, count_queries, rfp_count, children):
+    make_rfps(rfp_count, members=children, attachments=children)
+
+    with count_queries() as queries:
+        response = client.get('/api/rfps?per_page=10')
+
+    assert response.status_code == 200
+    rfps = response.get_json()['rfps']
+    assert len(rfps) == min(rfp_count, 10)
+    assert all(len(rfp['team_members']) == children and len(rfp['attachments']) == children for rfp in rfps)
+    # COUNT(*) for the total, the page, then one SELECT per child collection
+    assert queries.count == 4
+
+
+def test_cursor_page_query_count(client, count_queries):
+    make_rfps(30, members=3, attachments=3)
+
+    with count_queries() as queries:
+        response = client.get('/api/rfps?cursor=&per_page=20')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['rfps']) == 20
+    assert queries.count == 3
+
+
+def test_detail_query_count(client, count_queries):
+    rfp_id = make_rfps(1, members=5, attachments=4)[0]
+
+    with count_queries() as queries:
+        response = client.get(f'/api/rfps/{rfp_id}')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['rfp']['attachments']) == 4
+    assert queries.count == 3
+
+
+def test_dashboard_query_count(client, count_queries):
+    make_rfps(12, members=3, attachments=2)
+
+    with count_queries() as queries:
+        response = client.get('/api/dashboard/stats')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['recent_rfps']) == 4
+    # One aggregate for the stats, then the recent RFPs and their two collections
+    assert queries.count == 4
+
+
+def test_summary_view_skips_child_collections(client, count_queries):
+    make_rfps(10)
+
+    with count_queries() as queries:
+        response = client.get('/api/rfps?view=summary')
+
+    assert response.status_code == 200
+    assert 'team_members' not in response.get_json()['rfps'][0]
+    assert queries.count == 2
@@ -0,0 +1,119 @@
+"""RFP search through the SQLite FTS5 index and the LIKE fallback"""
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.models.migrations import install_search_index
+from src.models.rfp import db, RFP
+from src.models.search import LikeSearchBackend, SQLiteFTS5Backend, get_search_backend
+from tests.conftest import make_rfps
+
+
+def search(client, term, **params):
+    query = '&'.join(f'{key}={value}' for key, value in dict(params, search=term).items())
+    body = client.get(f'/api/rfps?{query}').get_json()
+    assert body['success'], body
+    return body
+
+
+def search_names(client, term, **params):
+    return [rfp['name'] for rfp in search(client, term, **params)['rfps']]
+
+
+def test_installed_index_is_used(fts_index):
+    assert isinstance(get_search_backend(), SQLiteFTS5Backend)
+
+
+def test_without_the_index_search_falls_back_to_like(app):
+    assert isinstance(get_search_backend(), LikeSearchBackend)
+
+
+def test_install_falls_back_when_fts5_is_missing(app, monkeypatch):
+    def no_fts5(self):
+        raise OperationalError('CREATE VIRTUAL TABLE', {}, Exception('no such module: fts5'))
+    monkeypatch.setattr(SQLiteFTS5Backend, 'install', no_fts5)
+
+    install_search_index()
+
+    assert isinstance(get_search_backend(), LikeSearchBackend)
+
+
+def test_prefix_matching(client, fts_index):
+    make_rfps(1, members=0, attachments=0, name='Programmatic video launch')
+    make_rfps(1, members=0, attachments=0, name='Retail promotion')
+
+    assert search_names(client, 'progr') == ['Programmatic video launch']
+    # Every word must match; the last one may still be incomplete
+    assert search_names(client, 'video progr') == ['Programmatic video launch']
+    assert search_names(client, 'video retail') == []
+    # Punctuation alone leaves nothing to match
+    assert search_names(client, '%22*') == []
+
+
+def test_rows_existing_before_install_are_indexed(client):
+    make_rfps(1, members=0, attachments=0, name='Holiday campaign')
+
+    install_search_index()
+
+    assert search_names(client, 'holiday') == ['Holiday campaign']
+
+
+def test_bm25_ranks_name_hits_first_across_pages(client, fts_index):
+    make_rfps(3, members=0, attachments=0, name='Quarterly plan', content='connected tv mention')
+    make_rfps(2, members=0, attachments=0, name='Connected TV upfront', content='planning notes')
+    make_rfps(1, members=0, attachments=0, name='Unrelated', content='nothing here')
+
+    pages = [search(client, 'connected', per_page=2, page=page) for page in (1, 2, 3)]
+
+    assert pages[0]['total'] == 5
+    names = [rfp['name'] for page in pages for rfp in page['rfps']]
+    assert names == ['Connected TV upfront'] * 2 + ['Quarterly plan'] * 3
+    ids = [rfp['id'] for page in pages for rfp in page['rfps']]
+    assert len(set(ids)) == 5
+
+
+def test_triggers_follow_updates(client, fts_index):
+    rfp_id = make_rfps(1, members=0, attachments=0, name='Spring launch')[0]
+
+    response = client.put(f'/api/rfps/{rfp_id}', json={'name': 'Autumn launch'})
+    assert response.status_code == 200
+
+    assert search_names(client, 'spring') == []
+    assert search_names(client, 'autumn') == ['Autumn launch']
+
+
+def test_triggers_follow_content_changed_in_sql(client, fts_index):
+    rfp_id = make_rfps(1, members=0, attachments=0, content='plain text')[0]
+
+    db.session.execute(db.update(RFP).where(RFP.id == rfp_id).values(content='sponsorship deck'))
+    db.session.commit()
+
+    assert [rfp['id'] for rfp in search(client, 'sponsorship')['rfps']] == [rfp_id]
+
+
+def test_triggers_follow_deletes(client, fts_index):
+    kept, deleted = make_rfps(2, members=0, attachments=0, name='Outdoor billboards')
+
+    response = client.delete(f'/api/rfps/{deleted}')
+    assert response.status_code == 200
+
+    assert [rfp['id'] for rfp in search(client, 'billboards')['rfps']] == [kept]
+
+
+def test_triggers_index_bulk_inserts(client, fts_index):
+    records = [
+        {'name': f'Podcast network {n}', 'agency_name': 'Audio House', 'campaign_type': 'Audio',
+         'budget_range': '$10K - $20K', 'due_date': '2026-01-31', 'team_members': []}
+        for n in range(30)
+    ]
+    response = client.post('/api/rfps/bulk?chunk_size=7', json=records)
+    assert response.status_code == 201
+
+    assert search(client, 'podcast', per_page=100)['total'] == 30
+    assert search(client, 'audio', per_page=100)['total'] == 30
+
+
+@pytest.mark.parametrize('term', ['"unbalanced', 'NEAR(a b)', 'a OR', '-minus', 'col:name'])
+def test_fts_syntax_in_search_is_treated_as_words(client, fts_index, term):
+    make_rfps(1, members=0, attachments=0, name='Minus near name')
+
+    assert search(client, term)['success']
@@ -0,0 +1,118 @@
+"""BM25 ranking, paging and edge cases of the knowledge base search index"""
+import random
+
+import pytest
+
+from src.models.knowledge import KnowledgeArticle
+from src.models.rfp import db
+from src.search_index import SearchIndex
+
+WORDS = 'media budget campaign digital video audience reach brand retail social programmatic'.split()
+
+
+@pytest.fixture
+def index():
+    rng = random.Random(7)
+    index = SearchIndex()
+    for doc_id in range(1, 61):
+        index.add(doc_id, {
+            'title': ' '.join(rng.choices(WORDS, k=3)),
+            'content': ' '.join(rng.choices(WORDS, k=40)),
+            'category': ('Guides', 'Templates', 'Research')[doc_id % 3],
+        })
+    return index
+
+
+def brute_force(index, query, facet=None):
+    """Every match ranked by scoring all of them"""
+    full = index.search(query, facet=facet, limit=len(index))
+    return [doc_id for doc_id, _ in full['hits']]
+
+
+def test_hits_are_ranked_and_paged_consistently(index):
+    ranking = brute_force(index, 'digital video')
+    assert ranking
+
+    pages = [index.search('digital video', limit=7, offset=offset)['hits'] for offset in range(0, len(ranking), 7)]
+
+    assert [doc_id for page in pages for doc_id, _ in page] == ranking
+    scores = [score for page in pages for _, score in page]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_facet_filters_hits_and_counts_all_matches(index):
+    results = index.search('brand', facet='Guides', limit=100)
+
+    assert results['total'] == len(results['hits']) == results['facets']['Guides']
+    assert sum(results['facets'].values()) == index.search('brand', limit=100)['total']
+
+
+@pytest.mark.parametrize('limit', [0, -1])
+def test_non_positive_limit_returns_no_hits(index, limit):
+    results = index.search('media', limit=limit)
+
+    assert results['hits'] == []
+    assert results['total'] > 0
+
+
+def test_empty_index_with_len_as_limit():
+    assert SearchIndex().search('media', limit=0) == {'hits': [], 'total': 0, 'facets': {}}
+
+
+def test_negative_offset_counts_as_zero(index):
+    assert index.search('media', limit=5, offset=-3)['hits'] == index.search('media', limit=5)['hits']
+    assert index.search('', limit=5, offset=-3)['hits'] == index.search('', limit=5)['hits']
+
+
+def test_offset_past_the_matches(index):
+    results = index.search('media', limit=5, offset=1000)
+
+    assert results['hits'] == []
+    assert results['total'] > 0
+
+
+@pytest.mark.parametrize('query', ['the', '?', 'the of and', '!!!'])
+def test_query_without_terms_matches_nothing(index, query):
+    assert index.search(query) == {'hits': [], 'total': 0, 'facets': {}}
+
+
+def test_empty_query_matches_everything(index):
+    results = index.search('  ', limit=10)
+
+    assert results['total'] == len(index)
+    assert len(results['hits']) == 10
+
+
+def test_prefix_matches_while_typing(index):
+    assert index.search('progr')['total'] == index.search('programmatic ')['total'] > 0
+    assert index.search('progr ')['total'] == 0
+
+
+def test_update_and_remove(index):
+    index.add(1000, {'title': 'Quarterly upfront playbook', 'content': '', 'category': 'Guides'})
+    assert index.search('upfront')['hits'][0][0] == 1000
+
+    index.update(1000, {'title': 'Quarterly scatter playbook', 'content': '', 'category': 'Guides'})
+    assert index.search('upfront')['total'] == 0
+    assert index.search('scatter')['hits'][0][0] == 1000
+
+    index.remove(1000)
+    assert index.search('scatter')['total'] == 0
+
+
+@pytest.mark.parametrize('params', ['q=the', 'q=media&limit=0', 'q=media&limit=-4&offset=-2', 'q=?&offset=-1'])
+def test_search_route_clamps_parameters(client, params):
+    db.session.add_all([
+        KnowledgeArticle(title='Media planning guide', category='Guides', content='media budget'),
+        KnowledgeArticle(title='Media kit template', category='Templates', content='media rates'),
+    ])
+    db.session.commit()
+
+    response = client.get(f'/api/knowledge-base/search?{params}')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    if params.startswith('q=media'):
+        assert len(body['articles']) == 1 and body['total'] == 2
+    else:
+        assert body['articles'] == [] and body['total'] == 0